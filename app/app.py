@@ -1,6 +1,18 @@
+import pandas as pd
 import streamlit as st
+from diagnostics import show_diagnostics
+
+# load_catalogue hands every session a shallow copy of the shared catalogue,
+# copy-on-write keeps writes to those copies from reaching the shared data
+pd.set_option("mode.copy_on_write", True)
 
 st.set_page_config(layout="centered")
+
+# Hidden diagnostics view, opened as /?diagnostics
+if "diagnostics" in st.query_params:
+    show_diagnostics()
+    st.stop()
+
 st.title("💻 Laptopio - Your Laptop Assessor")
 
 st.subheader("""
@@ -0,0 +1,59 @@
+from typing import Any, Dict, Union
+from responses import SCORE_CATEGORIES, SCORES_FORMAT
+
+MODEL_NAME = "llama3-8b-8192"
+
+# Side table with scores of every catalogue laptop, written by prescore.py
+CATALOGUE_SCORES_PATH = "data/laptop_scores.parquet"
+
+# Category and its column in the catalogue scores table
+SCORE_COLUMNS = {category: category.lower().replace(" ", "_") for category in SCORE_CATEGORIES}
+
+def build_assessment_prompt(config: Dict[str, Union[str, float]]) -> str:
+    """
+    Build the assessment prompt of a laptop configuration in the main page format.
+
+    Args:
+        config (Dict[str, Union[str, float]]): Laptop configuration (brand_name, screen_size, ...).
+
+    Returns:
+        str: Assessment prompt.
+    """
+    return f'''
+        Rate the following laptop configuration on a scale of 0-10 in terms of gaming, software development, video editing, general use, graphic design, data science:
+
+        - Brand: {config['brand_name']}
+        - Screen Size: {config['screen_size']} inches
+        - Screen Resolution: {config['screen_resolution']}
+        - CPU Brand: {config['cpu_brand']}
+        - CPU Model: {config['cpu_model']}
+        - CPU Frequency: {config['cpu_frequency']} GHz
+        - GPU Brand: {config['gpu_brand']}
+        - GPU Model: {config['gpu_model']}
+        - Memory Type: {config['memory_type']}
+        - Memory: {config['memory']} GB
+        - RAM Capacity: {config['ram_capacity']} GB
+
+        {SCORES_FORMAT}
+    '''
+
+def get_catalogue_config(laptop: Dict[str, Any]) -> Dict[str, Union[str, float]]:
+    """
+    Convert a row of laptops_data.csv into the main page configuration format.
+
+    Args:
+        laptop (Dict[str, Any]): Catalogue row as a dictionary.
+
+    Returns:
+        Dict[str, Union[str, float]]: Laptop configuration.
+    """
+    config = dict(laptop)
+    config.update({
+        "brand_name": laptop["brand"],
+        "screen_size": laptop["display_diagonal"],
+        "screen_resolution": laptop["resolution"],
+        "gpu_model": laptop["gpu"],
+        "ram_capacity": laptop["ram"],
+        "memory": laptop["hdd_capacity"] + laptop["ssd_capacity"],
+    })
+    return config
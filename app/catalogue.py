@@ -0,0 +1,172 @@
+import os
+import logging
+from typing import List
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+CATALOGUE_PATH = "data/laptops_data.csv"
+
+# The Feather sidecar is memory-mapped, so every worker process reads the same physical pages
+MEMORY_MAP = os.environ.get("LAPTOPIO_MMAP_CATALOGUE", "1") not in ("", "0")
+
+# Layout of the sidecar, sidecars written with another layout (e.g. compressed) are rebuilt
+SIDECAR_FORMAT = b"uncompressed-nan-single-batch-v1"
+
+# Low cardinality text columns stored as pandas categoricals
+CATEGORICAL_COLUMNS: List[str] = [
+    "brand", "operational_system", "graphics_type", "integrated_graphics",
+    "gpu", "cpu_brand", "cpu_model", "memory_type", "resolution",
+    "video_standard", "gpu_brand", "cpu_gpu_combination",
+]
+
+# Columns read as plain strings
+STRING_COLUMNS: List[str] = ["laptop_id", "model"]
+
+def get_sidecar_path(path: str) -> str:
+    return f"{os.path.splitext(path)[0]}.feather"
+
+def downcast_numerics(data: pd.DataFrame) -> pd.DataFrame:
+    """
+    Downcast numeric columns to the smallest dtype that keeps every value exactly.
+
+    Integers go to the smallest integer type, floats go to float32 only when the
+    round trip is lossless (e.g. prices and storage capacities), so values such as
+    15.6 or 1.51 are never turned into 15.600000381.
+
+    Args:
+        data (pd.DataFrame): Dataframe with laptop configurations.
+
+    Returns:
+        data (pd.DataFrame): Dataframe with downcast numeric columns.
+    """
+    for column in data.select_dtypes(include="integer").columns:
+        data[column] = pd.to_numeric(data[column], downcast="integer")
+
+    for column in data.select_dtypes(include="floating").columns:
+        values = data[column].to_numpy()
+        downcast = values.astype(np.float32)
+        if np.array_equal(downcast.astype(np.float64), values, equal_nan=True):
+            data[column] = downcast
+
+    return data
+
+def read_catalogue_csv(path: str = CATALOGUE_PATH) -> pd.DataFrame:
+    """
+    Parse the laptops CSV with explicit dtypes.
+
+    Args:
+        path (str): Path to laptops_data.csv.
+
+    Returns:
+        data (pd.DataFrame): Dataframe with categorical and downcast numeric columns.
+    """
+    dtypes = {column: "category" for column in CATEGORICAL_COLUMNS}
+    dtypes.update({column: str for column in STRING_COLUMNS})
+    data = pd.read_csv(path, dtype=dtypes)
+    return downcast_numerics(data)
+
+def to_arrow_table(data: pd.DataFrame) -> "pa.Table":
+    """
+    Convert the typed dataset into an Arrow table that maps back to pandas without copying.
+
+    Missing floats are kept as NaN values instead of an Arrow validity bitmap, which pandas
+    would have to materialize, so float, integer and category code columns become views
+    of the mapped file.
+
+    Args:
+        data (pd.DataFrame): Typed dataframe with laptop configurations.
+
+    Returns:
+        pa.Table: Table with the same columns and dtypes.
+    """
+    import pyarrow as pa
+
+    table = pa.Table.from_pandas(data, preserve_index=False)
+    for column in data.select_dtypes(include="floating").columns:
+        index = table.schema.get_field_index(column)
+        table = table.set_column(index, column, pa.array(data[column].to_numpy()))
+    return table
+
+def to_dataframe(table: "pa.Table") -> pd.DataFrame:
+    """
+    Convert a sidecar table into the typed dataset without copying its columns.
+
+    Free text columns stay Arrow strings rather than one Python object per value,
+    one block is kept per column since consolidating blocks would copy them.
+
+    Args:
+        table (pa.Table): Table read from the sidecar.
+
+    Returns:
+        data (pd.DataFrame): Typed dataframe with laptop configurations.
+    """
+    import pyarrow as pa
+
+    return table.to_pandas(split_blocks=True, types_mapper={pa.string(): pd.StringDtype("pyarrow")}.get)
+
+def read_catalogue(path: str = CATALOGUE_PATH, memory_map: bool = MEMORY_MAP) -> pd.DataFrame:
+    """
+    Read the typed dataset from its Feather sidecar, rebuilding the sidecar when the CSV changed.
+
+    The sidecar is an uncompressed Arrow file. When it is memory-mapped, numeric columns,
+    category codes and Arrow strings are read-only views of the file, so processes serving
+    the app share one copy through the page cache instead of holding one each. Falls back to parsing the CSV
+    when pyarrow is not installed.
+
+    Args:
+        path (str): Path to laptops_data.csv.
+        memory_map (bool): Map the sidecar instead of reading it into process memory.
+
+    Returns:
+        data (pd.DataFrame): Typed dataframe with laptop configurations.
+    """
+    try:
+        from pyarrow import feather
+    except ImportError:
+        return read_catalogue_csv(path)
+
+    csv_mtime = str(os.path.getmtime(path)).encode()
+    sidecar_path = get_sidecar_path(path)
+
+    if os.path.exists(sidecar_path):
+        table = feather.read_table(sidecar_path, memory_map=memory_map)
+        metadata = table.schema.metadata or {}
+        if metadata.get(b"csv_mtime") == csv_mtime and metadata.get(b"format") == SIDECAR_FORMAT:
+            return to_dataframe(table)
+
+    data = read_catalogue_csv(path)
+    table = to_arrow_table(data)
+    table = table.replace_schema_metadata({**table.schema.metadata, b"csv_mtime": csv_mtime,
+                                           b"format": SIDECAR_FORMAT})
+    # Written next to the sidecar and renamed, processes mapping the old file keep reading it safely
+    temp_path = f"{sidecar_path}.tmp"
+    try:
+        # A single record batch, columns split in chunks would be concatenated into copies on read
+        feather.write_feather(table, temp_path, compression="uncompressed", chunksize=max(table.num_rows, 1))
+        os.replace(temp_path, sidecar_path)
+    except OSError as error:
+        logging.warning(f"Sidecar {sidecar_path} could not be written: {error}")
+        return data
+
+    return to_dataframe(feather.read_table(sidecar_path, memory_map=memory_map))
+
+@st.cache_resource(show_spinner=False, max_entries=1)
+def get_shared_catalogue(path: str, csv_mtime: float) -> pd.DataFrame:
+    # One copy per process shared by every session, keyed by the CSV mtime so a new scrape is picked up
+    return read_catalogue(path)
+
+def load_catalogue(path: str = CATALOGUE_PATH) -> pd.DataFrame:
+    """
+    Load laptops database once per process and hand out a read-only view of it.
+
+    Args:
+        path (str): Path to laptops_data.csv.
+
+    Returns:
+        data (pd.DataFrame): Shallow copy of the shared dataframe, writes to it never reach the shared data.
+    """
+    data = get_shared_catalogue(path, os.path.getmtime(path))
+    # Shallow copies are only independent under copy-on-write (enabled by app.py), a page
+    # opened before the main script ran gets a deep copy instead
+    return data.copy(deep=not pd.get_option("mode.copy_on_write"))
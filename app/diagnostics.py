@@ -0,0 +1,47 @@
+import pandas as pd
+import streamlit as st
+from tracing import ENABLED, REGISTRY, get_recent_spans
+
+# Spans shown in the recent calls table
+RECENT_SPANS = 200
+
+def show_diagnostics() -> None:
+    """
+    Show the metrics of this process: counters, latency by span and the most recent spans.
+
+    The page is not listed in the navigation, it is opened with the `?diagnostics` query parameter.
+
+    Returns:
+        None
+    """
+    st.title("🩺 Diagnostics")
+    if not ENABLED:
+        st.info("Tracing is off, set LAPTOPIO_METRICS=1 to time the hot paths. Only the counters kept "
+                "by the score store and the reply parser are shown.")
+
+    counters, timers = REGISTRY.snapshot()
+
+    st.header("Counters")
+    st.dataframe(pd.DataFrame({"Counter": list(counters), "Value": list(counters.values())}),
+                 hide_index=True, width="stretch")
+
+    if timers:
+        st.header("Latency")
+        latency = pd.DataFrame.from_dict(timers, orient="index").sort_values("total", ascending=False)
+        latency[["total", "mean", "max"]] *= 1000
+        latency = latency.rename(columns={"count": "Calls", "total": "Total, ms", "mean": "Mean, ms",
+                                          "max": "Max, ms", "errors": "Errors"})
+        st.dataframe(latency.rename_axis("Span").reset_index(), hide_index=True, width="stretch")
+
+    spans = get_recent_spans()[-RECENT_SPANS:]
+    if spans:
+        st.header("Recent Calls")
+        recent = pd.DataFrame(spans[::-1], columns=["Span", "Started", "Duration, ms", "Error"])
+        recent["Started"] = pd.to_datetime(recent["Started"], unit="s")
+        recent["Duration, ms"] *= 1000
+        st.dataframe(recent, hide_index=True, width="stretch")
+
+    with st.expander("Prometheus"):
+        metrics = REGISTRY.render_prometheus()
+        st.code(metrics, language="text")
+        st.download_button("Download", metrics, file_name="laptopio.prom", mime="text/plain")
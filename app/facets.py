@@ -0,0 +1,74 @@
+import os
+from typing import Dict, List, NamedTuple, Tuple
+import pandas as pd
+import streamlit as st
+from catalogue import CATALOGUE_PATH, load_catalogue
+
+# Columns offered as option lists in the sidebar
+FACET_COLUMNS: List[str] = ["brand", "resolution", "cpu_brand", "memory_type", "gpu_brand"]
+
+# Columns offered as number inputs in the sidebar
+RANGE_COLUMNS: List[str] = ["display_diagonal", "cpu_frequency", "ram"]
+
+# Dependent facets: parent column and the column whose options depend on it
+DEPENDENT_FACETS: List[Tuple[str, str]] = [("brand", "cpu_brand"), ("cpu_brand", "cpu_model"), ("gpu_brand", "gpu")]
+
+class FacetIndex(NamedTuple):
+    """
+    Sidebar options of the catalogue, every list keeps the order of first appearance in the dataset.
+
+    Attributes:
+        values: Distinct values of every facet column.
+        ranges: (min, max) of every numeric column.
+        children: Options of a dependent column by parent value, keyed by (parent, child) column names.
+    """
+    values: Dict[str, List[str]]
+    ranges: Dict[str, Tuple[float, float]]
+    children: Dict[Tuple[str, str], Dict[str, List[str]]]
+
+    def get_children(self, parent: str, child: str, value: str) -> List[str]:
+        return self.children[(parent, child)].get(value, [])
+
+def get_distinct(column: pd.Series) -> List[str]:
+    return column.dropna().drop_duplicates().astype(str).tolist()
+
+def build_facet_index(data: pd.DataFrame) -> FacetIndex:
+    """
+    Scan the catalogue once and collect every option the sidebar offers.
+
+    Args:
+        data (pd.DataFrame): Dataframe with laptop configurations.
+
+    Returns:
+        FacetIndex: Distinct values, numeric ranges and dependent options.
+    """
+    values = {column: get_distinct(data[column]) for column in FACET_COLUMNS}
+
+    ranges = {}
+    for column in RANGE_COLUMNS:
+        low, high = data[column].min(), data[column].max()
+        ranges[column] = (low.item(), high.item())
+
+    children = {}
+    for parent, child in DEPENDENT_FACETS:
+        pairs = data[[parent, child]].dropna().drop_duplicates().astype(str)
+        children[(parent, child)] = pairs.groupby(parent, sort=False)[child].agg(list).to_dict()
+
+    return FacetIndex(values, ranges, children)
+
+@st.cache_resource(show_spinner=False)
+def get_facet_index(path: str, csv_mtime: float) -> FacetIndex:
+    # Built once per process and rebuilt when a new scrape replaces the CSV
+    return build_facet_index(load_catalogue(path))
+
+def load_facets(path: str = CATALOGUE_PATH) -> FacetIndex:
+    """
+    Get the facet index of the shared catalogue.
+
+    Args:
+        path (str): Path to laptops_data.csv.
+
+    Returns:
+        FacetIndex: Sidebar options.
+    """
+    return get_facet_index(path, os.path.getmtime(path))
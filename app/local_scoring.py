@@ -0,0 +1,281 @@
+import os
+import re
+import json
+import logging
+import argparse
+from typing import Any, Dict, List, Optional, Tuple
+import numpy as np
+import pandas as pd
+from assessment import CATALOGUE_SCORES_PATH, MODEL_NAME, SCORE_COLUMNS
+from responses import SCORE_CATEGORIES
+
+LOCAL_MODEL_PATH = "data/local_model.json"
+
+# CPU model patterns and their performance tier on a 0-10 scale, the first match wins
+CPU_TIERS: List[Tuple[str, float]] = [
+    (r"\bm\d\s*max\b", 10), (r"\bm\d\s*pro\b", 9),
+    (r"ultra\s*9|\bi9\b|ryzen\s*9", 9), (r"\bm3\b", 8),
+    (r"ultra\s*7|\bi7\b|ryzen\s*7", 7.5), (r"\bm2\b", 7.5), (r"\bm1\b", 7),
+    (r"ultra\s*5|\bi5\b|ryzen\s*5", 6), (r"\bi3\b|ryzen\s*3", 4),
+    (r"pentium\s*gold|athlon\s*gold|core\s*m", 3),
+    (r"pentium|athlon|celeron|a-series|e-series", 2),
+]
+DEFAULT_CPU_TIER = 4
+
+# GPU model patterns and their performance tier on a 0-10 scale, integrated graphics fall to the default
+GPU_TIERS: List[Tuple[str, float]] = [
+    (r"4090", 10), (r"4080", 9.5), (r"3080|2080", 8.5), (r"4070|3070", 8),
+    (r"4060|3060|2070|6800m", 7), (r"4050|2060|6600m|7600s", 6), (r"3050|2050|1660|5600m|5500m", 5),
+    (r"1650|1060|1080|arc\s*a3|980m|pro\s*5[35]00m", 4), (r"1050|vega\s*m|rx\s*5[456]0|555x|560x", 3),
+    (r"mx\s*\d|930mx|radeon\s*(rx\s*)?(r\d|5[234]|6[14]0)", 2),
+]
+DEFAULT_GPU_TIER = 1
+
+FEATURES = ["bias", "cpu_tier", "cpu_frequency", "gpu_tier", "ram", "storage", "pixels", "weight"]
+
+# Hand-set weights used until the model is calibrated against LLM scores, one column per category
+DEFAULT_WEIGHTS = np.array([
+    # Gaming, Software Development, Video Editing, General Use, Graphic Design, Data Science
+    [0.5, 1.5, 0.5, 4.0, 0.8, 0.5],    # bias
+    [2.0, 4.0, 3.0, 2.0, 2.5, 3.5],    # cpu_tier
+    [0.5, 0.5, 0.5, 0.5, 0.3, 0.5],    # cpu_frequency
+    [5.5, 0.5, 3.0, 0.3, 2.5, 2.5],    # gpu_tier
+    [1.5, 2.5, 2.0, 1.5, 1.5, 2.5],    # ram
+    [0.5, 1.0, 1.0, 1.0, 0.7, 0.8],    # storage
+    [0.0, 0.5, 0.8, 0.5, 1.5, 0.0],    # pixels
+    [0.0, -0.5, -0.3, -1.0, -0.3, -0.3],  # weight
+])
+
+# Values used when a user configuration does not provide them (catalogue medians)
+DEFAULT_CPU_FREQUENCY = 2.3
+DEFAULT_WEIGHT = 1.8
+DEFAULT_PIXELS = 1920 * 1080
+
+def get_tier(name: str, tiers: List[Tuple[str, float]], default: float) -> float:
+    name = str(name).lower()
+    for pattern, tier in tiers:
+        if re.search(pattern, name):
+            return tier
+    return default
+
+def get_tiers(column: pd.Series, tiers: List[Tuple[str, float]], default: float) -> np.ndarray:
+    # Looked up once per distinct name and broadcast through the categorical codes
+    categorical = column.astype("category")
+    lookup = np.array([get_tier(name, tiers, default) for name in categorical.cat.categories] + [default])
+    return lookup[categorical.cat.codes.to_numpy()]
+
+def build_features(cpu_tier: np.ndarray, cpu_frequency: np.ndarray, gpu_tier: np.ndarray, ram: np.ndarray,
+                   storage: np.ndarray, pixels: np.ndarray, weight: np.ndarray) -> np.ndarray:
+    """
+    Stack raw specs into the normalized feature matrix of the scoring model.
+
+    Returns:
+        np.ndarray: Matrix of shape (n, len(FEATURES)).
+    """
+    return np.column_stack([
+        np.ones(len(cpu_tier)),
+        cpu_tier / 10,
+        cpu_frequency / 4,
+        gpu_tier / 10,
+        np.log2(np.maximum(ram, 1)) / 6,
+        np.log2(1 + np.maximum(storage, 0)) / 11,
+        pixels / 8e6,
+        weight / 3,
+    ])
+
+def catalogue_features(data: pd.DataFrame) -> np.ndarray:
+    """
+    Feature matrix of every catalogue laptop computed with vectorized lookups.
+
+    Args:
+        data (pd.DataFrame): Dataframe with laptop configurations.
+
+    Returns:
+        np.ndarray: Matrix of shape (len(data), len(FEATURES)).
+    """
+    resolution = data["resolution"].astype(str).str.extract(r"(\d+)\s*x\s*(\d+)").astype(float)
+    pixels = (resolution[0] * resolution[1]).fillna(DEFAULT_PIXELS).to_numpy()
+    return build_features(
+        get_tiers(data["cpu_model"], CPU_TIERS, DEFAULT_CPU_TIER),
+        data["cpu_frequency"].to_numpy(dtype=float),
+        get_tiers(data["gpu"], GPU_TIERS, DEFAULT_GPU_TIER),
+        data["ram"].to_numpy(dtype=float),
+        (data["hdd_capacity"] + data["ssd_capacity"]).to_numpy(dtype=float),
+        pixels,
+        data["weight"].to_numpy(dtype=float),
+    )
+
+def parse_number(value: Any, default: float) -> float:
+    # 16, "16", "16GB LPDDR4", "1 TB SSD" -> GB
+    if isinstance(value, (int, float, np.integer, np.floating)) and not pd.isna(value):
+        return float(value)
+    match = re.search(r"(\d+(?:\.\d+)?)\s*(tb|gb)?", str(value), re.IGNORECASE)
+    if not match:
+        return default
+    number = float(match.group(1))
+    return number * 1024 if (match.group(2) or "").lower() == "tb" else number
+
+def config_features(config: Dict[str, Any]) -> np.ndarray:
+    """
+    Feature vector of a laptop configuration from either page (sidebar keys or LLM suggestion keys).
+
+    Args:
+        config (Dict[str, Any]): Laptop configuration.
+
+    Returns:
+        np.ndarray: Matrix of shape (1, len(FEATURES)).
+    """
+    cpu = config.get("cpu_model", config.get("CPU", ""))
+    gpu = config.get("gpu_model", config.get("GPU", ""))
+    ram = parse_number(config.get("ram_capacity", config.get("RAM")), 8)
+    if "memory" in config:
+        storage = parse_number(config["memory"], 512)
+    elif "hdd" in config or "ssd" in config:
+        storage = parse_number(config.get("hdd", 0), 0) + parse_number(config.get("ssd", 0), 0)
+    else:
+        storage = parse_number(config.get("SSD/HDD Capacity"), 512)
+
+    resolution = re.search(r"(\d+)\s*x\s*(\d+)", str(config.get("screen_resolution", config.get("Resolution", ""))))
+    pixels = int(resolution.group(1)) * int(resolution.group(2)) if resolution else DEFAULT_PIXELS
+
+    return build_features(
+        np.array([get_tier(cpu, CPU_TIERS, DEFAULT_CPU_TIER)]),
+        np.array([parse_number(config.get("cpu_frequency"), DEFAULT_CPU_FREQUENCY)]),
+        np.array([get_tier(gpu, GPU_TIERS, DEFAULT_GPU_TIER)]),
+        np.array([ram]),
+        np.array([storage]),
+        np.array([pixels]),
+        np.array([parse_number(config.get("weight"), DEFAULT_WEIGHT)]),
+    )
+
+class LocalScoringModel:
+    """
+    Linear model over CPU/GPU tiers and normalized specs predicting the six category scores.
+
+    Args:
+        weights (np.ndarray): Matrix of shape (len(FEATURES), len(SCORE_CATEGORIES)).
+    """
+    def __init__(self, weights: np.ndarray = DEFAULT_WEIGHTS) -> None:
+        self.weights = np.asarray(weights, dtype=float)
+
+    def predict(self, features: np.ndarray) -> np.ndarray:
+        return np.clip(np.round(features @ self.weights, 1), 0, 10)
+
+    def score_catalogue(self, data: pd.DataFrame) -> pd.DataFrame:
+        """
+        Score every catalogue laptop in one pass.
+
+        Args:
+            data (pd.DataFrame): Dataframe with laptop configurations.
+
+        Returns:
+            pd.DataFrame: Scores with one column per category, indexed like data.
+        """
+        return pd.DataFrame(self.predict(catalogue_features(data)), index=data.index,
+                            columns=list(SCORE_COLUMNS.values()))
+
+    def score_config(self, config: Dict[str, Any]) -> Dict[str, float]:
+        scores = self.predict(config_features(config))[0]
+        return {category: float(score) for category, score in zip(SCORE_CATEGORIES, scores)}
+
+    @classmethod
+    def fit(cls, features: np.ndarray, scores: np.ndarray, alpha: float = 1.0) -> "LocalScoringModel":
+        """
+        Calibrate the weights against LLM scores with ridge regression.
+
+        Args:
+            features (np.ndarray): Feature matrix of the scored laptops.
+            scores (np.ndarray): LLM scores of shape (n, len(SCORE_CATEGORIES)).
+            alpha (float): Ridge penalty (the bias is not penalized).
+
+        Returns:
+            LocalScoringModel: Calibrated model.
+        """
+        penalty = alpha * np.eye(features.shape[1])
+        penalty[0, 0] = 0
+        weights = np.linalg.solve(features.T @ features + penalty, features.T @ scores)
+        return cls(weights)
+
+    def save(self, path: str = LOCAL_MODEL_PATH) -> None:
+        with open(path, "w") as file:
+            json.dump({"features": FEATURES, "categories": SCORE_CATEGORIES,
+                       "weights": self.weights.tolist()}, file, indent=2)
+
+    @classmethod
+    def load(cls, path: str = LOCAL_MODEL_PATH) -> "LocalScoringModel":
+        """
+        Load calibrated weights, falling back to the hand-set ones.
+
+        Args:
+            path (str): Path to local_model.json.
+
+        Returns:
+            LocalScoringModel: The scoring model.
+        """
+        if not os.path.exists(path):
+            return cls()
+        with open(path) as file:
+            return cls(np.array(json.load(file)["weights"]))
+
+LOCAL_MODEL: Optional[LocalScoringModel] = None
+
+def score_config(config: Dict[str, Any]) -> Dict[str, float]:
+    """
+    Score a laptop configuration with the local model, loaded once per process.
+
+    Args:
+        config (Dict[str, Any]): Laptop configuration.
+
+    Returns:
+        Dict[str, float]: Category scores.
+    """
+    global LOCAL_MODEL
+    if LOCAL_MODEL is None:
+        LOCAL_MODEL = LocalScoringModel.load()
+    return LOCAL_MODEL.score_config(config)
+
+def calibrate(catalogue_path: str, scores_path: str = CATALOGUE_SCORES_PATH,
+              output: str = LOCAL_MODEL_PATH) -> LocalScoringModel:
+    """
+    Fit the local model against the pre-computed LLM scores of the catalogue and save it.
+
+    Args:
+        catalogue_path (str): Path to laptops_data.csv.
+        scores_path (str): Path to laptop_scores.parquet written by prescore.py, scores of MODEL_NAME are used.
+        output (str): Path to local_model.json.
+
+    Returns:
+        LocalScoringModel: Calibrated model.
+    """
+    from catalogue import read_catalogue
+
+    data = read_catalogue(catalogue_path)
+    scores = pd.read_parquet(scores_path)
+    scores = scores[scores["model_name"] == MODEL_NAME]
+    data = data.merge(scores, left_on=data["laptop_id"].astype(str), right_on=scores["laptop_id"].astype(str))
+    targets = data[list(SCORE_COLUMNS.values())].to_numpy(dtype=float)
+    features = catalogue_features(data)
+
+    # A single NaN would turn every solved weight into NaN, unscored categories and unparsed specs are dropped
+    complete = np.isfinite(targets).all(axis=1) & np.isfinite(features).all(axis=1)
+    if not complete.any():
+        raise ValueError(f"No laptop of {scores_path} has complete scores and features")
+    if not complete.all():
+        logging.warning(f"{(~complete).sum()} laptops with missing scores or features are left out")
+    features, targets = features[complete], targets[complete]
+
+    model = LocalScoringModel.fit(features, targets)
+    error = np.abs(model.predict(features) - targets).mean()
+    logging.info(f"Calibrated on {len(targets)} laptops, mean absolute error {error:.2f}")
+
+    model.save(output)
+    return model
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    parser = argparse.ArgumentParser(description="Calibrate the local scoring model against catalogue LLM scores")
+    parser.add_argument("--catalogue", default="data/laptops_data.csv")
+    parser.add_argument("--scores", default=CATALOGUE_SCORES_PATH)
+    parser.add_argument("--output", default=LOCAL_MODEL_PATH)
+    args = parser.parse_args()
+    calibrate(args.catalogue, args.scores, args.output)
@@ -0,0 +1,408 @@
+import os
+import re
+import time
+import logging
+import argparse
+from itertools import product
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+import numpy as np
+import pandas as pd
+import streamlit as st
+from catalogue import CATALOGUE_PATH, load_catalogue, read_catalogue
+
+MARKET_CUBE_PATH = "data/market_cube.parquet"
+
+# Dimensions of the cube, every cell is a combination of values or "all" (ALL) for each of them
+DIMENSIONS: List[str] = ["brand", "cpu_model", "gpu_family", "ram", "ssd_capacity", "display_diagonal"]
+
+# Value of a dimension rolled up over every value
+ALL = "*"
+
+# Value of a dimension missing from a catalogue row, kept apart from ALL so the row is not counted twice
+MISSING = "?"
+
+# Layout of the saved cube, cubes saved with another layout are rebuilt instead of refreshed
+CUBE_FORMAT = b"missing-v2"
+
+# Columns averaged in every cell
+SPEC_COLUMNS: List[str] = ["ram", "ssd_capacity", "cpu_frequency", "display_diagonal", "weight", "discount_rate_percent"]
+
+# Price percentiles kept in every cell
+PRICE_QUANTILES: Dict[str, float] = {"price_p25": 0.25, "price_median": 0.5, "price_p75": 0.75}
+
+# Dimensions dropped one by one when the cell of a configuration holds too few laptops
+FALLBACK_ORDER: List[str] = ["ssd_capacity", "cpu_model", "display_diagonal", "brand", "ram", "gpu_family"]
+
+# GPU name patterns and their family, the first match wins
+GPU_FAMILIES: List[Tuple[str, str]] = [
+    (r"rtx", "RTX"),
+    (r"gtx", "GTX"),
+    (r"\bmx\s*\d", "MX"),
+    (r"radeon|\brx\s*\d", "Radeon"),
+    (r"\barc\b", "Arc"),
+]
+
+class MarketCell(NamedTuple):
+    """
+    Statistics of the catalogue laptops in one cell of the cube.
+
+    Attributes:
+        key: Value of every dimension, ALL where the cell is rolled up.
+        count: Number of laptops.
+        stats: Number of laptops with a price, price percentiles, mean price and mean specs.
+    """
+    key: Dict[str, str]
+    count: int
+    stats: Dict[str, float]
+
+def get_gpu_family(gpu: Any) -> str:
+    # "GeForce RTX 4060" -> "RTX", "No" / missing -> "Integrated"
+    name = str(gpu).lower()
+    for pattern, family in GPU_FAMILIES:
+        if re.search(pattern, name):
+            return family
+    return "Integrated"
+
+def format_dimension(column: str, value: Any) -> str:
+    """
+    Canonical text of a dimension value, so 16, 16.0 and "16" address the same cell.
+
+    Args:
+        column (str): Dimension name.
+        value (Any): Value from the catalogue or a configuration.
+
+    Returns:
+        str: Cell coordinate.
+    """
+    if value is None or pd.isna(value):
+        return ALL
+    if column == "display_diagonal":
+        return f"{float(value):.1f}"
+    if column in ("ram", "ssd_capacity"):
+        return str(int(float(value)))
+    return str(value)
+
+def get_dimension_frame(data: pd.DataFrame) -> pd.DataFrame:
+    """
+    Dimension values of every catalogue row as cell coordinates.
+
+    Args:
+        data (pd.DataFrame): Dataframe with laptop configurations.
+
+    Returns:
+        pd.DataFrame: One string column per dimension.
+    """
+    frame = pd.DataFrame(index=data.index)
+    for column in DIMENSIONS:
+        if column == "gpu_family":
+            # Matched once per distinct GPU name
+            gpu = data["gpu"].astype("category")
+            families = np.array([get_gpu_family(name) for name in gpu.cat.categories] + ["Integrated"])
+            frame[column] = families[gpu.cat.codes.to_numpy()]
+        else:
+            distinct = data[column].dropna().drop_duplicates()
+            mapping = {value: format_dimension(column, value) for value in distinct}
+            frame[column] = data[column].map(mapping).astype(object).fillna(MISSING)
+    return frame
+
+def get_measure_frame(data: pd.DataFrame) -> pd.DataFrame:
+    # Suffixed, as RAM, SSD capacity and display size are dimensions as well
+    measures = data[SPEC_COLUMNS].astype(np.float64).add_suffix("_mean")
+    measures["price"] = data["current_price"].astype(np.float64)
+    return measures
+
+def summarize(stacked: pd.DataFrame, by: Any) -> pd.DataFrame:
+    # Count, price statistics and mean specs of every group of the stacked rows
+    grouped = stacked.groupby(by, sort=False)
+    cube = grouped["price"].agg(count="size", price_count="count", price_mean="mean")
+    for name, quantile in PRICE_QUANTILES.items():
+        cube[name] = grouped["price"].quantile(quantile)
+    return cube.join(grouped[[f"{column}_mean" for column in SPEC_COLUMNS]].mean())
+
+def aggregate(dimensions: pd.DataFrame, measures: pd.DataFrame) -> pd.DataFrame:
+    """
+    Aggregate every cell of the cube in one group-by over the rows replicated once per rollup.
+
+    Args:
+        dimensions (pd.DataFrame): Cell coordinates of the rows (get_dimension_frame).
+        measures (pd.DataFrame): Price and specs of the rows (get_measure_frame).
+
+    Returns:
+        pd.DataFrame: One row per cell, dimension columns followed by count and statistics.
+    """
+    frames = []
+    for rollup in product([False, True], repeat=len(DIMENSIONS)):
+        frame = dimensions.copy()
+        for column, rolled_up in zip(DIMENSIONS, rollup):
+            if rolled_up:
+                frame[column] = ALL
+        frames.append(pd.concat([frame, measures], axis=1))
+    stacked = pd.concat(frames, ignore_index=True)
+    return summarize(stacked, DIMENSIONS).reset_index()
+
+def aggregate_cells(dimensions: pd.DataFrame, measures: pd.DataFrame, keys: pd.MultiIndex) -> pd.DataFrame:
+    """
+    Aggregate some cells of the cube from the rows falling into each of them (incremental refresh).
+
+    Only the rows of the given cells are gathered, so the cost follows the size of the touched
+    cells instead of the whole catalogue times every rollup.
+
+    Args:
+        dimensions (pd.DataFrame): Cell coordinates of the rows (get_dimension_frame).
+        measures (pd.DataFrame): Price and specs of the rows (get_measure_frame).
+        keys (pd.MultiIndex): Cells to aggregate, cells left without rows are missing from the result.
+
+    Returns:
+        pd.DataFrame: One row per non-empty cell, dimension columns followed by count and statistics.
+    """
+    values = {column: dimensions[column].to_numpy() for column in DIMENSIONS}
+    # Rows holding a dimension value, shared by every cell fixing that value
+    matches: Dict[Tuple[str, str], np.ndarray] = {}
+    rows, cells = [], []
+    for cell, key in enumerate(keys):
+        selected = np.ones(len(dimensions), dtype=bool)
+        for column, value in zip(DIMENSIONS, key):
+            if value != ALL:
+                if (column, value) not in matches:
+                    matches[column, value] = values[column] == value
+                selected &= matches[column, value]
+        positions = np.flatnonzero(selected)
+        rows.append(positions)
+        cells.append(np.full(len(positions), cell))
+
+    stacked = measures.iloc[np.concatenate(rows)].reset_index(drop=True)
+    stacked["cell"] = np.concatenate(cells)
+    cube = summarize(stacked, "cell")
+    cube.index = keys[cube.index.to_numpy()]
+    return cube.reset_index()
+
+def get_fingerprints(data: pd.DataFrame, dimensions: pd.DataFrame) -> pd.DataFrame:
+    # Hash of every row by laptop id, with its cell coordinates to find the cells a removed row belonged to
+    fingerprints = dimensions.copy()
+    fingerprints["laptop_id"] = data["laptop_id"].astype(str).to_numpy()
+    fingerprints["row_hash"] = pd.util.hash_pandas_object(
+        pd.concat([dimensions, get_measure_frame(data)], axis=1), index=False).to_numpy()
+    return fingerprints.set_index("laptop_id")
+
+def get_rollup_keys(cells: pd.DataFrame) -> pd.MultiIndex:
+    # Every cell a set of rows contributes to, i.e. each row under every rollup
+    keys = set()
+    for row in cells[DIMENSIONS].drop_duplicates().itertuples(index=False):
+        for rollup in product([False, True], repeat=len(DIMENSIONS)):
+            keys.add(tuple(ALL if rolled_up else value for value, rolled_up in zip(row, rollup)))
+    return pd.MultiIndex.from_tuples(list(keys), names=DIMENSIONS)
+
+class MarketCube:
+    """
+    Group-by cube of the catalogue over brand, CPU model, GPU family, RAM, SSD capacity and display size.
+
+    Every combination of dimension values present in the catalogue is a cell, and so is every
+    rollup of it (e.g. all 16 GB RTX laptops of any brand). Cells hold the number of laptops,
+    price percentiles and mean specs and are answered from a hash map. A new scrape only
+    recomputes the cells of added, removed or changed laptops.
+
+    Args:
+        cells (pd.DataFrame): Cube rows from aggregate().
+        fingerprints (pd.DataFrame): Row hashes and coordinates by laptop id from get_fingerprints().
+    """
+    def __init__(self, cells: pd.DataFrame, fingerprints: pd.DataFrame) -> None:
+        self.cells = cells.reset_index(drop=True)
+        self.fingerprints = fingerprints
+        self.index: Dict[Tuple[str, ...], int] = {
+            key: position for position, key in enumerate(self.cells[DIMENSIONS].itertuples(index=False, name=None))
+        }
+        # Plain arrays, so a lookup never builds a pandas row
+        self.stat_columns = list(self.cells.columns[len(DIMENSIONS) + 1:])
+        self.counts = self.cells["count"].to_numpy()
+        self.stats = self.cells[self.stat_columns].to_numpy(dtype=np.float64)
+
+    @classmethod
+    def build(cls, data: pd.DataFrame) -> "MarketCube":
+        dimensions = get_dimension_frame(data)
+        return cls(aggregate(dimensions, get_measure_frame(data)), get_fingerprints(data, dimensions))
+
+    def refresh(self, data: pd.DataFrame) -> "MarketCube":
+        """
+        Recompute the cells touched by laptops added, removed or changed since the cube was built.
+
+        Args:
+            data (pd.DataFrame): Current catalogue.
+
+        Returns:
+            MarketCube: Updated cube (self when nothing changed).
+        """
+        dimensions = get_dimension_frame(data)
+        fingerprints = get_fingerprints(data, dimensions)
+        if fingerprints.index.duplicated().any():
+            # Ids are not a row key, fall back to a full build
+            return MarketCube(aggregate(dimensions, get_measure_frame(data)), fingerprints)
+
+        previous = self.fingerprints
+        common = fingerprints.index.intersection(previous.index)
+        changed = common[fingerprints.loc[common, "row_hash"].to_numpy() != previous.loc[common, "row_hash"].to_numpy()]
+        added = fingerprints.index.difference(previous.index)
+        removed = previous.index.difference(fingerprints.index)
+        if not len(changed) and not len(added) and not len(removed):
+            return self
+
+        touched = pd.concat([previous.loc[changed.union(removed)], fingerprints.loc[changed.union(added)]])
+        keys = get_rollup_keys(touched)
+        cells = aggregate_cells(dimensions, get_measure_frame(data), keys)
+
+        # Touched cells left without laptops disappear, the others are replaced
+        kept = self.cells[~pd.MultiIndex.from_frame(self.cells[DIMENSIONS]).isin(keys)]
+        logging.info(f"Market cube: {len(added)} added, {len(changed)} changed, {len(removed)} removed laptops, "
+                     f"{len(keys)} cells recomputed")
+        return MarketCube(pd.concat([kept, cells], ignore_index=True), fingerprints)
+
+    def get(self, **dimensions: Any) -> Optional[MarketCell]:
+        """
+        Statistics of one cell, dimensions not given are rolled up.
+
+        Example: cube.get(brand="Lenovo", gpu_family="RTX", ram=16, display_diagonal=15.6)
+
+        Args:
+            **dimensions (Any): Values of some of the DIMENSIONS.
+
+        Returns:
+            Optional[MarketCell]: The cell, None if no catalogue laptop falls into it.
+        """
+        key = tuple(format_dimension(column, dimensions.get(column)) for column in DIMENSIONS)
+        position = self.index.get(key)
+        if position is None:
+            return None
+        stats = dict(zip(self.stat_columns, self.stats[position].tolist()))
+        return MarketCell(dict(zip(DIMENSIONS, key)), int(self.counts[position]), stats)
+
+    def get_closest(self, min_count: int = 3, **dimensions: Any) -> Optional[MarketCell]:
+        """
+        Most specific cell of a configuration holding at least min_count laptops with a price.
+
+        Dimensions are rolled up in FALLBACK_ORDER until the cell is large enough.
+
+        Args:
+            min_count (int): Minimum number of laptops in the cell.
+            **dimensions (Any): Values of some of the DIMENSIONS.
+
+        Returns:
+            Optional[MarketCell]: The cell, None if even the whole market is smaller than min_count.
+        """
+        dimensions = {column: value for column, value in dimensions.items() if value is not None}
+        for column in [None] + FALLBACK_ORDER:
+            dimensions.pop(column, None)
+            cell = self.get(**dimensions)
+            if cell is not None and cell.stats["price_count"] >= min_count:
+                return cell
+        return None
+
+    def save(self, path: str = MARKET_CUBE_PATH, csv_mtime: Optional[float] = None) -> None:
+        import pyarrow as pa
+        from pyarrow import parquet
+
+        cells = self.cells.astype({column: "category" for column in DIMENSIONS})
+        cells = cells.astype({column: np.float32 for column in cells.columns[len(DIMENSIONS) + 1:]})
+        # Both files carry the CSV mtime, a cube is only refreshed against the fingerprints it was saved with
+        metadata = {b"csv_mtime": str(csv_mtime).encode(), b"format": CUBE_FORMAT}
+        for table, target in [(pa.Table.from_pandas(cells, preserve_index=False), path),
+                              (pa.Table.from_pandas(self.fingerprints.reset_index(), preserve_index=False),
+                               get_fingerprints_path(path))]:
+            # Written next to the target and renamed, so readers never see a half-written file
+            temp_path = f"{target}.tmp"
+            parquet.write_table(table.replace_schema_metadata({**table.schema.metadata, **metadata}), temp_path)
+            os.replace(temp_path, target)
+
+    @classmethod
+    def load(cls, path: str = MARKET_CUBE_PATH) -> Tuple[Optional["MarketCube"], Optional[str]]:
+        """
+        Read a saved cube.
+
+        Args:
+            path (str): Path to market_cube.parquet.
+
+        Returns:
+            Tuple[Optional[MarketCube], Optional[str]]: The cube and the mtime of the CSV it was built from,
+                (None, None) when the files are of another layout or do not belong together.
+        """
+        from pyarrow import parquet
+
+        table = parquet.read_table(path)
+        rows = parquet.read_table(get_fingerprints_path(path))
+        metadata = table.schema.metadata or {}
+        saved_with = (rows.schema.metadata or {}).get(b"csv_mtime")
+        if metadata.get(b"format") != CUBE_FORMAT or saved_with != metadata.get(b"csv_mtime"):
+            return None, None
+
+        cells = table.to_pandas()
+        cells[DIMENSIONS] = cells[DIMENSIONS].astype(str)
+        fingerprints = rows.to_pandas().set_index("laptop_id")
+        return cls(cells, fingerprints), metadata[b"csv_mtime"].decode()
+
+def get_fingerprints_path(path: str) -> str:
+    return f"{os.path.splitext(path)[0]}_rows.parquet"
+
+def update_market_cube(catalogue_path: str = CATALOGUE_PATH, path: str = MARKET_CUBE_PATH) -> MarketCube:
+    """
+    Load the saved cube and bring it up to date with the catalogue, building it on the first run.
+
+    Args:
+        catalogue_path (str): Path to laptops_data.csv.
+        path (str): Path to market_cube.parquet.
+
+    Returns:
+        MarketCube: Up to date cube.
+    """
+    csv_mtime = os.path.getmtime(catalogue_path)
+    cube, saved_mtime = None, None
+    if os.path.exists(path) and os.path.exists(get_fingerprints_path(path)):
+        cube, saved_mtime = MarketCube.load(path)
+    if cube is not None and saved_mtime == str(csv_mtime):
+        return cube
+
+    data = read_catalogue(catalogue_path)
+    updated = cube.refresh(data) if cube is not None else MarketCube.build(data)
+    try:
+        updated.save(path, csv_mtime)
+    except (ImportError, OSError) as error:
+        logging.warning(f"Market cube could not be saved: {error}")
+    return updated
+
+@st.cache_resource(show_spinner=False)
+def get_market_cube(path: str, csv_mtime: float) -> MarketCube:
+    # Loaded once per process and refreshed when a new scrape replaces the CSV
+    try:
+        return update_market_cube(path)
+    except ImportError:
+        return MarketCube.build(load_catalogue(path))
+
+def load_market_cube(path: str = CATALOGUE_PATH) -> MarketCube:
+    """
+    Get the market cube of the shared catalogue.
+
+    Args:
+        path (str): Path to laptops_data.csv.
+
+    Returns:
+        MarketCube: Market statistics.
+    """
+    return get_market_cube(path, os.path.getmtime(path))
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Build or refresh the market statistics cube")
+    parser.add_argument("--catalogue", default=CATALOGUE_PATH, help="Path to laptops_data.csv")
+    parser.add_argument("--output", default=MARKET_CUBE_PATH, help="Path to market_cube.parquet")
+    parser.add_argument("--rebuild", action="store_true", help="Build from scratch instead of refreshing")
+    return parser.parse_args()
+
+def main() -> None:
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    args = parse_args()
+    start_time = time.time()
+    if args.rebuild:
+        cube = MarketCube.build(read_catalogue(args.catalogue))
+        cube.save(args.output, os.path.getmtime(args.catalogue))
+    else:
+        cube = update_market_cube(args.catalogue, args.output)
+    logging.info(f"Market cube of {len(cube.cells)} cells ready in {round(time.time() - start_time, 2)} seconds")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,235 @@
+import os
+import re
+import math
+import difflib
+import heapq
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Tuple
+import numpy as np
+import pandas as pd
+import streamlit as st
+from catalogue import CATALOGUE_PATH, load_catalogue
+from local_scoring import parse_number
+
+# Image links written by the cleaning pipeline
+IMAGES_PATH = "../scraper/data/laptop_images.csv"
+
+# Catalogue columns searched by text
+TEXT_COLUMNS: List[str] = ["brand", "model", "cpu_model", "gpu"]
+
+# Suggested config field, catalogue column and the relative difference counted as no match
+NUMERIC_FIELDS = [("RAM", "ram", 1.0), ("SSD/HDD Capacity", "storage", 1.0), ("Display Size", "display_diagonal", 0.2)]
+
+# Weights of token overlap, fuzzy name similarity and numeric proximity in the match score
+MATCH_WEIGHTS = (0.5, 0.3, 0.2)
+
+# Candidates re-ranked with fuzzy string scoring
+CANDIDATES = 50
+
+# Vocabulary tokens closer than this ratio stand in for a query token that is not in the index
+FUZZY_CUTOFF = 0.8
+
+def tokenize(text: Any) -> List[str]:
+    # "11th Gen Intel Core i3-1115G4" -> ["11th", "gen", "intel", "core", "i3", "1115g4"]
+    return re.findall(r"[a-z0-9]+", str(text).lower())
+
+def read_image_links(path: str = IMAGES_PATH) -> Dict[str, str]:
+    """
+    Read image links of catalogue laptops.
+
+    Args:
+        path (str): Path to laptop_images.csv.
+
+    Returns:
+        Dict[str, str]: Absolute image link by laptop id, empty if the file does not exist.
+    """
+    if not os.path.exists(path):
+        return {}
+    images = pd.read_csv(path, dtype=str).dropna()
+    links = images["image_link"].where(~images["image_link"].str.startswith("//"), "https:" + images["image_link"])
+    return dict(zip(images["laptop_id"], links))
+
+class MatchIndex:
+    """
+    Inverted token index over brand, model, CPU and GPU names of the catalogue.
+
+    A query scores every laptop sharing a token with it by IDF weight, re-ranks the best
+    candidates with fuzzy name similarity and numeric proximity on RAM, storage and display size.
+
+    Args:
+        data (pd.DataFrame): Dataframe with laptop configurations.
+        images (Dict[str, str]): Image link by laptop id.
+    """
+    def __init__(self, data: pd.DataFrame, images: Dict[str, str]) -> None:
+        text = data[TEXT_COLUMNS].astype(str).agg(" ".join, axis=1)
+        postings = defaultdict(list)
+        for position, name in enumerate(text):
+            for token in set(tokenize(name)):
+                postings[token].append(position)
+
+        self.size = len(data)
+        self.postings = {token: np.array(rows) for token, rows in postings.items()}
+        self.idf = {token: math.log(1 + self.size / len(rows)) for token, rows in postings.items()}
+        # Two tokens of 4+ characters above FUZZY_CUTOFF always share a bigram, so only
+        # the tokens sharing one with a misspelled token are compared with it
+        self.bigrams = defaultdict(set)
+        for token in self.postings:
+            for start in range(len(token) - 1):
+                self.bigrams[token[start:start + 2]].add(token)
+        self.fuzzy_tokens: Dict[str, Optional[Tuple[str, float]]] = {}
+        self.names = text.str.lower().tolist()
+
+        self.numeric = {
+            "ram": data["ram"].to_numpy(dtype=float),
+            "storage": (data["hdd_capacity"] + data["ssd_capacity"]).to_numpy(dtype=float),
+            "display_diagonal": data["display_diagonal"].to_numpy(dtype=float),
+        }
+        self.laptop_ids = data["laptop_id"].astype(str).to_numpy()
+        self.titles = (data["brand"].astype(str) + " " + data["model"].astype(str)).to_numpy()
+        self.prices = data["current_price"].to_numpy(dtype=float)
+        self.images = images
+
+    def resolve_token(self, token: str) -> Optional[Tuple[str, float]]:
+        """
+        Closest indexed token of a misspelled one and their similarity, memoized per index.
+
+        Only tokens sharing a bigram with it are compared, part numbers ("1115g4") and short
+        tokens are never resolved fuzzily.
+        """
+        if len(token) < 4 or any(char.isdigit() for char in token):
+            return None
+        # Read once, another session may clear the memo between a lookup and a write
+        resolved = self.fuzzy_tokens.get(token, False)
+        if resolved is not False:
+            return resolved
+
+        vocabulary = set()
+        for start in range(len(token) - 1):
+            vocabulary.update(self.bigrams.get(token[start:start + 2], ()))
+        close = difflib.get_close_matches(token, list(vocabulary), n=1, cutoff=FUZZY_CUTOFF)
+        resolved = (close[0], difflib.SequenceMatcher(None, token, close[0]).ratio()) if close else None
+        if len(self.fuzzy_tokens) > 10_000:
+            self.fuzzy_tokens.clear()
+        self.fuzzy_tokens[token] = resolved
+        return resolved
+
+    def score_tokens(self, tokens: List[str]) -> np.ndarray:
+        scores = np.zeros(self.size)
+        total = 0.0
+        for token in set(tokens):
+            weight = 1.0
+            if token not in self.postings:
+                resolved = self.resolve_token(token)
+                if resolved is None:
+                    continue
+                token, weight = resolved
+            scores[self.postings[token]] += weight * self.idf[token]
+            total += self.idf[token]
+        return scores / total if total else scores
+
+    def match(self, config: Dict[str, Any], k: int = 5) -> List[Dict[str, Any]]:
+        """
+        Resolve a suggested laptop configuration to catalogue laptops.
+
+        Args:
+            config (Dict[str, Any]): Suggested configuration (Name, CPU, GPU, RAM, SSD/HDD Capacity, Display Size).
+            k (int): Number of laptops.
+
+        Returns:
+            List[Dict[str, Any]]: Best matches first, with laptop_id, name, current_price, image_link and score.
+        """
+        query = " ".join(str(config.get(field, "")) for field in ("Name", "CPU", "GPU"))
+        token_scores = self.score_tokens(tokenize(query))
+
+        candidates = np.flatnonzero(token_scores)
+        if len(candidates) > CANDIDATES:
+            candidates = candidates[np.argpartition(token_scores[candidates], -CANDIDATES)[-CANDIDATES:]]
+        if len(candidates) == 0:
+            return []
+
+        proximity = np.zeros(len(candidates))
+        for field, column, tolerance in NUMERIC_FIELDS:
+            value = parse_number(config.get(field), np.nan)
+            if np.isnan(value) or value <= 0:
+                continue
+            difference = np.abs(self.numeric[column][candidates] - value) / value
+            proximity += np.clip(1 - difference / tolerance, 0, 1) / len(NUMERIC_FIELDS)
+
+        token_weight, fuzzy_weight, numeric_weight = MATCH_WEIGHTS
+        base = token_weight * token_scores[candidates] + numeric_weight * proximity
+
+        # The query is analysed once, identical catalogue names are compared once
+        matcher = difflib.SequenceMatcher(None)
+        matcher.set_seq2(" ".join(tokenize(query)))
+        bounds = {}
+        for idx in candidates:
+            name = self.names[idx]
+            if name not in bounds:
+                matcher.set_seq1(name)
+                bounds[name] = matcher.quick_ratio()
+        upper = base + fuzzy_weight * np.array([bounds[self.names[idx]] for idx in candidates])
+
+        # quick_ratio is an upper bound of ratio, the exact ratio is only computed for
+        # candidates whose bound still reaches the k-th best score
+        ratios = {}
+        best = []
+        scored = []
+        for position in np.argsort(-upper):
+            if best and len(best) == k and upper[position] < best[0]:
+                break
+            name = self.names[candidates[position]]
+            if name not in ratios:
+                matcher.set_seq1(name)
+                ratios[name] = matcher.ratio()
+            score = base[position] + fuzzy_weight * ratios[name]
+            if len(best) < k:
+                heapq.heappush(best, score)
+            elif k:
+                heapq.heappushpop(best, score)
+            scored.append(position)
+
+        scored = np.sort(scored)
+        fuzzy = np.array([ratios[self.names[idx]] for idx in candidates[scored]])
+        scores = token_weight * token_scores[candidates[scored]] + fuzzy_weight * fuzzy + numeric_weight * proximity[scored]
+        order = np.argsort(-scores)[:k]
+
+        matches = []
+        for idx, score in zip(candidates[scored][order], scores[order]):
+            price = self.prices[idx]
+            matches.append({
+                "laptop_id": self.laptop_ids[idx],
+                "name": self.titles[idx],
+                "current_price": None if np.isnan(price) else float(price),
+                "image_link": self.images.get(self.laptop_ids[idx]),
+                "score": round(float(score), 3),
+            })
+        return matches
+
+@st.cache_resource(show_spinner=False)
+def get_match_index(path: str, csv_mtime: float, images_path: str) -> MatchIndex:
+    # Built once per process and rebuilt when a new scrape replaces the CSV
+    return MatchIndex(load_catalogue(path), read_image_links(images_path))
+
+def match_laptop(config: Dict[str, Any], k: int = 5, path: str = CATALOGUE_PATH,
+                 images_path: str = IMAGES_PATH) -> List[Dict[str, Any]]:
+    """
+    Resolve a suggested laptop configuration to the top-k catalogue laptops.
+
+    Args:
+        config (Dict[str, Any]): Suggested laptop configuration.
+        k (int): Number of laptops.
+        path (str): Path to laptops_data.csv.
+        images_path (str): Path to laptop_images.csv.
+
+    Returns:
+        List[Dict[str, Any]]: Best matches first, with laptop_id, name, current_price, image_link and score.
+    """
+    index = get_match_index(path, os.path.getmtime(path), images_path)
+    return index.match(config, k)
+
+def get_best_match(config: Dict[str, Any], min_score: float = 0.5) -> Optional[Dict[str, Any]]:
+    # The catalogue laptop a suggestion refers to, None when nothing matches closely enough
+    matches = match_laptop(config, k=1)
+    if matches and matches[0]["score"] >= min_score:
+        return matches[0]
+    return None
@@ -2,69 +2,68 @@ from typing import Dict, Union, List, Tuple
 import streamlit as st
 import pandas as pd
 import numpy as np
-from groq import Groq
 import plotly.graph_objects as go
 import os
-
-def load_average_laptop() -> Dict[str, Dict[str, Union[str, float]]]:
+from catalogue import load_catalogue
+from facets import FacetIndex, load_facets
+from segments import pick_segment_row
+from assessment import build_assessment_prompt
+from scoring import assess_cached, assess_many, lookup_catalogue_scores
+from tracing import span, timed
+from market import get_gpu_family, load_market_cube
+
+@timed()
+def load_comparison_laptop(segment: str) -> Dict[str, Union[str, float]]:
     """
-    Load 3 random laptops from laptops_data.csv by usage type (gaming, non-gaming, apple)
-    and save their configurations into dictionary.
+    Load a random laptop of a usage segment (gaming laptop, macbook or laptop) from laptops_data.csv
+    and convert it into the sidebar configuration format.
 
     Args:
-        None
+        segment (str): "gaming laptop", "macbook" or "laptop".
 
     Returns:
-        laptop_list(Dict[str, Dict[str, Union[str, float]]]): Dictonary contaning 3 laptop configurations.
+        laptop_dict (Dict[str, Union[str, float]]): Laptop configuration.
     """
-    laptop_list = {}
     data = load_data()
-    data.rename(columns={"brand": "brand_name",
-                            "display_diagonal": "screen_size",
-                            "resolution": "screen_resolution",
-                            "gpu": "gpu_model",
-                            "ram": "ram_capacity"}, inplace=True)
-
-    gaming_laptop = data[data["gpu_model"].str.contains("RTX")].sample(n=1).copy()
-    mac = data[data["brand_name"] == "Apple"].sample(n=1).copy()
-    laptop = data[~data["gpu_model"].str.contains("RTX")].sample(n=1).copy()
+    laptop = data.iloc[[pick_segment_row(segment)]]
+    laptop = laptop.rename(columns={"brand": "brand_name",
+                                    "display_diagonal": "screen_size",
+                                    "resolution": "screen_resolution",
+                                    "gpu": "gpu_model",
+                                    "ram": "ram_capacity"})
 
     # Add 'memory' column
-    gaming_laptop["memory"] = gaming_laptop["hdd_capacity"] + gaming_laptop["ssd_capacity"]
-    mac["memory"] = mac["hdd_capacity"] + mac["ssd_capacity"]
     laptop["memory"] = laptop["hdd_capacity"] + laptop["ssd_capacity"]
 
-    gaming_laptop_dict = gaming_laptop.to_dict('records')[0]
-    mac_dict = mac.to_dict('records')[0]
     laptop_dict = laptop.to_dict('records')[0]
 
-    laptop_list = {
-        "gaming laptop": gaming_laptop_dict,
-        "macbook": mac_dict,
-        "laptop": laptop_dict
-    }
-
-    return laptop_list
+    return laptop_dict
 
+@timed()
 def load_data() -> pd.DataFrame:
     """
     Load laptops database from local directory.
 
+    The dataset is parsed once per process with explicit dtypes and shared across
+    sessions, every call returns a read-only view of it.
+
     Args:
         None
 
     Returns:
         data (pd.DataFrame): Dataframe with laptop configurations
     """
-    data = pd.read_csv("data/laptops_data.csv")
+    data = load_catalogue()
     return data
 
+@timed()
 def assess_laptop(config: Dict[str, Dict[str, Union[str, float]]]) -> Dict[str, float]:
     """
     Assess laptop by provided config according to five criteras: 
         genral use, gaming, data science, graphic design, and video editing on a scale of 1-10.
 
-    Grading process is handled by GroqCloud API (Llama3).
+    Grading process is handled by GroqCloud API (Llama3), configurations that were
+    already scored are answered from the persistent score store.
 
     Args:
         config(Dict[str, Dict[str, Union[str, float]]]): Laptop configuration to assess.
@@ -72,49 +71,20 @@ def assess_laptop(config: Dict[str, Dict[str, Union[str, float]]]) -> Dict[str,
     Returns:
         scoring_info (Dict[str, float]): Dictionary containing grading results.
     """
-    scoring_info = {}
-    client = Groq(
-        api_key=os.environ["GROQ_API_KEY"])
-    
-
-    prompt = f'''
-        Rate the following laptop configuration on a scale of 0-10 in terms of gaming, software development, video editing, general use, graphic design, data science:
-
-        - Brand: {config['brand_name']}
-        - Screen Size: {config['screen_size']} inches
-        - Screen Resolution: {config['screen_resolution']}
-        - CPU Brand: {config['cpu_brand']}
-        - CPU Model: {config['cpu_model']}
-        - CPU Frequency: {config['cpu_frequency']} GHz
-        - GPU Brand: {config['gpu_brand']}
-        - GPU Model: {config['gpu_model']}
-        - Memory Type: {config['memory_type']}
-        - Memory: {config['memory']} GB
-        - RAM Capacity: {config['ram_capacity']} GB
-
-        Please provide only key-value pair, example: "Gaming - 9, Video editing - 5, etc."
-    '''
-
-
-    chat_completion = client.chat.completions.create(
-        messages=[{"role": "user", "content": prompt}], model="llama3-8b-8192")
-    
-    response = chat_completion.choices[0].message.content
-    response = response.split('\n')[1:]
-
-    for idx, item in enumerate(response, start=1):
-        if item:
-            key, val = item.split(" - ")
-            scoring_info[key[2:]] = float(val)
+    prompt = build_assessment_prompt(config)
+    scoring_info = assess_cached(config, prompt)
 
     return scoring_info
 
-def show_sidebar(data: pd.DataFrame) -> Dict[str, Dict[str, Union[str, float]]]:
+@timed()
+def show_sidebar(facets: FacetIndex) -> Dict[str, Dict[str, Union[str, float]]]:
     """
     Implements sidebar menu logic to receive laptop configuration provided by user input.
 
+    Options are read from the facet index built once per dataset, so reruns never scan the dataframe.
+
     Args:
-        data (pd.DataFrame): Dataframe with laptop configurations.
+        facets (FacetIndex): Sidebar options of the laptops database.
 
     Returns:
         laptop_cfg (Dict[str, Dict[str, Union[str, float]]]): Dictionary containing user configuration settings.
@@ -127,37 +97,33 @@ def show_sidebar(data: pd.DataFrame) -> Dict[str, Dict[str, Union[str, float]]]:
     # General Infomation about the laptop
     st.sidebar.header("General Information")
     laptop_cfg["brand_name"] = st.sidebar.selectbox("Brand Name", 
-                                    data["brand"].unique())
+                                    facets.values["brand"])
     laptop_cfg["screen_size"] = st.sidebar.number_input("Screen Size, in", 
-                                        min_value=min(data["display_diagonal"].unique()),
-                                        max_value=max(data["display_diagonal"].unique()),
+                                        min_value=facets.ranges["display_diagonal"][0],
+                                        max_value=facets.ranges["display_diagonal"][1],
                                         step=0.1)
     laptop_cfg["screen_resolution"] = st.sidebar.selectbox("Screen Resolution",
-                                            data["resolution"].unique())
+                                            facets.values["resolution"])
     
     # CPU Information of the laptop
     st.sidebar.header("CPU Information")
-    cpu_mappings = {
-        "AMD": data[data["cpu_brand"] == "AMD"]["cpu_model"].unique(),
-        "Intel": data[data["cpu_brand"] == "Intel"]["cpu_model"].unique(),
-        "Apple": data[data["cpu_brand"] == "Apple"]["cpu_model"].unique(),
-    }
     if laptop_cfg["brand_name"] != "Apple":
+        cpu_brands = facets.get_children("brand", "cpu_brand", laptop_cfg["brand_name"])
         laptop_cfg["cpu_brand"] = st.sidebar.selectbox("CPU Brand",
-                                        data[data["cpu_brand"] != "Apple"]["cpu_brand"].unique())
+                                        [cpu_brand for cpu_brand in cpu_brands if cpu_brand != "Apple"])
         laptop_cfg["cpu_model"] = st.sidebar.selectbox("CPU Model",
-                                        cpu_mappings[laptop_cfg["cpu_brand"]])
+                                        facets.get_children("cpu_brand", "cpu_model", laptop_cfg["cpu_brand"]))
         laptop_cfg["cpu_frequency"] = st.sidebar.number_input("CPU Frequency, GHz",
-                                                min_value=min(data["cpu_frequency"].unique()),
-                                                max_value=max(data["cpu_frequency"].unique()),
+                                                min_value=facets.ranges["cpu_frequency"][0],
+                                                max_value=facets.ranges["cpu_frequency"][1],
                                                 step=0.1)
     else:
         laptop_cfg["cpu_brand"] = "Apple"
         laptop_cfg["cpu_model"] = st.sidebar.selectbox("CPU Model",
-                                        cpu_mappings[laptop_cfg["cpu_brand"]])
+                                        facets.get_children("cpu_brand", "cpu_model", laptop_cfg["cpu_brand"]))
         laptop_cfg["cpu_frequency"] = st.sidebar.number_input("CPU Frequency, GHz",
-                                                min_value=min(data["cpu_frequency"].unique()),
-                                                max_value=max(data["cpu_frequency"].unique()),
+                                                min_value=facets.ranges["cpu_frequency"][0],
+                                                max_value=facets.ranges["cpu_frequency"][1],
                                                 step=0.1)
         
     # GPU Configuration
@@ -178,7 +144,7 @@ def show_sidebar(data: pd.DataFrame) -> Dict[str, Dict[str, Union[str, float]]]:
     # Memory Configuration
     st.sidebar.header("Memory Information")
     laptop_cfg["memory_type"] = st.sidebar.radio("Memory Type",
-                                data["memory_type"].unique())
+                                facets.values["memory_type"])
     if laptop_cfg["memory_type"] == "SHDD":
         laptop_cfg["hdd"] = st.sidebar.selectbox("HDD Capacity, GB", [256, 512, 1024, 2048, 3096, 4096, 5128])
         
@@ -190,11 +156,50 @@ def show_sidebar(data: pd.DataFrame) -> Dict[str, Dict[str, Union[str, float]]]:
     st.sidebar.header("RAM Information")
     laptop_cfg["ram_capacity"] = st.sidebar.number_input("RAM Capacity, GB",
                                         min_value=0,
-                                        max_value=max(data["ram"].unique()),
+                                        max_value=facets.ranges["ram"][1],
                                         step=8)
 
     return laptop_cfg
 
+def show_market_offering(config: Dict[str, Union[str, float]]) -> None:
+    """
+    Show the median price and average specs of catalogue laptops like the configured one.
+
+    The statistics are read from the precomputed market cube, the most specific group
+    holding enough priced laptops is shown (e.g. 16 GB Lenovo laptops with an RTX GPU).
+
+    Args:
+        config (Dict[str, Union[str, float]]): Laptop configuration from the sidebar.
+
+    Returns:
+        None
+    """
+    ssd = config.get("ssd", config.get("memory") if config.get("memory_type") == "SSD" else None)
+    cell = load_market_cube().get_closest(brand=config["brand_name"], cpu_model=config["cpu_model"],
+                                          gpu_family=get_gpu_family(config["gpu_model"]),
+                                          ram=config["ram_capacity"] or None, ssd_capacity=ssd,
+                                          display_diagonal=config["screen_size"])
+    if cell is None:
+        return
+
+    units = {"ram": " GB", "ssd_capacity": " GB SSD", "display_diagonal": "″"}
+    group = [f"{value}{units.get(column, '')}" for column, value in cell.key.items() if value != "*"]
+    stats = cell.stats
+
+    st.title("Market Offering")
+    st.write(f"{' · '.join(group) if group else 'All laptops'}: {int(stats['price_count'])} laptops in stock")
+    col1, col2, col3 = st.columns([1, 1, 1])
+    col1.metric("Median Price", f"{stats['price_median']:,.0f} ₸".replace(",", " "))
+    col2.metric("Price Range (25-75%)", f"{stats['price_p25'] / 1000:,.0f}-{stats['price_p75'] / 1000:,.0f}K ₸")
+    col3.metric("Average Discount", f"{stats['discount_rate_percent_mean']:.1f}%")
+
+    specs = pd.DataFrame({
+        "Spec": ["RAM, GB", "SSD, GB", "CPU Frequency, GHz", "Screen Size, in", "Weight, kg"],
+        "Market Average": [stats["ram_mean"], stats["ssd_capacity_mean"], stats["cpu_frequency_mean"],
+                           stats["display_diagonal_mean"], stats["weight_mean"]],
+    })
+    st.dataframe(specs.round(2), hide_index=True, width="stretch")
+
 def show_main(data: pd.DataFrame) -> None:
     """
     LShows main page of the application including sidebar navigation.
@@ -220,20 +225,25 @@ def show_main(data: pd.DataFrame) -> None:
     with col3:
         toggle_recommendations_simplified = st.button("Recommend Laptop (simplified)", type="secondary")
 
-    laptop_configuration = show_sidebar(data)
-    configurations = load_average_laptop()
-    
-    if laptop_configuration["brand_name"] == "Apple":
-        comparison_configuration = configurations["macbook"]
-    elif "RTX" in laptop_configuration["gpu_model"] or "GTX" in laptop_configuration["gpu_model"]:
-        comparison_configuration = configurations["gaming laptop"]
-    else:
-        comparison_configuration = configurations["laptop"]
+    laptop_configuration = show_sidebar(load_facets())
 
     if toggle_configurator:
-
-        laptop_assessment = assess_laptop(laptop_configuration)
-        comparison_assessment = assess_laptop(comparison_configuration)
+        if laptop_configuration["brand_name"] == "Apple":
+            comparison_configuration = load_comparison_laptop("macbook")
+        elif "RTX" in laptop_configuration["gpu_model"] or "GTX" in laptop_configuration["gpu_model"]:
+            comparison_configuration = load_comparison_laptop("gaming laptop")
+        else:
+            comparison_configuration = load_comparison_laptop("laptop")
+
+        # Catalogue laptops are pre-scored by prescore.py, the LLM is asked only for missing ones
+        comparison_assessment = lookup_catalogue_scores(comparison_configuration["laptop_id"])
+        if comparison_assessment is None:
+            # Both configurations are assessed at the same time
+            laptop_assessment, comparison_assessment = assess_many(
+                [(laptop_configuration, build_assessment_prompt(laptop_configuration)),
+                 (comparison_configuration, build_assessment_prompt(comparison_configuration))])
+        else:
+            laptop_assessment = assess_laptop(laptop_configuration)
 
         data1 = {"Feature": list(laptop_assessment.keys()), "Rating1": list(laptop_assessment.values())}
         data2 = {"Feature": list(comparison_assessment.keys()), "Rating2": list(comparison_assessment.values())}
@@ -270,7 +280,9 @@ def show_main(data: pd.DataFrame) -> None:
         )
 
         st.title("Laptop Assessment Chart")
-        st.plotly_chart(fig)
+        with span("render_chart"):
+            st.plotly_chart(fig)
+        show_market_offering(laptop_configuration)
         st.markdown(f"<hr></hr>", unsafe_allow_html=True)
         st.write("Assessment criterias are subjective viewpoint of the app creator as well as assessment points provided using Generative AI APIs, my goal is to show general view from the perspective of machine, not professional with high expertise.")
 
@@ -1,23 +1,24 @@
 from typing import Dict, Optional
 import streamlit as st
-from groq import Groq
-from PIL import Image
 import pandas as pd
 import plotly.express as px
 import os
+from scoring import MODEL_NAME, assess_cached, assess_many, get_completion_client, lookup_catalogue_scores
+from responses import CONFIG_FORMAT, SCORES_FORMAT, ResponseError, parse_config_reply, request_structured
+from similarity import find_similar_laptops
+from matching import get_best_match
+from thumbnails import get_placeholder, get_thumbnail
+from tracing import span, timed
 
 st.set_page_config(layout="centered")
 
 with open("styles.css", "r") as file:
     st.markdown(f"<style>{file.read()}</style>", unsafe_allow_html=True)
 
-CLIENT = Groq(api_key=os.environ["GROQ_API_KEY"])
+CLIENT = get_completion_client()
 
 
-def assess_laptop(config: Dict[str, str]) -> Dict[str, float]:
-
-    scoring_info = {}
-    
+def build_prompt(config: Dict[str, str]) -> str:
 
     prompt = f'''
         Rate the following laptop configuration on a scale of 0-10 in terms of gaming, software development, video editing, general use, graphic design, data science:
@@ -30,89 +31,64 @@ def assess_laptop(config: Dict[str, str]) -> Dict[str, float]:
         - Memory: {config['SSD/HDD Capacity']} 
         - RAM Capacity: {config['RAM']} 
 
-        Please provide only key-value pair, example: "Gaming - 9, Video editing - 5, etc."
+        {SCORES_FORMAT}
     '''
+    return prompt
 
-
-    chat_completion = CLIENT.chat.completions.create(
-        messages=[{"role": "user", "content": prompt}], model="llama3-8b-8192")
-    
-    response = chat_completion.choices[0].message.content
-    response = response.split('\n')[1:]
-
-    for idx, item in enumerate(response, start=1):
-        if item:
-            key, val = item.split(" - ")
-            scoring_info[key[2:]] = [float(val)]
+@timed()
+def assess_laptop(config: Dict[str, str]) -> Dict[str, float]:
+    scoring_info = {key: [val] for key, val in assess_cached(config, build_prompt(config)).items()}
 
     return scoring_info
     
+@timed()
 def load_laptop(config: Dict[str, str]) -> Dict[str, str]:
-    
-    df = pd.read_csv("data/laptops_data.csv")
-
-
-    laptop = df[df["gpu_brand"] == config["GPU"].split()[0]].sample(n=1)
-    laptop["Name"] = df["brand"] + " " +  df["model"]
-    laptop["CPU"] = df["cpu_brand"] + " " + df["cpu_model"]
-    laptop["SSD/HDD Capacity"] = df["hdd_capacity"] + df["ssd_capacity"]
-
-    laptop.rename(columns={"gpu": "GPU",
-                        "display_diagonal": "Display Size",
-                        "resolution": "Resolution",
-                        "ram": "RAM"}, inplace=True)
-    
-    laptop["Display Size"] = laptop["Display Size"].astype('object')
-    laptop["RAM"] = laptop["RAM"].astype('object')
-    laptop["SSD/HDD Capacity"] = laptop["SSD/HDD Capacity"].astype('object')
-
-    laptop = laptop[["Name", "GPU", "CPU", "Display Size", "Resolution", "RAM", "SSD/HDD Capacity"]]
-
-    laptop_config = laptop.to_dict('records')[0]
+    """
+    Pick the catalogue laptop most similar to the suggested configuration within its price band.
+
+    Args:
+        config (Dict[str, str]): Suggested laptop configuration.
+
+    Returns:
+        laptop_config (Dict[str, str]): Configuration of the catalogue laptop in the suggestion format.
+    """
+    laptop = find_similar_laptops(config, k=1).iloc[0]
+
+    laptop_config = {
+        "laptop_id": laptop["laptop_id"],
+        "Name": f"{laptop['brand']} {laptop['model']}",
+        "GPU": laptop["gpu"],
+        "CPU": f"{laptop['cpu_brand']} {laptop['cpu_model']}",
+        "Display Size": float(laptop["display_diagonal"]),
+        "Resolution": laptop["resolution"],
+        "RAM": int(laptop["ram"]),
+        "SSD/HDD Capacity": float(laptop["hdd_capacity"] + laptop["ssd_capacity"]),
+    }
 
     return laptop_config
     
 
+@timed()
 def get_laptop_config(user_prompt: str) -> Dict[str, str]:
     
     prompt = f'''provide me only key value pair of name, 
                 configuration that includes only GPU, CPU, 
                 Display size, resolution, RAM, SSD/HDD capacity,
                 price of a laptop based on following user preferences (provide only one laptop option):\n{user_prompt}\n\n
-                Output must be provided as following sample:\n
-                Name: Acer Aspire 3\n
-                GPU: Intel Iris Xe Graphics\n
-                CPU: 11th Gen Intel Core i3-1115G4\n
-                Display Size: 15.6 inches\n
-                Resolution: Full HD (1920 x 1080)\n
-                RAM: 8GB LPDDR4\n
-                SSD/HDD Capacity: 512GB SSD\n
-                Price: $849\n\n
-                This laptop offers good performance for general use, including web browsing, email, office work, and streaming. The Intel Iris Xe Graphics provide adequate graphics power, while the 11th Gen Core i3 processor offers faster processing speeds. The 15.6-inch Full HD display is ideal for watching movies and working on documents. The 8GB RAM and 512GB SSD provide ample storage and fast loading times.'''
+                {CONFIG_FORMAT}'''
     
-    chat_completion = CLIENT.chat.completions.create(messages=[
-        {"role": "user", "content": prompt}],
-        model="llama3-8b-8192"
-    )
-    response = chat_completion.choices[0].message.content
-    response = response.split("\n")
-    laptop_cfg = {}
-    for elem in response[1:]:
-        if ":" in elem:
-            feature = elem.split(": ")
-            try:
-                laptop_cfg[feature[0]] = feature[1]
-            except IndexError:
-                st.markdown('''
-                            <style>
-                                .error-msg {
-                                    text-align: center;
-                                }
-                            </style>
-                            ''', unsafe_allow_html=True)
-                st.markdown("<h4 class='error-msg'>Laptop has been lost while searching, try one more time ;(</h4>", unsafe_allow_html=True)
-                return None
-
+    try:
+        laptop_cfg = request_structured(CLIENT, prompt, MODEL_NAME, parse_config_reply)
+    except ResponseError:
+        st.markdown('''
+                    <style>
+                        .error-msg {
+                            text-align: center;
+                        }
+                    </style>
+                    ''', unsafe_allow_html=True)
+        st.markdown("<h4 class='error-msg'>Laptop has been lost while searching, try one more time ;(</h4>", unsafe_allow_html=True)
+        return None
 
     return laptop_cfg
 
@@ -150,16 +126,30 @@ def show_laptop_info(config: Dict[str, str]) -> None:
             if key not in ["Name", "Price"]:
                 st.markdown(f"<span style='font-weight: bold; font-size: 16px'>{key}</span><br>{val}", unsafe_allow_html=True)
 
+@timed()
 def show_laptop_card(config: Dict[str, str]) -> None:
     laptop_name = config["Name"]
-    laptop_price = config["Price"]
+    laptop_price = f"{config['Price']}.99"
+    # The suggestion resolved to a real catalogue laptop, its photo and price are shown when found
+    match = get_best_match(config)
     with st.container(height=550, border=True):
-        laptop_image = Image.open("pages/1.jpg")
-        st.image(laptop_image)
+        # Thumbnails come from the local cache filled by thumbnails.py, the shop link is the fallback
+        thumbnail = get_thumbnail(match["laptop_id"]) if match is not None else None
+        if thumbnail is not None:
+            st.image(thumbnail)
+        elif match is not None and match["image_link"]:
+            st.image(match["image_link"])
+        elif get_placeholder() is not None:
+            st.image(get_placeholder())
+
+        if match is not None:
+            laptop_name = match["name"]
+            if match["current_price"] is not None:
+                laptop_price = f"{match['current_price']:,.0f} ₸".replace(",", " ")
 
         st.markdown(f"<h3>{laptop_name}</h3>", unsafe_allow_html=True)
         st.markdown(f"<p style='opacity: 0.5; margin-bottom: 1px'>Available in KZ</p>", unsafe_allow_html=True)
-        st.markdown(f"<h5 style='font-weight: 600'>{laptop_price}.99</h3>", unsafe_allow_html=True)
+        st.markdown(f"<h5 style='font-weight: 600'>{laptop_price}</h3>", unsafe_allow_html=True)
 
         btn1, btn2 = st.columns([1, 1])
         with btn1:
@@ -171,8 +161,16 @@ def show_charts(config: Dict[str, str]) -> None:
     with st.container(height=600, border=True):
         similar_laptop_cfg = load_laptop(config)
 
-        cfg_scoring = assess_laptop(config=config)
-        cfg_scoring_1 = assess_laptop(config=similar_laptop_cfg)
+        # Catalogue laptops are pre-scored by prescore.py, the LLM is asked only for missing ones
+        cfg_scoring_1 = lookup_catalogue_scores(similar_laptop_cfg["laptop_id"])
+        if cfg_scoring_1 is None:
+            # Both configurations are assessed at the same time
+            cfg_scoring, cfg_scoring_1 = assess_many([(config, build_prompt(config)),
+                                                      (similar_laptop_cfg, build_prompt(similar_laptop_cfg))])
+            cfg_scoring = {key: [val] for key, val in cfg_scoring.items()}
+        else:
+            cfg_scoring = assess_laptop(config=config)
+        cfg_scoring_1 = {key: [val] for key, val in cfg_scoring_1.items()}
 
         df1 = pd.DataFrame(cfg_scoring)
         df1 = df1.transpose().reset_index()
@@ -191,7 +189,8 @@ def show_charts(config: Dict[str, str]) -> None:
         fig.update_xaxes(title="")
 
         st.header(f"General Assessment of {config["Name"]}")
-        st.plotly_chart(fig)
+        with span("render_chart"):
+            st.plotly_chart(fig)
         
 
 def execute_recomendation():
@@ -199,6 +198,8 @@ def execute_recomendation():
     
     if prompt:
         suggested_laptop_cfg: Dict[str, str] = get_laptop_config(prompt)
+        if suggested_laptop_cfg is None:
+            return
         card_column, gap, description_column = st.columns([1, 0.2, 1])  
 
         with card_column:
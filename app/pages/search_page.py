@@ -0,0 +1,102 @@
+import math
+import streamlit as st
+from facets import FacetIndex, load_facets
+from query import Query, search_catalogue
+
+# Sort options shown to the user and their catalogue column
+SORT_OPTIONS = {
+    "Discount": "discount_rate_percent",
+    "Price": "current_price",
+    "RAM": "ram",
+    "SSD Capacity": "ssd_capacity",
+    "CPU Frequency": "cpu_frequency",
+    "Weight": "weight",
+}
+
+# Columns of the results table and their titles
+RESULT_COLUMNS = {
+    "brand": "Brand",
+    "model": "Model",
+    "cpu_model": "CPU",
+    "gpu": "GPU",
+    "ram": "RAM, GB",
+    "ssd_capacity": "SSD, GB",
+    "display_diagonal": "Display, in",
+    "current_price": "Price, ₸",
+    "discount_rate_percent": "Discount, %",
+}
+
+PAGE_SIZE = 20
+
+# Session state key of the page number widget, the only place the current page is kept
+PAGE_KEY = "search_page"
+
+def reset_page() -> None:
+    # Filters changed, so results start over from the first page (callbacks may write widget state)
+    st.session_state[PAGE_KEY] = 1
+
+def show_filters(facets: FacetIndex) -> Query:
+    """
+    Implements sidebar menu logic to receive search filters provided by user input.
+
+    Args:
+        facets (FacetIndex): Sidebar options of the laptops database.
+
+    Returns:
+        query (Query): Search request without the page number.
+    """
+    st.sidebar.title("Search Filters")
+
+    brands = st.sidebar.multiselect("Brand", facets.values["brand"], on_change=reset_page)
+    cpu_brands = st.sidebar.multiselect("CPU Brand", facets.values["cpu_brand"], on_change=reset_page)
+    gpu = st.sidebar.text_input("GPU contains", placeholder="RTX", on_change=reset_page)
+
+    ram_min = st.sidebar.selectbox("Minimum RAM, GB", [None, 8, 16, 32, 64],
+                                   format_func=lambda val: "Any" if val is None else str(val), on_change=reset_page)
+    price_max = st.sidebar.number_input("Maximum Price, ₸", min_value=0, value=None, step=50_000,
+                                        on_change=reset_page)
+
+    sort_label = st.sidebar.selectbox("Sort by", list(SORT_OPTIONS), on_change=reset_page)
+    ascending = st.sidebar.radio("Order", ["Descending", "Ascending"], on_change=reset_page) == "Ascending"
+
+    return Query(
+        values={"brand": brands, "cpu_brand": cpu_brands},
+        contains={"gpu": gpu.strip()},
+        ranges={"ram": (ram_min, None), "current_price": (None, price_max)},
+        sort_by=SORT_OPTIONS[sort_label],
+        ascending=ascending,
+        page_size=PAGE_SIZE,
+    )
+
+def show_results(query: Query) -> None:
+    """
+    Show one page of the search results with page navigation.
+
+    Args:
+        query (Query): Search request without the page number.
+
+    Returns:
+        None
+    """
+    # The page is only read here, it is written by the widget below and by reset_page
+    page = st.session_state.get(PAGE_KEY, 1)
+    result = search_catalogue(query._replace(page=page - 1))
+    pages = max(math.ceil(result.total / query.page_size), 1)
+
+    st.write(f"{result.total} laptops found")
+    rows = result.rows[list(RESULT_COLUMNS)].rename(columns=RESULT_COLUMNS)
+    st.dataframe(rows, hide_index=True, width="stretch")
+    st.number_input(f"Page (of {pages})", min_value=1, max_value=max(pages, page), step=1, key=PAGE_KEY)
+
+def main():
+    st.set_page_config(page_title="Laptopio - Search", page_icon=":computer:", layout="wide")
+
+    with open("styles.css") as file:
+        st.markdown(f"<style>{file.read()}</style>", unsafe_allow_html=True)
+
+    st.title("🔎 Laptop Search")
+    query = show_filters(load_facets())
+    show_results(query)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,200 @@
+import os
+import time
+import asyncio
+import logging
+import argparse
+from typing import Dict, List, Optional, Tuple
+import pandas as pd
+from catalogue import CATALOGUE_PATH, read_catalogue
+from assessment import (CATALOGUE_SCORES_PATH, MODEL_NAME, SCORE_COLUMNS, build_assessment_prompt,
+                        get_catalogue_config)
+from responses import ResponseError
+from retries import REQUEST_DEADLINE, RetryState, classify_status, get_breaker, parse_retry_after
+from scoring import COMPLETION_BACKENDS, CompletionClient, arequest_scores
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+class RateLimiter:
+    """
+    Spaces out requests to the completion API so that at most `rate` start per second.
+
+    Args:
+        rate (float): Maximum number of requests per second.
+    """
+    def __init__(self, rate: float) -> None:
+        self.interval = 1 / rate
+        self.next_slot = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    async def wait(self) -> None:
+        async with self.lock:
+            now = time.monotonic()
+            delay = self.next_slot - now
+            self.next_slot = max(now, self.next_slot) + self.interval
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+def read_scored(path: str) -> pd.DataFrame:
+    """
+    Read the scores written by a previous (possibly interrupted) run.
+
+    Args:
+        path (str): Path to laptop_scores.parquet.
+
+    Returns:
+        pd.DataFrame: Scores by laptop id, empty if the file does not exist.
+    """
+    if not os.path.exists(path):
+        return pd.DataFrame(columns=["laptop_id", "model_name", *SCORE_COLUMNS.values()])
+    return pd.read_parquet(path)
+
+def save_scores(rows: List[Dict[str, object]], path: str) -> None:
+    # Written to a temporary file first so an interrupted run never leaves a truncated table
+    scores = pd.DataFrame(rows, columns=["laptop_id", "model_name", *SCORE_COLUMNS.values()])
+    scores["laptop_id"] = scores["laptop_id"].astype(str)
+    temp_path = f"{path}.tmp"
+    scores.to_parquet(temp_path, index=False)
+    os.replace(temp_path, path)
+
+def get_failure_kind(error: Exception) -> Tuple[Optional[str], Optional[float]]:
+    """
+    Failure kind of a completion request in terms of retry.RETRY_POLICIES.
+
+    Args:
+        error (Exception): Error raised by the request.
+
+    Returns:
+        Tuple[Optional[str], Optional[float]]: Failure kind, None when retrying cannot help
+            (e.g. an invalid API key), and the seconds asked for by a Retry-After header.
+    """
+    if isinstance(error, ResponseError):
+        # The backend answered but the reply stayed incomplete after its repair budget
+        return "server", None
+    status = getattr(error, "status_code", None)
+    if status is None:
+        return "network", None
+    headers = getattr(getattr(error, "response", None), "headers", None) or {}
+    return classify_status(status), parse_retry_after(headers.get("Retry-After"))
+
+async def score_laptop(laptop: Dict[str, object], client: CompletionClient, limiter: RateLimiter,
+                       semaphore: asyncio.Semaphore, retries: int, model: str,
+                       deadline: float = REQUEST_DEADLINE) -> Optional[Dict[str, object]]:
+    """
+    Request scores of one catalogue laptop with the scraper's retry policies (see retry.RETRY_POLICIES).
+
+    Throttling, server errors, connection errors and incomplete replies are retried with
+    jittered exponential backoff, and a Retry-After answer pauses every request to the backend
+    through its circuit breaker. Errors retrying cannot fix are not retried.
+
+    Args:
+        laptop (Dict[str, object]): Catalogue row as a dictionary.
+        client (CompletionClient): Completion backend.
+        limiter (RateLimiter): Shared request rate limiter.
+        semaphore (asyncio.Semaphore): Concurrency limit.
+        retries (int): Maximum number of attempts.
+        model (str): Model name.
+        deadline (float): Seconds the laptop may take including backoff.
+
+    Returns:
+        Optional[Dict[str, object]]: Row of the scores table, None if every attempt failed.
+    """
+    prompt = build_assessment_prompt(get_catalogue_config(laptop))
+    breaker = get_breaker(type(client).__name__)
+    state = RetryState(deadline)
+    async with semaphore:
+        for attempt in range(retries):
+            if not await breaker.wait(state.deadline):
+                logging.warning(f"Backend is paused past the deadline of laptop {laptop['laptop_id']}")
+                break
+            await limiter.wait()
+            try:
+                scores = await arequest_scores(client, prompt, model)
+                breaker.record_success()
+                row = {"laptop_id": laptop["laptop_id"], "model_name": model}
+                row.update({column: scores[category] for category, column in SCORE_COLUMNS.items()})
+                return row
+            except Exception as error:
+                kind, retry_after = get_failure_kind(error)
+                if retry_after is not None:
+                    breaker.pause(retry_after)
+                retry, delay = state.next_delay(kind, retry_after) if kind else (False, 0.0)
+                if not retry or attempt == retries - 1:
+                    logging.warning(f"Scoring laptop {laptop['laptop_id']} failed ({error})")
+                    break
+                logging.warning(f"Scoring laptop {laptop['laptop_id']} failed ({error})... retrying")
+                await asyncio.sleep(delay)
+
+    logging.error(f"Laptop {laptop['laptop_id']} could not be scored")
+    return None
+
+async def prescore_catalogue(data: pd.DataFrame, client: CompletionClient, path: str = CATALOGUE_SCORES_PATH,
+                             concurrency: int = 4, rate: float = 2.0, retries: int = 3,
+                             checkpoint_every: int = 50, model: str = MODEL_NAME) -> pd.DataFrame:
+    """
+    Score every catalogue laptop not scored yet and write the six category scores to a side table.
+
+    The table is rewritten every `checkpoint_every` results, so an interrupted run resumes
+    from the laptops that are still missing. Scores of other models are kept.
+
+    Args:
+        data (pd.DataFrame): Catalogue (laptops_data.csv).
+        client (CompletionClient): Completion backend.
+        path (str): Path to laptop_scores.parquet.
+        concurrency (int): Maximum number of requests in flight.
+        rate (float): Maximum number of requests per second.
+        retries (int): Number of attempts per laptop.
+        checkpoint_every (int): Number of results between table rewrites.
+        model (str): Model name.
+
+    Returns:
+        pd.DataFrame: The scores table.
+    """
+    scored = read_scored(path)
+    rows = scored.to_dict("records")
+    scored = scored[scored["model_name"] == model]
+    done = set(scored["laptop_id"].astype(str))
+
+    pending = [laptop for laptop in data.to_dict("records") if str(laptop["laptop_id"]) not in done]
+    logging.info(f"{len(done)} laptops already scored, {len(pending)} to score")
+
+    limiter = RateLimiter(rate)
+    semaphore = asyncio.Semaphore(concurrency)
+    tasks = [score_laptop(laptop, client, limiter, semaphore, retries, model) for laptop in pending]
+
+    start_time = time.time()
+    scored_now = 0
+    for future in asyncio.as_completed(tasks):
+        row = await future
+        if row is None:
+            continue
+        rows.append(row)
+        scored_now += 1
+        if scored_now % checkpoint_every == 0:
+            save_scores(rows, path)
+            logging.info(f"Checkpoint: {len(done) + scored_now} laptops scored")
+
+    save_scores(rows, path)
+    logging.info(f"Scored {scored_now} laptops in {round(time.time() - start_time, 2)} seconds, "
+                 f"{len(pending) - scored_now} missing")
+
+    return read_scored(path)
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Pre-score every catalogue laptop with the completion API")
+    parser.add_argument("--catalogue", default=CATALOGUE_PATH, help="Path to laptops_data.csv")
+    parser.add_argument("--output", default=CATALOGUE_SCORES_PATH, help="Path to the scores side table")
+    parser.add_argument("--backend", choices=sorted(COMPLETION_BACKENDS),
+                        default=os.environ.get("LAPTOPIO_COMPLETION_BACKEND", "groq"))
+    parser.add_argument("--concurrency", type=int, default=4, help="Maximum number of requests in flight")
+    parser.add_argument("--rate", type=float, default=2.0, help="Maximum requests per second")
+    parser.add_argument("--retries", type=int, default=3, help="Attempts per laptop")
+    return parser.parse_args()
+
+def main() -> None:
+    args = parse_args()
+    data = read_catalogue(args.catalogue)
+    client = COMPLETION_BACKENDS[args.backend]()
+    asyncio.run(prescore_catalogue(data, client, args.output, args.concurrency, args.rate, args.retries))
+
+if __name__ == "__main__":
+    main()
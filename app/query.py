@@ -0,0 +1,168 @@
+import os
+from typing import Dict, List, NamedTuple, Optional, Tuple
+import numpy as np
+import pandas as pd
+import streamlit as st
+from catalogue import CATALOGUE_PATH, CATEGORICAL_COLUMNS, load_catalogue
+
+# Numeric columns with a sorted index for range predicates and sorting
+RANGE_COLUMNS: List[str] = ["old_price", "current_price", "discount_rate_percent", "cpu_frequency", "ram",
+                            "hdd_capacity", "ssd_capacity", "display_diagonal", "weight"]
+
+class Query(NamedTuple):
+    """
+    Catalogue search request.
+
+    Attributes:
+        values: Allowed values by categorical column (any of them matches), None for no filter.
+        ranges: (min, max) by numeric column, None for an open end, None for no filter.
+        contains: Substring by categorical column, case insensitive (e.g. {"gpu": "RTX"}), None for no filter.
+        sort_by: Numeric column to sort by, None keeps the catalogue order.
+        ascending: Sort direction, missing values always come last.
+        page: Page number starting from 0.
+        page_size: Rows per page.
+    """
+    # None rather than {} defaults, a mutable default would be shared by every Query
+    values: Optional[Dict[str, List[str]]] = None
+    ranges: Optional[Dict[str, Tuple[Optional[float], Optional[float]]]] = None
+    contains: Optional[Dict[str, str]] = None
+    sort_by: Optional[str] = None
+    ascending: bool = True
+    page: int = 0
+    page_size: int = 20
+
+class QueryResult(NamedTuple):
+    """
+    Page of a catalogue search.
+
+    Attributes:
+        total: Number of matching laptops.
+        positions: Catalogue row positions of the page.
+        rows: Catalogue rows of the page.
+    """
+    total: int
+    positions: np.ndarray
+    rows: pd.DataFrame
+
+class QueryEngine:
+    """
+    Filtered and ranked catalogue search over precomputed indexes.
+
+    Every value of a categorical column has a bitmap of the rows holding it, every numeric
+    column a sorted index answering range predicates with two binary searches. Predicates are
+    evaluated on these indexes only, and only the rows of the requested page are sorted
+    (argpartition of the first pages, then a sort of that slice only).
+
+    Args:
+        data (pd.DataFrame): Dataframe with laptop configurations.
+    """
+    def __init__(self, data: pd.DataFrame) -> None:
+        self.data = data
+        self.size = len(data)
+
+        self.categories: Dict[str, pd.Index] = {}
+        self.bitmaps: Dict[str, np.ndarray] = {}
+        for column in CATEGORICAL_COLUMNS:
+            categorical = data[column].astype("category")
+            codes = categorical.cat.codes.to_numpy()
+            self.categories[column] = categorical.cat.categories
+            # Row bitmap of every category, one row per category code
+            bitmaps = np.zeros((len(self.categories[column]), self.size), dtype=bool)
+            valid = codes >= 0
+            bitmaps[codes[valid], np.flatnonzero(valid)] = True
+            self.bitmaps[column] = bitmaps
+
+        self.values: Dict[str, np.ndarray] = {}
+        self.sorted_positions: Dict[str, np.ndarray] = {}
+        self.sorted_values: Dict[str, np.ndarray] = {}
+        for column in RANGE_COLUMNS:
+            values = data[column].to_numpy(dtype=np.float64)
+            order = np.argsort(values, kind="stable")  # NaN sorts last
+            self.values[column] = values
+            self.sorted_positions[column] = order
+            self.sorted_values[column] = values[order]
+
+    def category_mask(self, column: str, codes: np.ndarray) -> np.ndarray:
+        if len(codes) == 0:
+            return np.zeros(self.size, dtype=bool)
+        return np.logical_or.reduce(self.bitmaps[column][codes], axis=0)
+
+    def range_mask(self, column: str, low: Optional[float], high: Optional[float]) -> np.ndarray:
+        sorted_values = self.sorted_values[column]
+        start = 0 if low is None else np.searchsorted(sorted_values, low, side="left")
+        end = np.count_nonzero(~np.isnan(sorted_values)) if high is None else np.searchsorted(sorted_values, high, side="right")
+        mask = np.zeros(self.size, dtype=bool)
+        mask[self.sorted_positions[column][start:end]] = True
+        return mask
+
+    def filter(self, query: Query) -> np.ndarray:
+        """
+        Evaluate the predicates of a query on the indexes.
+
+        Args:
+            query (Query): Search request.
+
+        Returns:
+            np.ndarray: Row mask of the matching laptops.
+        """
+        mask = np.ones(self.size, dtype=bool)
+        for column, values in (query.values or {}).items():
+            if values:
+                codes = self.categories[column].get_indexer(values)
+                mask &= self.category_mask(column, codes[codes >= 0])
+        for column, substring in (query.contains or {}).items():
+            if substring:
+                matching = self.categories[column].str.contains(substring, case=False, regex=False)
+                mask &= self.category_mask(column, np.flatnonzero(matching))
+        for column, (low, high) in (query.ranges or {}).items():
+            if low is not None or high is not None:
+                mask &= self.range_mask(column, low, high)
+        return mask
+
+    def execute(self, query: Query) -> QueryResult:
+        """
+        Run a search and return one page of it.
+
+        Args:
+            query (Query): Search request.
+
+        Returns:
+            QueryResult: Number of matches and the rows of the requested page.
+        """
+        positions = np.flatnonzero(self.filter(query))
+        start = query.page * query.page_size
+        end = start + query.page_size
+
+        if query.sort_by is not None and len(positions):
+            keys = self.values[query.sort_by][positions]
+            keys = np.where(np.isnan(keys), np.inf, keys if query.ascending else -keys)
+            if end < len(positions):
+                # Rows tied with the last one of the page are kept so ties are broken by catalogue order
+                boundary = keys[np.argpartition(keys, end - 1)[end - 1]]
+                head = np.flatnonzero(keys <= boundary)
+            else:
+                head = np.arange(len(positions))
+            head = head[np.lexsort((positions[head], keys[head]))]
+            page = positions[head[start:end]]
+        else:
+            page = positions[start:end]
+
+        return QueryResult(len(positions), page, self.data.iloc[page])
+
+@st.cache_resource(show_spinner=False)
+def get_query_engine(path: str, csv_mtime: float) -> QueryEngine:
+    # Built once per process and rebuilt when a new scrape replaces the CSV
+    return QueryEngine(load_catalogue(path))
+
+def search_catalogue(query: Query, path: str = CATALOGUE_PATH) -> QueryResult:
+    """
+    Search the shared catalogue.
+
+    Args:
+        query (Query): Search request.
+        path (str): Path to laptops_data.csv.
+
+    Returns:
+        QueryResult: Number of matches and the rows of the requested page.
+    """
+    return get_query_engine(path, os.path.getmtime(path)).execute(query)
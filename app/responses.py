@@ -0,0 +1,246 @@
+import re
+import json
+import logging
+import threading
+from typing import Any, Dict, Generator, List, Optional, Tuple
+from tracing import REGISTRY
+
+# Categories every assessment prompt asks for
+SCORE_CATEGORIES = ["Gaming", "Software Development", "Video Editing",
+                    "General Use", "Graphic Design", "Data Science"]
+
+# Fields of a suggested laptop configuration
+CONFIG_FIELDS = ["Name", "GPU", "CPU", "Display Size", "Resolution", "RAM", "SSD/HDD Capacity", "Price"]
+
+# Other spellings of configuration fields seen in replies
+CONFIG_ALIASES = {
+    "model": "Name",
+    "laptop": "Name",
+    "graphics": "GPU",
+    "processor": "CPU",
+    "screensize": "Display Size",
+    "display": "Display Size",
+    "screenresolution": "Resolution",
+    "memory": "RAM",
+    "storage": "SSD/HDD Capacity",
+    "ssd": "SSD/HDD Capacity",
+    "ssdcapacity": "SSD/HDD Capacity",
+}
+
+# Follow-up requests allowed for the fields missing from a reply
+REPAIR_BUDGET = 2
+
+SCORES_FORMAT = ('Reply with a single JSON object only, mapping each category to a number from 0 to 10, '
+                 'e.g. {"Gaming": 9, "Software Development": 7, "Video Editing": 5, "General Use": 8, '
+                 '"Graphic Design": 6, "Data Science": 7}')
+
+CONFIG_FORMAT = ('Reply with a single JSON object only with the keys "Name", "GPU", "CPU", "Display Size", '
+                 '"Resolution", "RAM", "SSD/HDD Capacity" and "Price", e.g. {"Name": "Acer Aspire 3", '
+                 '"GPU": "Intel Iris Xe Graphics", "CPU": "11th Gen Intel Core i3-1115G4", '
+                 '"Display Size": "15.6 inches", "Resolution": "Full HD (1920 x 1080)", "RAM": "8GB LPDDR4", '
+                 '"SSD/HDD Capacity": "512GB SSD", "Price": "$849"}')
+
+class ResponseError(ValueError):
+    """
+    Reply of the completion backend that could not be repaired into the expected structure.
+
+    Args:
+        missing (List[str]): Fields missing from the reply.
+    """
+    def __init__(self, missing: List[str]) -> None:
+        super().__init__(f"Reply is missing {', '.join(missing)}")
+        self.missing = missing
+
+class ResponseMetrics:
+    """
+    Process-wide counters of reply handling.
+
+    replies: replies parsed, structured: replies that were valid JSON, repaired: replies
+    recovered from free text, retries: follow-up requests for missing fields, failures:
+    requests that stayed incomplete after the repair budget.
+    """
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.counters = {"replies": 0, "structured": 0, "repaired": 0, "retries": 0, "failures": 0}
+
+    def count(self, name: str) -> None:
+        with self.lock:
+            self.counters[name] += 1
+
+    def snapshot(self) -> Dict[str, int]:
+        with self.lock:
+            return dict(self.counters)
+
+RESPONSE_METRICS = ResponseMetrics()
+REGISTRY.add_collector("llm_replies", RESPONSE_METRICS.snapshot)
+
+def get_response_metrics() -> Dict[str, int]:
+    return RESPONSE_METRICS.snapshot()
+
+def normalize_key(key: str) -> str:
+    # "* Software development" / "software_development" / "SSD/HDD capacity" -> "softwaredevelopment", "ssdhddcapacity"
+    return re.sub(r"[^a-z0-9]", "", str(key).lower())
+
+def extract_pairs(response: str) -> Tuple[Dict[str, Any], bool]:
+    """
+    Extract key-value pairs from a reply, preferring a JSON object anywhere in it.
+
+    Free text is read line by line ("* Gaming - 7", "CPU: Intel Core i5"), lines with
+    several comma-separated pairs ("Gaming - 9, Video editing - 5") are split.
+
+    Args:
+        response (str): Completion text.
+
+    Returns:
+        Tuple[Dict[str, Any], bool]: Pairs and whether they came from a JSON object.
+    """
+    # The first brace that starts a decodable object, text or braces after it are ignored
+    decoder = json.JSONDecoder()
+    for match in re.finditer(r"\{", response):
+        try:
+            pairs, _ = decoder.raw_decode(response, match.start())
+        except json.JSONDecodeError:
+            continue
+        if isinstance(pairs, dict):
+            return pairs, True
+
+    pairs = {}
+    for line in response.splitlines():
+        items = line.split(",") if re.search(r"\s[-–:]\s*\d.*,", line) else [line]
+        for item in items:
+            # Markdown bold and italic markers may wrap the key, the value or both ("**Name:** Dell XPS 13")
+            found = re.match(r"^[\s*_•#>\-\d.)]*([A-Za-z][^:]*?)[*_]*\s*(?::|\s[-–=]\s)[\s*_]*(.+?)[\s*_]*$", item)
+            if found:
+                pairs[found.group(1).strip()] = found.group(2).strip().strip('"')
+    return pairs, False
+
+def parse_score_value(value: Any) -> Optional[float]:
+    # 7, "7", "7.5/10", "8 out of 10" -> 0-10, None when there is no number
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return min(max(float(value), 0.0), 10.0)
+    number = re.search(r"\d+(?:\.\d+)?", str(value))
+    return min(max(float(number.group(0)), 0.0), 10.0) if number else None
+
+def parse_score_reply(response: str) -> Tuple[Dict[str, float], List[str]]:
+    """
+    Parse and validate an assessment reply against the six score categories.
+
+    Args:
+        response (str): Completion text.
+
+    Returns:
+        Tuple[Dict[str, float], List[str]]: Valid category scores and the categories still missing.
+    """
+    pairs, structured = extract_pairs(response)
+    RESPONSE_METRICS.count("replies")
+    RESPONSE_METRICS.count("structured" if structured else "repaired")
+
+    categories = {normalize_key(category): category for category in SCORE_CATEGORIES}
+    scores = {}
+    for key, value in pairs.items():
+        category = categories.get(normalize_key(key))
+        score = parse_score_value(value)
+        if category is not None and score is not None:
+            scores[category] = score
+
+    return scores, [category for category in SCORE_CATEGORIES if category not in scores]
+
+def parse_config_reply(response: str) -> Tuple[Dict[str, str], List[str]]:
+    """
+    Parse and validate a suggested laptop configuration reply.
+
+    Args:
+        response (str): Completion text.
+
+    Returns:
+        Tuple[Dict[str, str], List[str]]: Valid configuration fields and the fields still missing.
+    """
+    pairs, structured = extract_pairs(response)
+    RESPONSE_METRICS.count("replies")
+    RESPONSE_METRICS.count("structured" if structured else "repaired")
+
+    fields = {normalize_key(field): field for field in CONFIG_FIELDS}
+    fields.update(CONFIG_ALIASES)
+    config = {}
+    for key, value in pairs.items():
+        field = fields.get(normalize_key(key))
+        if field is None or field in config or value in (None, ""):
+            continue
+        if field == "Price" and isinstance(value, (int, float)):
+            value = f"${value:g}"
+        config[field] = str(value).strip()
+
+    return config, [field for field in CONFIG_FIELDS if field not in config]
+
+def build_followup(prompt: str, missing: List[str]) -> str:
+    return (f"{prompt}\n\nYour previous reply did not include {', '.join(missing)}. "
+            f"Reply with a single JSON object with only these keys.")
+
+def repair_reply(prompt: str, parse: Any, budget: int = REPAIR_BUDGET) -> Generator[str, str, Dict[str, Any]]:
+    """
+    Prompt, parse and repair steps of a structured request, independent of how the backend is called.
+
+    Yields the prompts to send and receives their replies, asking again only for the fields
+    missing from the previous replies.
+
+    Args:
+        prompt (str): Prompt asking for the structure.
+        parse (Callable): parse_score_reply or parse_config_reply.
+        budget (int): Number of follow-up requests allowed.
+
+    Returns:
+        Dict[str, Any]: Complete validated reply.
+
+    Raises:
+        ResponseError: When fields are still missing after the follow-ups.
+    """
+    result, missing = parse((yield prompt))
+    for attempt in range(budget):
+        if not missing:
+            break
+        RESPONSE_METRICS.count("retries")
+        logging.info(f"Reply is missing {', '.join(missing)}, asking again")
+        extra, missing = parse((yield build_followup(prompt, missing)))
+        result.update({key: val for key, val in extra.items() if key not in result})
+        missing = [key for key in missing if key not in result]
+
+    if missing:
+        RESPONSE_METRICS.count("failures")
+        raise ResponseError(missing)
+    return result
+
+def request_structured(client: Any, prompt: str, model: str, parse: Any, budget: int = REPAIR_BUDGET) -> Dict[str, Any]:
+    """
+    Request a structured reply, asking again only for the fields missing from it.
+
+    Args:
+        client (CompletionClient): Completion backend.
+        prompt (str): Prompt asking for the structure.
+        model (str): Model name.
+        parse (Callable): parse_score_reply or parse_config_reply.
+        budget (int): Number of follow-up requests allowed.
+
+    Returns:
+        Dict[str, Any]: Complete validated reply.
+
+    Raises:
+        ResponseError: When fields are still missing after the follow-ups.
+    """
+    steps = repair_reply(prompt, parse, budget)
+    request = next(steps)
+    while True:
+        try:
+            request = steps.send(client.complete(request, model))
+        except StopIteration as done:
+            return done.value
+
+async def arequest_structured(client: Any, prompt: str, model: str, parse: Any,
+                              budget: int = REPAIR_BUDGET) -> Dict[str, Any]:
+    # Same as request_structured with the asynchronous client call
+    steps = repair_reply(prompt, parse, budget)
+    request = next(steps)
+    while True:
+        try:
+            request = steps.send(await client.acomplete(request, model))
+        except StopIteration as done:
+            return done.value
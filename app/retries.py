@@ -0,0 +1,36 @@
+import os
+import sys
+import importlib.util
+
+# Retry policies, jittered backoff, per-host circuit breakers and Retry-After parsing live in the scraper
+RETRY_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "scraper", "retry.py")
+
+def load_retry():
+    """
+    Import the scraper's retry module, from the path or from its file in the repository.
+
+    The file is loaded on its own rather than adding scraper/ to the path, so the scraper's
+    modules cannot shadow the app's.
+
+    Returns:
+        module: The retry module.
+    """
+    try:
+        import retry
+        return retry
+    except ImportError:
+        pass
+    spec = importlib.util.spec_from_file_location("retry", RETRY_PATH)
+    retry = importlib.util.module_from_spec(spec)
+    sys.modules["retry"] = retry
+    spec.loader.exec_module(retry)
+    return retry
+
+retry = load_retry()
+RETRY_POLICIES = retry.RETRY_POLICIES
+REQUEST_DEADLINE = retry.REQUEST_DEADLINE
+RetryPolicy = retry.RetryPolicy
+RetryState = retry.RetryState
+classify_status = retry.classify_status
+get_breaker = retry.get_breaker
+parse_retry_after = retry.parse_retry_after
@@ -0,0 +1,388 @@
+import os
+import json
+import asyncio
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Dict, List, Optional, Tuple, Union
+import numpy as np
+import pandas as pd
+import streamlit as st
+from assessment import CATALOGUE_SCORES_PATH, MODEL_NAME, SCORE_COLUMNS
+from local_scoring import score_config
+from responses import SCORE_CATEGORIES, ResponseError, arequest_structured, parse_score_reply, request_structured
+from tracing import REGISTRY, inc, timed
+
+SCORE_CACHE_PATH = ".cache/scores.sqlite"
+
+# Seconds an assessment waits for the completion backend before the local scoring model answers instead
+LLM_BUDGET = float(os.environ.get("LAPTOPIO_LLM_BUDGET", 10))
+
+# Seconds between checks for a rerun of the session while completion calls are awaited
+WAIT_SLICE = 0.1
+
+# Completion calls in flight across all sessions
+LLM_WORKERS = int(os.environ.get("LAPTOPIO_LLM_WORKERS", 8))
+
+# Scorer answering assessments: "llm" (completion backend with local fallback) or "local"
+SCORER = os.environ.get("LAPTOPIO_SCORER", "llm")
+
+class CompletionClient:
+    """
+    Chat completion backend used for laptop assessment.
+    """
+    def complete(self, prompt: str, model: str = MODEL_NAME) -> str:
+        raise NotImplementedError
+
+    async def acomplete(self, prompt: str, model: str = MODEL_NAME) -> str:
+        return await asyncio.to_thread(self.complete, prompt, model)
+
+class GroqCompletionClient(CompletionClient):
+    """
+    Chat completion backend calling GroqCloud API (Llama3).
+    """
+    def __init__(self, api_key: Optional[str] = None) -> None:
+        from groq import Groq
+        self.api_key = api_key or os.environ["GROQ_API_KEY"]
+        self.client = Groq(api_key=self.api_key)
+        self.async_client = None
+
+    def complete(self, prompt: str, model: str = MODEL_NAME) -> str:
+        chat_completion = self.client.chat.completions.create(
+            messages=[{"role": "user", "content": prompt}], model=model)
+        return chat_completion.choices[0].message.content
+
+    async def acomplete(self, prompt: str, model: str = MODEL_NAME) -> str:
+        if self.async_client is None:
+            from groq import AsyncGroq
+            self.async_client = AsyncGroq(api_key=self.api_key)
+        chat_completion = await self.async_client.chat.completions.create(
+            messages=[{"role": "user", "content": prompt}], model=model)
+        return chat_completion.choices[0].message.content
+
+class FakeCompletionClient(CompletionClient):
+    """
+    Local completion backend for tests and offline runs.
+
+    Answers assessment prompts with deterministic scores derived from the prompt hash,
+    any other prompt with a sample laptop configuration, and counts the calls it served.
+    Prompts asking for JSON get JSON, others the Llama3 free text format ("* Gaming - 7").
+    """
+    SAMPLE_CONFIG = {"Name": "Acer Aspire 3",
+                     "GPU": "Intel Iris Xe Graphics",
+                     "CPU": "11th Gen Intel Core i3-1115G4",
+                     "Display Size": "15.6 inches",
+                     "Resolution": "Full HD (1920 x 1080)",
+                     "RAM": "8GB LPDDR4",
+                     "SSD/HDD Capacity": "512GB SSD",
+                     "Price": "$849"}
+
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def complete(self, prompt: str, model: str = MODEL_NAME) -> str:
+        self.calls += 1
+        if "Rate the following laptop configuration" not in prompt:
+            if "JSON" in prompt:
+                return json.dumps(self.SAMPLE_CONFIG)
+            lines = [f"{key}: {val}" for key, val in self.SAMPLE_CONFIG.items()]
+            return "Here is a laptop that matches your preferences:\n" + "\n".join(lines)
+
+        digest = hashlib.sha256(prompt.split("\n\nYour previous reply")[0].encode("utf-8")).digest()
+        scores = {category: digest[idx] % 11 for idx, category in enumerate(SCORE_CATEGORIES)}
+        if "JSON" in prompt:
+            return json.dumps(scores)
+        lines = [f"* {category} - {score}" for category, score in scores.items()]
+        return "Here is the rating of the laptop configuration:\n" + "\n".join(lines)
+
+COMPLETION_BACKENDS = {
+    "groq": GroqCompletionClient,
+    "fake": FakeCompletionClient,
+}
+
+def normalize_value(value: Union[str, float, int, None]) -> Union[str, float, None]:
+    # "  GeForce  RTX 4060 " == "geforce rtx 4060", 16 == 16.0 == np.int8(16)
+    if isinstance(value, (bool, np.bool_)):
+        return str(value).lower()
+    if isinstance(value, (int, float, np.integer, np.floating)):
+        return None if np.isnan(value) else round(float(value), 3)
+    if value is None:
+        return None
+    return " ".join(str(value).split()).lower()
+
+def get_config_key(config: Dict[str, Union[str, float]], model: str = MODEL_NAME) -> str:
+    """
+    Canonical hash of a laptop configuration and the model assessing it.
+
+    Args:
+        config (Dict[str, Union[str, float]]): Laptop configuration.
+        model (str): Model name.
+
+    Returns:
+        str: SHA-256 hex digest of the normalized configuration.
+    """
+    normalized = {str(key).strip().lower(): normalize_value(val) for key, val in config.items()}
+    payload = json.dumps({"model": model, "config": normalized}, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+class ScoreStore:
+    """
+    Persistent store of assessment scores keyed by normalized configuration, kept in SQLite.
+
+    Args:
+        path (str): Path to the SQLite database file.
+        max_entries (int): Maximum number of stored assessments, least recently used are evicted first.
+        ttl (float): Seconds after which a stored assessment expires.
+    """
+    def __init__(self, path: str = SCORE_CACHE_PATH, max_entries: int = 50_000, ttl: float = 30 * 24 * 3600) -> None:
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.execute("""
+            CREATE TABLE IF NOT EXISTS scores (
+                key TEXT PRIMARY KEY,
+                scores TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+        """)
+        self.connection.execute("CREATE INDEX IF NOT EXISTS scores_accessed_at ON scores (accessed_at)")
+        self.connection.commit()
+
+    def get(self, key: str) -> Optional[Dict[str, float]]:
+        """
+        Get stored scores, counting a hit or a miss.
+
+        Args:
+            key (str): Configuration key from get_config_key.
+
+        Returns:
+            Optional[Dict[str, float]]: Stored scores, None if missing or expired.
+        """
+        now = time.time()
+        with self.lock:
+            row = self.connection.execute("SELECT scores, created_at FROM scores WHERE key = ?", (key,)).fetchone()
+            if row is None or row[1] < now - self.ttl:
+                self.misses += 1
+                return None
+            self.connection.execute("UPDATE scores SET accessed_at = ? WHERE key = ?", (now, key))
+            self.connection.commit()
+            self.hits += 1
+        return json.loads(row[0])
+
+    def put(self, key: str, scores: Dict[str, float]) -> None:
+        """
+        Store scores and evict expired and least recently used entries over the limit.
+
+        Args:
+            key (str): Configuration key from get_config_key.
+            scores (Dict[str, float]): Assessment scores.
+
+        Returns:
+            None
+        """
+        now = time.time()
+        with self.lock:
+            self.connection.execute("INSERT OR REPLACE INTO scores VALUES (?, ?, ?, ?)",
+                                    (key, json.dumps(scores), now, now))
+            self.connection.execute("DELETE FROM scores WHERE created_at < ?", (now - self.ttl,))
+            self.connection.execute("""
+                DELETE FROM scores WHERE key IN (
+                    SELECT key FROM scores ORDER BY accessed_at DESC LIMIT -1 OFFSET ?
+                )
+            """, (self.max_entries,))
+            self.connection.commit()
+
+    def stats(self) -> Dict[str, int]:
+        with self.lock:
+            size = self.connection.execute("SELECT COUNT(*) FROM scores").fetchone()[0]
+        return {"hits": self.hits, "misses": self.misses, "size": size}
+
+@st.cache_resource(show_spinner=False)
+def get_score_store() -> ScoreStore:
+    store = ScoreStore()
+    REGISTRY.add_collector("score_store", store.stats)
+    return store
+
+@st.cache_resource(show_spinner=False)
+def get_completion_client() -> CompletionClient:
+    """
+    Completion backend shared across sessions, chosen by LAPTOPIO_COMPLETION_BACKEND ("groq" by default).
+
+    Returns:
+        CompletionClient: The completion backend.
+    """
+    backend = os.environ.get("LAPTOPIO_COMPLETION_BACKEND", "groq")
+    return COMPLETION_BACKENDS[backend]()
+
+@st.cache_resource(show_spinner=False)
+def get_llm_executor() -> ThreadPoolExecutor:
+    # Completion calls of every session run here so a slow reply can be abandoned without blocking the page
+    return ThreadPoolExecutor(max_workers=LLM_WORKERS, thread_name_prefix="llm")
+
+def parse_scores(response: str) -> Dict[str, float]:
+    """
+    Parse and validate an assessment reply (JSON or "Key - value" lines).
+
+    Args:
+        response (str): Completion text.
+
+    Returns:
+        scoring_info (Dict[str, float]): Category scores.
+
+    Raises:
+        ResponseError: When a category is missing from the reply.
+    """
+    scoring_info, missing = parse_score_reply(response)
+    if missing:
+        raise ResponseError(missing)
+    return scoring_info
+
+@timed("llm_request")
+def request_scores(client: CompletionClient, prompt: str, model: str = MODEL_NAME) -> Dict[str, float]:
+    # Categories missing from the reply are asked for again within the repair budget
+    return request_structured(client, prompt, model, parse_score_reply)
+
+async def arequest_scores(client: CompletionClient, prompt: str, model: str = MODEL_NAME) -> Dict[str, float]:
+    return await arequest_structured(client, prompt, model, parse_score_reply)
+
+def check_rerun() -> None:
+    # Streamlit cannot interrupt a blocked script, but any access to the session state lets it
+    # raise RerunException (or StopException) once the user changed a widget or left the page
+    "assessments" in st.session_state
+
+def assess_many(requests: List[Tuple[Dict[str, Union[str, float]], str]], model: str = MODEL_NAME,
+                budget: Optional[float] = None) -> List[Dict[str, float]]:
+    """
+    Assess several laptop configurations at once, sending every completion request not answered
+    by the score store at the same time on the shared executor.
+
+    Every request waits at most the latency budget, so a page waits about as long as its slowest
+    call. A request that times out, or whose session reruns while waiting, is cancelled if it has
+    not started yet. When the backend fails, times out or replies in an unexpected format, the
+    local scoring model answers instead, and a reply arriving after the budget is still stored
+    for the next assessment of the configuration.
+
+    Args:
+        requests (List[Tuple[Dict[str, Union[str, float]], str]]): Laptop configurations and their assessment prompts.
+        model (str): Model name.
+        budget (Optional[float]): Seconds to wait for the backend, LLM_BUDGET by default.
+
+    Returns:
+        List[Dict[str, float]]: Category scores in the order of the requests.
+    """
+    if SCORER == "local":
+        return [score_config(config) for config, _ in requests]
+
+    store = get_score_store()
+    client = get_completion_client()
+    executor = get_llm_executor()
+
+    def store_reply(key: str, future: Future) -> None:
+        if future.cancelled():
+            return
+        try:
+            store.put(key, future.result())
+        except Exception as error:  # API errors and malformed replies alike
+            inc("llm_failures")
+            logging.warning(f"Assessment failed ({error!r}), local scores are used")
+
+    results: List[Optional[Dict[str, float]]] = []
+    futures: Dict[int, Future] = {}
+    for idx, (config, prompt) in enumerate(requests):
+        key = get_config_key(config, model)
+        results.append(store.get(key))
+        if results[idx] is None:
+            futures[idx] = executor.submit(request_scores, client, prompt, model)
+            futures[idx].add_done_callback(lambda future, key=key: store_reply(key, future))
+
+    deadline = time.monotonic() + (LLM_BUDGET if budget is None else budget)
+    pending = set(futures.values())
+    try:
+        # Waited in short slices, so a rerun of the session stops waiting and cancels the queued calls
+        while pending and time.monotonic() < deadline:
+            _, pending = wait(pending, timeout=min(WAIT_SLICE, max(deadline - time.monotonic(), 0)),
+                              return_when=FIRST_COMPLETED)
+            check_rerun()
+    finally:
+        for future in pending:
+            future.cancel()
+
+    for idx, future in futures.items():
+        if not future.done() or future.cancelled():
+            inc("llm_timeouts")
+            logging.warning("Assessment exceeded the latency budget, local scores are used")
+        elif future.exception() is None:
+            results[idx] = future.result()
+        else:
+            # Already logged and counted as llm_failures by store_reply
+            inc("llm_fallbacks")
+        if results[idx] is None:
+            results[idx] = score_config(requests[idx][0])
+
+    return results
+
+def assess_cached(config: Dict[str, Union[str, float]], prompt: str, model: str = MODEL_NAME,
+                  budget: Optional[float] = None) -> Dict[str, float]:
+    """
+    Assess a laptop configuration, asking the completion backend only for configurations not scored yet.
+
+    Args:
+        config (Dict[str, Union[str, float]]): Laptop configuration the prompt was built from.
+        prompt (str): Assessment prompt.
+        model (str): Model name.
+        budget (Optional[float]): Seconds to wait for the backend, LLM_BUDGET by default.
+
+    Returns:
+        scoring_info (Dict[str, float]): Category scores.
+    """
+    return assess_many([(config, prompt)], model, budget)[0]
+
+def read_catalogue_scores(path: str = CATALOGUE_SCORES_PATH, model: str = MODEL_NAME) -> Dict[str, Dict[str, float]]:
+    """
+    Read the pre-computed catalogue scores side table.
+
+    Args:
+        path (str): Path to laptop_scores.parquet.
+        model (str): Model whose scores are read, the table keeps the scores of every model.
+
+    Returns:
+        Dict[str, Dict[str, float]]: Category scores by laptop id.
+    """
+    scores = pd.read_parquet(path)
+    scores = scores[scores["model_name"] == model].set_index("laptop_id")
+    scores = scores[list(SCORE_COLUMNS.values())].dropna()
+    scores.columns = list(SCORE_COLUMNS.keys())
+    return scores.to_dict("index")
+
+@st.cache_resource(show_spinner=False)
+def get_shared_catalogue_scores(path: str, mtime: float, model: str) -> Dict[str, Dict[str, float]]:
+    return read_catalogue_scores(path, model)
+
+def lookup_catalogue_scores(laptop_id: str, path: str = CATALOGUE_SCORES_PATH,
+                            model: str = MODEL_NAME) -> Optional[Dict[str, float]]:
+    """
+    Get pre-computed scores of a catalogue laptop.
+
+    Args:
+        laptop_id (str): Laptop id from laptops_data.csv.
+        path (str): Path to laptop_scores.parquet.
+        model (str): Model whose scores are looked up.
+
+    Returns:
+        Optional[Dict[str, float]]: Category scores, None if the laptop was not pre-scored by the model.
+    """
+    if not os.path.exists(path):
+        return None
+    scores = get_shared_catalogue_scores(path, os.path.getmtime(path), model)
+    return scores.get(str(laptop_id))
@@ -0,0 +1,53 @@
+import os
+from typing import Dict, Optional
+import numpy as np
+import pandas as pd
+import streamlit as st
+from catalogue import CATALOGUE_PATH, load_catalogue
+
+# Seed of comparison picks, set for reproducible tests and benchmarks
+SEED = os.environ.get("LAPTOPIO_SEED")
+
+def build_segment_index(data: pd.DataFrame) -> Dict[str, np.ndarray]:
+    """
+    Row positions of every comparison segment (gaming laptops, macbooks and other laptops).
+
+    Args:
+        data (pd.DataFrame): Dataframe with laptop configurations.
+
+    Returns:
+        Dict[str, np.ndarray]: Row positions by segment name.
+    """
+    # Matched once per distinct GPU name and broadcast through the categorical codes
+    gpu = data["gpu"].astype("category")
+    rtx = gpu.cat.categories.str.contains("RTX")
+    is_gaming = np.append(rtx, False)[gpu.cat.codes.to_numpy()]
+    is_apple = (data["brand"] == "Apple").to_numpy()
+
+    return {
+        "gaming laptop": np.flatnonzero(is_gaming),
+        "macbook": np.flatnonzero(is_apple),
+        "laptop": np.flatnonzero(~is_gaming),
+    }
+
+@st.cache_resource(show_spinner=False)
+def get_segment_index(path: str, csv_mtime: float) -> Dict[str, np.ndarray]:
+    # Built once per process and rebuilt when a new scrape replaces the CSV
+    return build_segment_index(load_catalogue(path))
+
+def pick_segment_row(segment: str, seed: Optional[int] = None, path: str = CATALOGUE_PATH) -> int:
+    """
+    Draw a random catalogue row of a segment.
+
+    Args:
+        segment (str): "gaming laptop", "macbook" or "laptop".
+        seed (Optional[int]): Seed of the draw, LAPTOPIO_SEED when not given, random when neither is set.
+        path (str): Path to laptops_data.csv.
+
+    Returns:
+        int: Row position in the catalogue.
+    """
+    positions = get_segment_index(path, os.path.getmtime(path))[segment]
+    if seed is None and SEED is not None:
+        seed = int(SEED)
+    return int(positions[np.random.default_rng(seed).integers(len(positions))])
@@ -0,0 +1,143 @@
+import os
+import re
+from typing import Any, Dict, List, Optional
+import numpy as np
+import pandas as pd
+import streamlit as st
+from catalogue import CATALOGUE_PATH, load_catalogue
+from local_scoring import FEATURES, catalogue_features, config_features
+
+# Importance of every scoring feature in the distance, the bias column is left out
+FEATURE_WEIGHTS = {
+    "cpu_tier": 2.0,
+    "cpu_frequency": 0.5,
+    "gpu_tier": 2.0,
+    "ram": 1.0,
+    "storage": 1.0,
+    "pixels": 0.5,
+    "weight": 0.5,
+}
+
+# Squared distance added to laptops of another brand or CPU vendor than the configuration,
+# in the units of FEATURE_WEIGHTS (10% of the catalogue lies within about 3 of a query)
+MISMATCH_WEIGHTS = {
+    "brand": 3.0,
+    "cpu_vendor": 10.0,
+}
+
+# CPU vendor of a processor name, e.g. "Apple M2", "11th Gen Intel Core i3-1115G4" or "Ryzen 7 5800H",
+# vendor names are checked before family names ("M2 Pro 10-core" is an Apple chip, "Core m5" an Intel one)
+CPU_VENDORS = [
+    ("apple", re.compile(r"\bapple\b|^m[1-9]\b")),
+    ("intel", re.compile(r"\bintel\b")),
+    ("amd", re.compile(r"\bamd\b|ryzen|athlon|a-series|e-series")),
+    ("intel", re.compile(r"\bcore\b|celeron|pentium|xeon")),
+]
+
+# Suggested prices come in dollars, catalogue prices in tenge
+USD_TO_KZT = 450
+
+# Relative width of the price band around the suggested price
+PRICE_BAND = 0.3
+
+def parse_price(value: Any) -> Optional[float]:
+    # "$849" / "$1,299.99" -> price in tenge, None when there is no number
+    match = re.search(r"\d[\d,]*(?:\.\d+)?", str(value))
+    if not match:
+        return None
+    return float(match.group(0).replace(",", "")) * USD_TO_KZT
+
+def get_cpu_vendor(cpu: Any) -> Optional[str]:
+    # "Apple M2" -> "apple", None when the vendor cannot be told
+    cpu = str(cpu).lower()
+    for vendor, pattern in CPU_VENDORS:
+        if pattern.search(cpu):
+            return vendor
+    return None
+
+class SimilarityIndex:
+    """
+    Brute-force nearest-neighbour index over standardized catalogue features.
+
+    Distances to every laptop are computed with a single matrix-vector product
+    (||x||² - 2x·q + ||q||²), which takes well under a millisecond for the catalogue.
+    Laptops of another brand or CPU vendor than the configuration are pushed back by MISMATCH_WEIGHTS.
+
+    Args:
+        data (pd.DataFrame): Dataframe with laptop configurations.
+    """
+    def __init__(self, data: pd.DataFrame) -> None:
+        columns = [FEATURES.index(feature) for feature in FEATURE_WEIGHTS]
+        features = catalogue_features(data)[:, columns]
+
+        self.columns = columns
+        self.mean = features.mean(axis=0)
+        self.scale = features.std(axis=0) + 1e-9
+        self.weights = np.sqrt(np.array(list(FEATURE_WEIGHTS.values())))
+
+        self.matrix = np.ascontiguousarray(self.transform(features), dtype=np.float32)
+        self.norms = np.einsum("ij,ij->i", self.matrix, self.matrix)
+        self.prices = data["current_price"].to_numpy(dtype=float)
+        self.brands = data["brand"].astype(str).str.lower().to_numpy()
+        self.cpu_vendors = data["cpu_brand"].astype(str).str.lower().to_numpy()
+
+    def transform(self, features: np.ndarray) -> np.ndarray:
+        return (features - self.mean) / self.scale * self.weights
+
+    def query(self, config: Dict[str, Any], k: int = 5, price: Optional[float] = None,
+              band: float = PRICE_BAND) -> List[int]:
+        """
+        Find the k catalogue laptops most similar to a configuration.
+
+        Args:
+            config (Dict[str, Any]): Laptop configuration from either page.
+            k (int): Number of laptops.
+            price (Optional[float]): Price in tenge, the search is limited to laptops within the band around it
+                and laptops without a price. None or NaN applies no band.
+            band (float): Relative width of the price band.
+
+        Returns:
+            List[int]: Row positions in the catalogue, most similar first. Laptops outside the band are
+                used only when fewer than k are inside it.
+        """
+        vector = self.transform(config_features(config)[0, self.columns]).astype(np.float32)
+        distances = self.norms - 2 * (self.matrix @ vector) + vector @ vector
+
+        # "Name" of a suggestion starts with the brand, e.g. "Apple MacBook Air M2"
+        brand = str(config.get("brand", config.get("Name", ""))).lower().split(" ")[0]
+        if brand in self.brands:
+            distances = distances + MISMATCH_WEIGHTS["brand"] * (self.brands != brand)
+        cpu_vendor = get_cpu_vendor(config.get("cpu_brand", config.get("cpu_model", config.get("CPU", ""))))
+        if cpu_vendor is not None:
+            distances = distances + MISMATCH_WEIGHTS["cpu_vendor"] * (self.cpu_vendors != cpu_vendor)
+
+        if price is not None and price > 0:
+            # Laptops without a current price (out of stock) have no band and are never excluded by it
+            outside = np.abs(self.prices - price) > band * price
+            if np.count_nonzero(~outside) >= k:
+                distances = np.where(outside, np.inf, distances)
+
+        k = min(k, len(distances))
+        nearest = np.argpartition(distances, k - 1)[:k]
+        return nearest[np.argsort(distances[nearest])].tolist()
+
+@st.cache_resource(show_spinner=False)
+def get_similarity_index(path: str, csv_mtime: float) -> SimilarityIndex:
+    # Built once per process and rebuilt when a new scrape replaces the CSV
+    return SimilarityIndex(load_catalogue(path))
+
+def find_similar_laptops(config: Dict[str, Any], k: int = 5, path: str = CATALOGUE_PATH) -> pd.DataFrame:
+    """
+    Get the k catalogue laptops most similar to a suggested configuration within its price band.
+
+    Args:
+        config (Dict[str, Any]): Laptop configuration, "Price" is used for the price band when present.
+        k (int): Number of laptops.
+        path (str): Path to laptops_data.csv.
+
+    Returns:
+        pd.DataFrame: Catalogue rows, most similar first.
+    """
+    index = get_similarity_index(path, os.path.getmtime(path))
+    positions = index.query(config, k, parse_price(config.get("Price")))
+    return load_catalogue(path).iloc[positions]
@@ -0,0 +1,323 @@
+import io
+import os
+import time
+import asyncio
+import hashlib
+import logging
+import sqlite3
+import argparse
+import threading
+from typing import Dict, Optional
+from urllib.parse import urljoin, urlsplit
+import aiohttp
+import pandas as pd
+import streamlit as st
+from PIL import Image
+from retries import RetryState, classify_status, get_breaker, parse_retry_after
+
+THUMBNAIL_DIR = ".cache/thumbnails"
+
+# Bounding box of the stored thumbnails, the aspect ratio is kept
+THUMBNAIL_SIZE = (480, 360)
+
+THUMBNAIL_QUALITY = 80
+
+# Image shown on cards of laptops without a thumbnail
+PLACEHOLDER_PATH = "../assets/laptop.gif"
+
+# Seconds one image download may spend on attempts and backoff
+IMAGE_DEADLINE = 60
+
+def get_absolute_link(link: str) -> str:
+    # "//static.shop.kz/upload/..." -> "https://static.shop.kz/upload/..."
+    return f"https:{link}" if link.startswith("//") else link
+
+def make_thumbnail(raw: bytes) -> bytes:
+    """
+    Decode an image, shrink it into THUMBNAIL_SIZE and encode it as WebP.
+
+    Args:
+        raw (bytes): Downloaded image.
+
+    Returns:
+        bytes: WebP thumbnail.
+    """
+    with Image.open(io.BytesIO(raw)) as image:
+        # JPEG images are decoded directly at a reduced scale (no-op for other formats)
+        image.draft("RGB", THUMBNAIL_SIZE)
+        image.thumbnail(THUMBNAIL_SIZE)
+        image = image.convert("RGBA" if image.mode in ("RGBA", "LA", "P") else "RGB")
+        output = io.BytesIO()
+        image.save(output, format="WEBP", quality=THUMBNAIL_QUALITY, method=2)
+    return output.getvalue()
+
+class ThumbnailStore:
+    """
+    Content-addressed on-disk cache of laptop thumbnails.
+
+    Thumbnails are stored once per SHA-256 of their bytes (laptops sharing a photo share the file),
+    an SQLite index maps laptop ids to them. Least recently used thumbnails are evicted
+    once the files exceed the size limit.
+
+    Args:
+        directory (str): Directory of the thumbnail files and the index.
+        max_bytes (int): Maximum total size of the thumbnail files.
+    """
+    def __init__(self, directory: str = THUMBNAIL_DIR, max_bytes: int = 256 * 1024 * 1024) -> None:
+        os.makedirs(directory, exist_ok=True)
+
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(os.path.join(directory, "index.sqlite"), check_same_thread=False)
+        self.connection.executescript("""
+            CREATE TABLE IF NOT EXISTS thumbnails (
+                digest TEXT PRIMARY KEY,
+                size INTEGER NOT NULL,
+                accessed_at REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS links (
+                laptop_id TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                digest TEXT NOT NULL
+            );
+        """)
+        self.connection.commit()
+
+    def get_path(self, digest: str) -> str:
+        return os.path.join(self.directory, digest[:2], f"{digest}.webp")
+
+    def get_url(self, laptop_id: str) -> Optional[str]:
+        with self.lock:
+            row = self.connection.execute("SELECT url FROM links WHERE laptop_id = ?", (laptop_id,)).fetchone()
+        return row[0] if row else None
+
+    def get(self, laptop_id: str) -> Optional[bytes]:
+        """
+        Read the thumbnail of a laptop.
+
+        Args:
+            laptop_id (str): Laptop id from laptops_data.csv.
+
+        Returns:
+            Optional[bytes]: WebP thumbnail, None if it is not stored.
+        """
+        with self.lock:
+            row = self.connection.execute("SELECT digest FROM links WHERE laptop_id = ?", (laptop_id,)).fetchone()
+            if row is None:
+                return None
+            self.connection.execute("UPDATE thumbnails SET accessed_at = ? WHERE digest = ?", (time.time(), row[0]))
+            self.connection.commit()
+        try:
+            with open(self.get_path(row[0]), "rb") as file:
+                return file.read()
+        except FileNotFoundError:
+            return None
+
+    def put(self, laptop_id: str, url: str, thumbnail: bytes) -> None:
+        """
+        Store the thumbnail of a laptop under the hash of its bytes.
+
+        Args:
+            laptop_id (str): Laptop id from laptops_data.csv.
+            url (str): Link the image was downloaded from.
+            thumbnail (bytes): WebP thumbnail.
+
+        Returns:
+            None
+        """
+        digest = hashlib.sha256(thumbnail).hexdigest()
+        path = self.get_path(digest)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            temp_path = f"{path}.tmp"
+            with open(temp_path, "wb") as file:
+                file.write(thumbnail)
+            os.replace(temp_path, path)
+
+        with self.lock:
+            self.connection.execute("INSERT OR REPLACE INTO thumbnails VALUES (?, ?, ?)",
+                                    (digest, len(thumbnail), time.time()))
+            self.connection.execute("INSERT OR REPLACE INTO links VALUES (?, ?, ?)", (laptop_id, url, digest))
+            self.connection.commit()
+
+    def evict(self) -> int:
+        """
+        Evict least recently used thumbnails until the size limit is met.
+
+        Returns:
+            int: Number of evicted thumbnails.
+        """
+        with self.lock:
+            total = self.connection.execute("SELECT COALESCE(SUM(size), 0) FROM thumbnails").fetchone()[0]
+            evicted = 0
+            if total > self.max_bytes:
+                rows = self.connection.execute("SELECT digest, size FROM thumbnails ORDER BY accessed_at").fetchall()
+                for digest, size in rows:
+                    if total <= self.max_bytes:
+                        break
+                    self.connection.execute("DELETE FROM thumbnails WHERE digest = ?", (digest,))
+                    self.connection.execute("DELETE FROM links WHERE digest = ?", (digest,))
+                    if os.path.exists(self.get_path(digest)):
+                        os.remove(self.get_path(digest))
+                    total -= size
+                    evicted += 1
+            self.connection.commit()
+
+        if evicted:
+            logging.info(f"Thumbnail cache: {evicted} thumbnails evicted")
+        return evicted
+
+async def fetch_image(url: str, session: aiohttp.ClientSession, retries: int = 3,
+                      deadline: float = IMAGE_DEADLINE) -> Optional[bytes]:
+    """
+    Download an image with the scraper's retry policies (see retry.RETRY_POLICIES).
+
+    Throttling, server and network errors are retried with jittered exponential backoff, a
+    Retry-After header pauses every download of the host through its circuit breaker, and
+    statuses retrying cannot fix (e.g. 404) are not retried.
+
+    Args:
+        url (str): Image link.
+        session (aiohttp.ClientSession): Shared HTTP session.
+        retries (int): Maximum number of attempts.
+        deadline (float): Seconds the download may take including backoff.
+
+    Returns:
+        Optional[bytes]: Image bytes, None if every attempt failed or the link is gone.
+    """
+    breaker = get_breaker(urlsplit(url).netloc)
+    state = RetryState(deadline)
+    for attempt in range(retries):
+        if not await breaker.wait(state.deadline):
+            logging.warning(f"Host of image {url} is paused past the deadline")
+            return None
+
+        retry_after = None
+        try:
+            async with session.get(url) as response:
+                if response.ok:
+                    breaker.record_success()
+                    return await response.read()
+                kind = classify_status(response.status)
+                if kind is None:
+                    if response.status != 404:
+                        logging.warning(f"Image {url} failed with status {response.status}")
+                    return None
+                retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                if retry_after is not None:
+                    breaker.pause(retry_after)
+                logging.warning(f"Image {url} failed with status {response.status}... retrying")
+        except (aiohttp.ClientError, asyncio.TimeoutError) as error:
+            kind = "network"
+            logging.warning(f"Image {url} failed ({error!r})... retrying")
+
+        retry, delay = state.next_delay(kind, retry_after)
+        if not retry or attempt == retries - 1:
+            break
+        await asyncio.sleep(delay)
+    return None
+
+async def download_thumbnails(store: ThumbnailStore, links: Dict[str, str], concurrency: int = 8,
+                              base_url: Optional[str] = None, refresh: bool = False) -> int:
+    """
+    Download catalogue images concurrently and store their thumbnails.
+
+    Laptops whose thumbnail was already made from the same link are skipped unless refresh is set.
+    Decoding and encoding run in worker threads so downloads keep flowing.
+
+    Args:
+        store (ThumbnailStore): Thumbnail cache.
+        links (Dict[str, str]): Image link by laptop id (protocol-relative links are allowed).
+        concurrency (int): Maximum number of downloads in flight.
+        base_url (Optional[str]): Host serving the images instead of the original one, e.g. a local mirror.
+        refresh (bool): Download every image again.
+
+    Returns:
+        int: Number of stored thumbnails.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def process(laptop_id: str, link: str) -> bool:
+        url = get_absolute_link(link)
+        if not refresh and store.get_url(laptop_id) == url:
+            return False
+        source = urljoin(base_url, urlsplit(url).path) if base_url else url
+        async with semaphore:
+            raw = await fetch_image(source, session)
+        if raw is None:
+            return False
+        try:
+            thumbnail = await asyncio.to_thread(make_thumbnail, raw)
+        except OSError as error:
+            logging.warning(f"Image of laptop {laptop_id} could not be decoded: {error}")
+            return False
+        store.put(laptop_id, url, thumbnail)
+        return True
+
+    start_time = time.time()
+    timeout = aiohttp.ClientTimeout(total=30)
+    connector = aiohttp.TCPConnector(limit=concurrency)
+    async with aiohttp.ClientSession(timeout=timeout, connector=connector) as session:
+        results = await asyncio.gather(*(process(laptop_id, link) for laptop_id, link in links.items()))
+
+    store.evict()
+    stored = sum(results)
+    logging.info(f"Stored {stored} thumbnails of {len(links)} laptops in {round(time.time() - start_time, 2)} seconds")
+    return stored
+
+@st.cache_resource(show_spinner=False)
+def get_thumbnail_store() -> ThumbnailStore:
+    return ThumbnailStore()
+
+@st.cache_data(show_spinner=False, max_entries=1024)
+def read_thumbnail(laptop_id: str) -> bytes:
+    # Misses raise instead of returning None, st.cache_data does not cache exceptions,
+    # so a thumbnail downloaded while the app runs shows up on the next render
+    thumbnail = get_thumbnail_store().get(laptop_id)
+    if thumbnail is None:
+        raise KeyError(laptop_id)
+    return thumbnail
+
+def get_thumbnail(laptop_id: str) -> Optional[bytes]:
+    """
+    Read the thumbnail of a laptop, hits are read from disk once per process and served from memory.
+
+    Args:
+        laptop_id (str): Laptop id from laptops_data.csv.
+
+    Returns:
+        Optional[bytes]: WebP thumbnail, None if it is not stored yet.
+    """
+    try:
+        return read_thumbnail(str(laptop_id))
+    except KeyError:
+        return None
+
+@st.cache_resource(show_spinner=False)
+def get_placeholder(path: str = PLACEHOLDER_PATH) -> Optional[bytes]:
+    if not os.path.exists(path):
+        return None
+    with open(path, "rb") as file:
+        return file.read()
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Download catalogue images and store their thumbnails")
+    parser.add_argument("--images", default="../scraper/data/laptop_images.csv", help="Path to laptop_images.csv")
+    parser.add_argument("--directory", default=THUMBNAIL_DIR, help="Thumbnail cache directory")
+    parser.add_argument("--concurrency", type=int, default=8, help="Maximum number of downloads in flight")
+    parser.add_argument("--base-url", default=None, help="Host serving the images instead of the shop")
+    parser.add_argument("--max-mb", type=int, default=256, help="Size limit of the thumbnail cache")
+    parser.add_argument("--refresh", action="store_true", help="Download every image again")
+    return parser.parse_args()
+
+def main() -> None:
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    args = parse_args()
+    images = pd.read_csv(args.images, dtype=str).dropna()
+    links = dict(zip(images["laptop_id"], images["image_link"]))
+    store = ThumbnailStore(args.directory, args.max_mb * 1024 * 1024)
+    asyncio.run(download_thumbnails(store, links, args.concurrency, args.base_url, args.refresh))
+
+if __name__ == "__main__":
+    main()
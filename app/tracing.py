@@ -0,0 +1,335 @@
+import os
+import time
+import bisect
+import logging
+import functools
+import threading
+import inspect
+from collections import deque
+from contextlib import contextmanager, nullcontext
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, ContextManager, Deque, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+# Tracing is collected only when LAPTOPIO_METRICS is set, decorated functions are left untouched otherwise
+ENABLED = os.environ.get("LAPTOPIO_METRICS", "0") not in ("", "0")
+
+# Recent spans kept in memory for the diagnostics page
+RING_SIZE = int(os.environ.get("LAPTOPIO_METRICS_RING", 1000))
+
+# Prometheus text file rewritten on flush, e.g. for the node_exporter textfile collector
+PROMETHEUS_PATH = os.environ.get("LAPTOPIO_METRICS_FILE")
+
+# Port of the Prometheus /metrics endpoint, not served when unset
+PROMETHEUS_PORT = os.environ.get("LAPTOPIO_METRICS_PORT")
+
+# Upper bounds of the latency histogram buckets, seconds
+LATENCY_BUCKETS: List[float] = [0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30]
+
+METRIC_PREFIX = "laptopio"
+
+class Span(NamedTuple):
+    """
+    One timed call.
+
+    Attributes:
+        name: Name of the timed function or block.
+        started_at: Wall-clock start time.
+        duration: Seconds taken.
+        error: Name of the exception raised, None if the call succeeded.
+    """
+    name: str
+    started_at: float
+    duration: float
+    error: Optional[str]
+
+class MetricsSink:
+    """
+    Receiver of finished spans and registry snapshots.
+    """
+    def attach(self, registry: "Registry") -> None:
+        pass
+
+    def record(self, span: Span) -> None:
+        pass
+
+    def flush(self, registry: "Registry") -> None:
+        pass
+
+class RingBufferSink(MetricsSink):
+    """
+    Keeps the most recent spans in memory.
+
+    Args:
+        size (int): Number of spans kept.
+    """
+    def __init__(self, size: int = RING_SIZE) -> None:
+        self.lock = threading.Lock()
+        self.spans: Deque[Span] = deque(maxlen=size)
+
+    def record(self, span: Span) -> None:
+        with self.lock:
+            self.spans.append(span)
+
+    def snapshot(self) -> List[Span]:
+        with self.lock:
+            return list(self.spans)
+
+class PrometheusFileSink(MetricsSink):
+    """
+    Writes the registry in the Prometheus text format to a file, replaced atomically.
+
+    Args:
+        path (str): Path of the metrics file.
+        interval (float): Minimum seconds between two writes triggered by spans.
+    """
+    def __init__(self, path: str, interval: float = 15) -> None:
+        self.path = path
+        self.interval = interval
+        self.written_at = 0.0
+        self.registry: Optional["Registry"] = None
+
+    def attach(self, registry: "Registry") -> None:
+        # Spans trigger writes of the registry the sink was added to
+        self.registry = registry
+
+    def record(self, span: Span) -> None:
+        if self.registry is not None and time.monotonic() - self.written_at >= self.interval:
+            self.flush(self.registry)
+
+    def flush(self, registry: "Registry") -> None:
+        self.written_at = time.monotonic()
+        temp_path = f"{self.path}.tmp"
+        try:
+            with open(temp_path, "w") as file:
+                file.write(registry.render_prometheus())
+            os.replace(temp_path, self.path)
+        except OSError as error:
+            logging.warning(f"Metrics file {self.path} could not be written: {error}")
+
+class Timer:
+    """
+    Latency histogram of one span name.
+    """
+    def __init__(self) -> None:
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.errors = 0
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+
+    def observe(self, duration: float, error: bool) -> None:
+        self.count += 1
+        self.total += duration
+        self.max = max(self.max, duration)
+        self.errors += error
+        self.buckets[bisect.bisect_left(LATENCY_BUCKETS, duration)] += 1
+
+class Registry:
+    """
+    Process-wide counters and timers, forwarded to the configured sinks.
+
+    Collectors are callables returning counters kept elsewhere (e.g. score store hits),
+    they are read only when metrics are exported.
+    """
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.counters: Dict[str, float] = {}
+        self.timers: Dict[str, Timer] = {}
+        self.collectors: Dict[str, Callable[[], Dict[str, float]]] = {}
+        self.sinks: List[MetricsSink] = []
+
+    def add_sink(self, sink: MetricsSink) -> None:
+        sink.attach(self)
+        self.sinks.append(sink)
+
+    def add_collector(self, name: str, collector: Callable[[], Dict[str, float]]) -> None:
+        self.collectors[name] = collector
+
+    def inc(self, name: str, amount: float = 1) -> None:
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def observe(self, span: Span) -> None:
+        with self.lock:
+            timer = self.timers.get(span.name)
+            if timer is None:
+                timer = self.timers[span.name] = Timer()
+            timer.observe(span.duration, span.error is not None)
+        for sink in self.sinks:
+            sink.record(span)
+
+    def flush(self) -> None:
+        for sink in self.sinks:
+            sink.flush(self)
+
+    def collect(self) -> Dict[str, float]:
+        # Counters of every collector, prefixed by its name
+        values = {}
+        for name, collector in self.collectors.items():
+            try:
+                values.update({f"{name}_{key}": value for key, value in collector().items()})
+            except Exception as error:
+                logging.warning(f"Metrics collector {name} failed: {error!r}")
+        return values
+
+    def snapshot(self) -> Tuple[Dict[str, float], Dict[str, Dict[str, float]]]:
+        """
+        Read every counter and the summary of every timer.
+
+        Returns:
+            Tuple[Dict[str, float], Dict[str, Dict[str, float]]]: Counters (own and collected) and
+                count/total/mean/max/errors by timer name.
+        """
+        with self.lock:
+            counters = dict(self.counters)
+            timers = {name: {"count": timer.count, "total": timer.total, "mean": timer.total / timer.count,
+                             "max": timer.max, "errors": timer.errors}
+                      for name, timer in self.timers.items()}
+        counters.update(self.collect())
+        return counters, timers
+
+    def render_prometheus(self) -> str:
+        """
+        Render every metric in the Prometheus text exposition format.
+
+        Returns:
+            str: Metrics text.
+        """
+        with self.lock:
+            counters = dict(self.counters)
+            timers = [(name, timer.count, timer.total, timer.errors, list(timer.buckets))
+                      for name, timer in self.timers.items()]
+
+        lines = []
+        for name, value in sorted(counters.items()):
+            metric = f"{METRIC_PREFIX}_{name}_total"
+            lines += [f"# TYPE {metric} counter", f"{metric} {value:g}"]
+        # Collected values may go down (e.g. store size after eviction), so they are exported as gauges
+        for name, value in sorted(self.collect().items()):
+            metric = f"{METRIC_PREFIX}_{name}"
+            lines += [f"# TYPE {metric} gauge", f"{metric} {value:g}"]
+
+        if timers:
+            metric = f"{METRIC_PREFIX}_span_duration_seconds"
+            lines.append(f"# TYPE {metric} histogram")
+            for name, count, total, errors, buckets in sorted(timers):
+                cumulative = 0
+                for bound, bucket in zip(LATENCY_BUCKETS + ["+Inf"], buckets):
+                    cumulative += bucket
+                    lines.append(f'{metric}_bucket{{span="{name}",le="{bound}"}} {cumulative}')
+                lines.append(f'{metric}_sum{{span="{name}"}} {total:.6f}')
+                lines.append(f'{metric}_count{{span="{name}"}} {count}')
+            errors_metric = f"{METRIC_PREFIX}_span_errors_total"
+            lines.append(f"# TYPE {errors_metric} counter")
+            lines += [f'{errors_metric}{{span="{name}"}} {errors}' for name, _, _, errors, _ in sorted(timers)]
+
+        return "\n".join(lines) + "\n"
+
+REGISTRY = Registry()
+RING_BUFFER = RingBufferSink()
+if ENABLED:
+    REGISTRY.add_sink(RING_BUFFER)
+    if PROMETHEUS_PATH:
+        REGISTRY.add_sink(PrometheusFileSink(PROMETHEUS_PATH))
+
+def inc(name: str, amount: float = 1) -> None:
+    if ENABLED:
+        REGISTRY.inc(name, amount)
+
+def record(name: str, started_at: float, start: float, error: Optional[BaseException]) -> None:
+    REGISTRY.observe(Span(name, started_at, time.perf_counter() - start, type(error).__name__ if error else None))
+
+@contextmanager
+def timed_block(name: str) -> Iterator[None]:
+    started_at, start = time.time(), time.perf_counter()
+    try:
+        yield
+    except BaseException as error:
+        record(name, started_at, start, error)
+        raise
+    record(name, started_at, start, None)
+
+def span(name: str) -> ContextManager[None]:
+    """
+    Time a block of code, e.g. `with span("render_chart"): st.plotly_chart(fig)`.
+
+    Args:
+        name (str): Span name.
+
+    Returns:
+        ContextManager[None]: Timing context manager, a no-op one when tracing is off.
+    """
+    return timed_block(name) if ENABLED else nullcontext()
+
+def timed(name: Optional[str] = None) -> Callable[[Callable], Callable]:
+    """
+    Decorator timing every call of a function or coroutine function.
+
+    The function is returned unchanged when tracing is off, so disabled tracing costs nothing.
+
+    Args:
+        name (Optional[str]): Span name, the function name by default.
+
+    Returns:
+        Callable[[Callable], Callable]: The decorator.
+    """
+    def decorator(func: Callable) -> Callable:
+        if not ENABLED:
+            return func
+        label = name or func.__name__
+
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with timed_block(label):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with timed_block(label):
+                return func(*args, **kwargs)
+        return wrapper
+
+    return decorator
+
+def get_recent_spans() -> List[Span]:
+    return RING_BUFFER.snapshot()
+
+def serve_prometheus(port: int, host: str = "0.0.0.0") -> ThreadingHTTPServer:
+    """
+    Serve the registry on /metrics from a daemon thread.
+
+    Args:
+        port (int): Port to listen on.
+        host (str): Interface to listen on.
+
+    Returns:
+        ThreadingHTTPServer: The running server.
+    """
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:
+            if self.path.split("?")[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = REGISTRY.render_prometheus().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format: str, *args) -> None:
+            pass  # Scrapes every few seconds would flood the log
+
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    threading.Thread(target=server.serve_forever, name="metrics", daemon=True).start()
+    logging.info(f"Prometheus metrics served on http://{host}:{port}/metrics")
+    return server
+
+if ENABLED and PROMETHEUS_PORT:
+    # Modules are imported once per process, so the endpoint is started once
+    try:
+        serve_prometheus(int(PROMETHEUS_PORT))
+    except OSError as error:
+        logging.warning(f"Prometheus endpoint could not be started: {error}")
@@ -0,0 +1,85 @@
+# Importing Necessary Libraries
+import argparse
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+from typing import Dict
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "app"))
+
+import pandas as pd
+from bench_query import synthesize_catalogue
+from catalogue import get_sidecar_path, read_catalogue, read_catalogue_csv
+
+def get_memory() -> Dict[str, int]:
+    # Proportional set size counts pages shared by several processes once across them
+    memory = {}
+    with open("/proc/self/smaps_rollup") as file:
+        for line in file:
+            key, _, value = line.partition(":")
+            if key in ("Rss", "Pss", "Shared_Clean", "Private_Clean", "Private_Dirty"):
+                memory[key] = int(value.split()[0]) * 1024
+    return memory
+
+def serve(path: str, memory_map: bool, barrier: multiprocessing.Barrier, results: multiprocessing.Queue) -> None:
+    before = get_memory()
+    start = time.perf_counter()
+    data = read_catalogue(path, memory_map)
+    # Every column is touched, as a session filtering and sorting the catalogue would
+    for column in data.columns:
+        values = data[column]
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            values.cat.codes.sum()
+        elif pd.api.types.is_numeric_dtype(values):
+            values.sum()
+        else:
+            values.str.len().sum()
+    elapsed = time.perf_counter() - start
+    # Memory is read once every worker holds the catalogue, so shared pages are split between them
+    barrier.wait()
+    after = get_memory()
+    results.put((elapsed, {key: after[key] - before.get(key, 0) for key in after}))
+    barrier.wait()
+
+def measure(path: str, workers: int, memory_map: bool) -> None:
+    context = multiprocessing.get_context("spawn")
+    barrier = context.Barrier(workers)
+    results = context.Queue()
+    processes = [context.Process(target=serve, args=(path, memory_map, barrier, results)) for _ in range(workers)]
+    for process in processes:
+        process.start()
+    measurements = [results.get() for _ in processes]
+    for process in processes:
+        process.join()
+
+    mib = 1024 * 1024
+    private = sum(memory["Private_Clean"] + memory["Private_Dirty"] for _, memory in measurements) / mib
+    pss = sum(memory["Pss"] for _, memory in measurements) / mib
+    load = max(elapsed for elapsed, _ in measurements)
+    print(f"{'mapped' if memory_map else 'in-memory'}: {workers} workers hold {pss:.1f} MiB of catalogue "
+          f"({private:.1f} MiB private), loaded in {load * 1000:.0f} ms")
+
+def run(args: argparse.Namespace) -> None:
+    data = read_catalogue_csv(os.path.join(ROOT, "app", "data", "laptops_data.csv"))
+    with tempfile.TemporaryDirectory() as workdir:
+        path = os.path.join(workdir, "laptops_data.csv")
+        synthesize_catalogue(data, args.rows, args.seed).to_csv(path, index=False)
+        # The sidecar is built once up front, workers only read it
+        read_catalogue(path, memory_map=False)
+        print(f"{args.rows} rows, sidecar of {os.path.getsize(get_sidecar_path(path)) / 1024 / 1024:.1f} MiB")
+
+        for memory_map in (False, True):
+            measure(path, args.workers, memory_map)
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark memory of the catalogue held by several app processes")
+    parser.add_argument("--rows", type=int, default=500_000, help="Number of rows of the synthetic catalogue")
+    parser.add_argument("--workers", type=int, default=4, help="Number of processes serving the app")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    return parser.parse_args()
+
+if __name__ == "__main__":
+    run(parse_args())
@@ -0,0 +1,51 @@
+# Importing Necessary Libraries
+import argparse
+import os
+import sys
+import time
+import pandas as pd
+from typing import List
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "scraper"))
+
+from cleaning import run_pipeline
+
+def scale_catalogue(raw: pd.DataFrame, factor: int) -> pd.DataFrame:
+    """
+    Build a synthetic catalogue `factor` times larger than the scraped one with unique laptop ids.
+
+    Args:
+        raw (pd.DataFrame): Dataset saved by the scraper.
+        factor (int): Scale factor.
+
+    Returns:
+        pd.DataFrame: Scaled dataset.
+    """
+    copies = []
+    for copy in range(factor):
+        chunk = raw.copy()
+        if copy:
+            chunk["laptop id"] = chunk["laptop id"].astype(str) + f"-{copy}"
+        copies.append(chunk)
+    return pd.concat(copies, ignore_index=True)
+
+def run(scales: List[int], repeat: int) -> None:
+    raw = pd.read_csv(os.path.join(ROOT, "scraper", "data", "laptops.csv"))
+    print(f"{'scale':>6} {'rows':>9} {'best, s':>9} {'rows/s':>11}")
+    for factor in scales:
+        catalogue = scale_catalogue(raw, factor)
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            run_pipeline(catalogue)
+            timings.append(time.perf_counter() - start)
+        best = min(timings)
+        print(f"{factor:>5}x {len(catalogue):>9} {best:>9.3f} {len(catalogue) / best:>11.0f}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the cleaning pipeline on scaled catalogues")
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    run(args.scales, args.repeat)
@@ -0,0 +1,155 @@
+# Importing Necessary Libraries
+import argparse
+import asyncio
+import html
+import os
+import sys
+import time
+from collections import Counter
+from typing import Dict, List
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "scraper"))
+
+from aiohttp import web
+from bs4 import BeautifulSoup
+from crawler import Crawler, Site
+from parsers import CardPageParser, parse_page, register_parser
+from scraper import set_parser
+
+FIXTURE_PATH = os.path.join(ROOT, "benchmarks", "fixtures", "listing_page.html")
+
+def parse_competitor_card(item: BeautifulSoup) -> Dict[str, str]:
+    # Card parser of the stand-in competitor, same contract as parsers.parse_item_card
+    laptop_info = {"laptop id": item["data-sku"], "title": item.select_one(".name").get_text(strip=True),
+                   "current price": item.select_one(".price").get_text(strip=True)}
+    for key, value in zip(item.select("dt"), item.select("dd")):
+        laptop_info[key.get_text(strip=True)] = value.get_text(strip=True)
+    return laptop_info
+
+register_parser("competitor", CardPageParser(parse_competitor_card, "li.product", "a.next", "nav.pages a"))
+
+class StandInShop:
+    """
+    Local stand-in of a shop serving listing pages of several categories.
+
+    Args:
+        products (List[Dict[str, str]]): Products shown on every page.
+        categories (List[str]): Category slugs served under /offers/<slug>/.
+        pages (int): Pages of every category.
+        latency (float): Seconds taken by every answer.
+        markup (str): "shop" (shop.kz markup) or "competitor".
+    """
+    def __init__(self, products: List[Dict[str, str]], categories: List[str], pages: int, latency: float,
+                 markup: str = "shop") -> None:
+        self.products = products
+        self.categories = categories
+        self.pages = pages
+        self.latency = latency
+        self.markup = markup
+        self.requests: Counter = Counter()
+        self.url = None
+
+    def render(self, category: str, page: int) -> str:
+        path = f"/offers/{category}/"
+        links = [(f"{path}?PAGEN_1={number}", str(number)) for number in range(1, self.pages + 1)]
+        if self.markup == "competitor":
+            cards = "".join(
+                f'<li class="product" data-sku="{html.escape(product["laptop id"])}">'
+                f'<h3 class="name">{html.escape(product["title"])}</h3>'
+                f'<span class="price">{html.escape(product["current price"])}</span><dl>'
+                + "".join(f"<dt>{html.escape(key)}</dt><dd>{html.escape(value)}</dd>" for key, value in product.items()
+                          if key not in ("laptop id", "title", "current price"))
+                + "</dl></li>" for product in self.products)
+            paginator = "".join(f'<a href="{href}">{text}</a>' for href, text in links)
+            if page < self.pages:
+                paginator += f'<a class="next" href="{path}?PAGEN_1={page + 1}">Next</a>'
+            return f"<html><head><title>{category}</title></head><body><ul>{cards}</ul>" \
+                   f"<nav class=\"pages\">{paginator}</nav></body></html>"
+
+        cards = "".join(
+            f'<div data-id="{html.escape(product["laptop id"])}">'
+            f'<div class="bx_catalog_item_scu_code" text="{html.escape(product["laptop id"])}"></div>'
+            f'<div class="bx_catalog_item_title"><a title="Ноутбук {html.escape(product["title"])} x"></a></div>'
+            f'<div class="bx_catalog_item_price"><span class="old_price">{html.escape(product["old price"])}</span>'
+            f'<span class="current_price">{html.escape(product["current price"])}</span></div></div>'
+            for product in self.products)
+        paginator = "".join(f'<li><a href="{href}">{text}</a></li>' for href, text in links)
+        if page < self.pages:
+            paginator += f'<li class="bx-pag-next"><a href="{path}?PAGEN_1={page + 1}">Вперед</a></li>'
+        return f"<html><head><title>{category}</title></head><body>{cards}" \
+               f"<div class=\"bx-pagination\"><ul>{paginator}</ul></div></body></html>"
+
+    async def handle(self, request: web.Request) -> web.Response:
+        category, page = request.match_info["category"], int(request.query.get("PAGEN_1", 1))
+        self.requests[request.path_qs] += 1
+        await asyncio.sleep(self.latency)
+        if category not in self.categories or page > self.pages:
+            return web.Response(status=404)
+        return web.Response(text=self.render(category, page), content_type="text/html")
+
+    async def start(self) -> web.AppRunner:
+        app = web.Application()
+        app.router.add_get("/offers/{category}/", self.handle)
+        runner = web.AppRunner(app, access_log=None)
+        await runner.setup()
+        await web.TCPSite(runner, "127.0.0.1", 0).start()
+        self.url = f"http://127.0.0.1:{runner.addresses[0][1]}"
+        return runner
+
+async def crawl(seeds: List[str], max_pages: int, sites: Dict[str, Site]) -> tuple:
+    start = time.perf_counter()
+    products = await Crawler(seeds, max_pages, sites=sites).run()
+    return time.perf_counter() - start, len(products)
+
+async def run(args: argparse.Namespace) -> None:
+    with open(FIXTURE_PATH, encoding="utf-8") as file:
+        products = [product for product in parse_page(file.read())[0] if "old price" in product]
+
+    categories = [f"category-{index}" for index in range(args.categories)]
+    shops = [StandInShop(products, categories, args.pages, args.latency,
+                         "competitor" if index == args.hosts - 1 and args.hosts > 1 else "shop")
+             for index in range(args.hosts)]
+    runners = [await shop.start() for shop in shops]
+    # Pages of all hosts are parsed off the event loop, otherwise parsing caps the speedup
+    set_parser("bs4", args.parse_workers)
+    sites = {shop.url.split("://")[1]: Site("competitor" if shop.markup == "competitor" else "bs4",
+                                            args.rate, args.concurrency) for shop in shops}
+
+    # Seeds overlap on purpose: page 1 given explicitly is the seed itself and is crawled once
+    seeds = {shop.url: [f"{shop.url}/offers/{category}/" for category in categories]
+             + [f"{shop.url}/offers/{categories[0]}/?PAGEN_1=1#top"] for shop in shops}
+    expected = args.categories * args.pages * len(products)
+
+    serial_elapsed = 0.0
+    for shop in shops:
+        elapsed, count = await crawl(seeds[shop.url], args.pages, sites)
+        serial_elapsed += elapsed
+        print(f"{shop.url} ({shop.markup}) alone: {count}/{expected} products in {elapsed:.2f} s")
+        shop.requests.clear()
+
+    elapsed, count = await crawl([seed for shop in shops for seed in seeds[shop.url]], args.pages, sites)
+    print(f"All {len(shops)} hosts in one job: {count}/{expected * len(shops)} products in {elapsed:.2f} s, "
+          f"speedup {serial_elapsed / elapsed:.2f}x over crawling them one after another")
+    requests = [sum(shop.requests.values()) for shop in shops]
+    duplicates = sum(count - 1 for shop in shops for count in shop.requests.values())
+    print(f"Requests by host: {requests}, duplicate requests: {duplicates}")
+
+    for runner in runners:
+        await runner.cleanup()
+    set_parser("bs4")
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark the multi-host crawl scheduler on local stand-in shops")
+    parser.add_argument("--hosts", type=int, default=3, help="Number of stand-in shops, the last one has other markup")
+    parser.add_argument("--categories", type=int, default=2, help="Categories per shop")
+    parser.add_argument("--pages", type=int, default=10, help="Pages per category")
+    parser.add_argument("--latency", type=float, default=0.2, help="Seconds taken by every answer")
+    parser.add_argument("--rate", type=float, default=4, help="Requests per second allowed to each host")
+    parser.add_argument("--concurrency", type=int, default=4, help="Pages fetched at once from each host")
+    parser.add_argument("--parse-workers", type=int, default=0,
+                        help="Number of processes parsing pages, 0 parses on the event loop")
+    return parser.parse_args()
+
+if __name__ == "__main__":
+    asyncio.run(run(parse_args()))
@@ -0,0 +1,73 @@
+# Importing Necessary Libraries
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "scraper"))
+
+import pandas as pd
+from bench_suite import render_listing_page
+from pipeline import Pipeline, open_archive
+from sinks import get_sink
+
+ARCHIVE_URL = "https://shop.kz/offers/noutbuki/"
+
+def build_archive(path: str, pages: int, page_size: int = 48) -> None:
+    # Archived pages cycle through the scraped laptops, ids are made unique per page
+    raw = pd.read_csv(os.path.join(ROOT, "scraper", "data", "laptops.csv"), dtype=str)
+    cache = open_archive(path)
+    for page in range(1, pages + 1):
+        rows = raw.iloc[[((page - 1) * page_size + index) % len(raw) for index in range(page_size)]]
+        rows = rows.assign(**{"laptop id": f"{page}-" + rows["laptop id"]})
+        url = ARCHIVE_URL if page == 1 else f"{ARCHIVE_URL}?PAGEN_1={page}"
+        cache.store(url, render_listing_page(rows, page, pages))
+    cache.close()
+
+async def reparse(archive: str, workdir: str, workers: int, backend: str) -> tuple:
+    outputs = {key: os.path.join(workdir, f"{key}_{workers}.csv") for key in ("laptops", "cleansed", "app", "images")}
+    sink = get_sink("csv", outputs["laptops"])
+    cache = open_archive(archive)
+    start = time.perf_counter()
+    datasets = {key: path for key, path in outputs.items() if key != "laptops"}
+    stats = await Pipeline(sink, datasets, workers, backend).reparse(cache)
+    elapsed = time.perf_counter() - start
+    cache.close()
+    return elapsed, stats, outputs
+
+def run(args: argparse.Namespace) -> None:
+    with tempfile.TemporaryDirectory() as workdir:
+        archive = os.path.join(workdir, "archive.sqlite")
+        build_archive(archive, args.pages)
+
+        results = {}
+        for workers in args.workers:
+            elapsed, stats, outputs = asyncio.run(reparse(archive, workdir, workers, args.parser))
+            results[workers] = outputs
+            print(f"{workers} parse workers: {args.pages} pages in {elapsed:.2f} s ({args.pages / elapsed:.1f} pages/s)")
+            for name, stage in stats.items():
+                print(f"    {name}: {stage['workers']} workers, busy {stage['busy_seconds']:.2f} s, "
+                      f"max queue depth {stage['max_queue_depth']}")
+
+        reference = results[args.workers[0]]
+        for workers, outputs in results.items():
+            # Small archives may miss the laptops cleaning imputes from, only the scraped dataset is written then
+            same = all(os.path.exists(outputs[key]) == os.path.exists(reference[key]) for key in outputs) and \
+                all(pd.read_csv(outputs[key]).equals(pd.read_csv(reference[key]))
+                    for key in outputs if os.path.exists(outputs[key]))
+            print(f"{workers} parse workers: output {'matches' if same else 'DIFFERS from'} "
+                  f"{args.workers[0]} parse workers")
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark re-parsing archived pages through the staged pipeline")
+    parser.add_argument("--pages", type=int, default=100, help="Number of archived pages")
+    parser.add_argument("--workers", type=int, nargs="+", default=[0, os.cpu_count() or 1],
+                        help="Parse stage process counts to compare")
+    parser.add_argument("--parser", default="bs4", help="Parser backend of listing pages")
+    return parser.parse_args()
+
+if __name__ == "__main__":
+    run(parse_args())
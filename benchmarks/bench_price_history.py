@@ -0,0 +1,100 @@
+# Importing Necessary Libraries
+import argparse
+import os
+import sys
+import tempfile
+import time
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "scraper"))
+
+from price_history import PriceHistory
+
+# Share of listed laptops repriced every day
+REPRICE_RATE = 0.03
+
+# Share of listed laptops delisted, and of the catalogue size added as new laptops, every day
+CHURN_RATE = 0.005
+
+def format_price(price: float) -> str:
+    # Same format as the scraped prices, e.g. "849 990 ₸"
+    return f"{int(price):,} ₸".replace(",", " ")
+
+def simulate_runs(raw: pd.DataFrame, days: int, seed: int = 0):
+    """
+    Yield one catalogue per day, repricing, delisting and adding a few laptops every day.
+
+    Args:
+        raw (pd.DataFrame): Scraped catalogue (laptops.csv).
+        days (int): Number of runs.
+        seed (int): Random seed.
+
+    Yields:
+        pd.DataFrame: Catalogue of the day.
+    """
+    rng = np.random.default_rng(seed)
+    catalogue = raw.drop_duplicates("laptop id").reset_index(drop=True)
+    prices = catalogue["current price"].str.replace(r"\D", "", regex=True).astype(float)
+    next_id = 0
+    for _ in range(days):
+        repriced = (rng.random(len(catalogue)) < REPRICE_RATE) & prices.notna().to_numpy()
+        prices[repriced] = (prices[repriced] * rng.uniform(0.85, 1.1, repriced.sum())).round(-1)
+        catalogue.loc[repriced, "current price"] = prices[repriced].map(format_price)
+
+        kept = rng.random(len(catalogue)) >= CHURN_RATE
+        new = raw.sample(max(int(len(raw) * CHURN_RATE), 1), random_state=int(rng.integers(2 ** 31)))
+        new = new.assign(**{"laptop id": [f"new-{next_id + i}" for i in range(len(new))]})
+        next_id += len(new)
+        catalogue = pd.concat([catalogue[kept], new], ignore_index=True)
+        prices = pd.concat([prices[kept], new["current price"].str.replace(r"\D", "", regex=True).astype(float)],
+                           ignore_index=True)
+        yield catalogue
+
+def run(days: int, seed: int) -> None:
+    raw = pd.read_csv(os.path.join(ROOT, "scraper", "data", "laptops.csv"), dtype=str)
+    with tempfile.TemporaryDirectory() as workdir:
+        path = os.path.join(workdir, "price_history.sqlite")
+        history = PriceHistory(path)
+
+        start = time.perf_counter()
+        for day, catalogue in enumerate(simulate_runs(raw, days, seed)):
+            history.record_run(catalogue, started_at=day * 86400.0)
+        recorded = time.perf_counter() - start
+
+        history.connection.execute("VACUUM")
+        size = os.path.getsize(path)
+        snapshot_size = len(raw.to_csv(index=False).encode("utf-8"))
+        counts = history.get_size()
+        print(f"{days} runs of about {len(raw)} laptops recorded in {recorded:.2f} s "
+              f"({recorded / days * 1000:.1f} ms per run)")
+        print(f"Changes: {counts['changes']} rows, database {size / 2 ** 20:.2f} MiB, "
+              f"full CSV snapshots would take {snapshot_size * days / 2 ** 20:.2f} MiB")
+
+        laptop_ids = history.get_latest()["laptop_id"].unique()
+        rng = np.random.default_rng(seed)
+        timings = []
+        for laptop_id in rng.choice(laptop_ids, 200):
+            start = time.perf_counter()
+            history.get_series(laptop_id)
+            timings.append(time.perf_counter() - start)
+        print(f"Price series: median {np.median(timings) * 1000:.2f} ms, max {np.max(timings) * 1000:.2f} ms")
+
+        for name, query in [("Price changes of the last run", history.get_price_changes),
+                            ("Listing changes of the last run", history.get_listing_changes),
+                            ("Snapshot of the last run", history.get_snapshot)]:
+            start = time.perf_counter()
+            query()
+            print(f"{name}: {(time.perf_counter() - start) * 1000:.1f} ms")
+        history.close()
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark the price history store on simulated daily runs")
+    parser.add_argument("--days", type=int, default=365, help="Number of simulated runs")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    return parser.parse_args()
+
+if __name__ == "__main__":
+    args = parse_args()
+    run(args.days, args.seed)
@@ -0,0 +1,78 @@
+# Importing Necessary Libraries
+import argparse
+import os
+import sys
+import time
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "app"))
+
+from catalogue import read_catalogue_csv
+from query import Query, QueryEngine
+
+def synthesize_catalogue(data: pd.DataFrame, rows: int, seed: int = 0) -> pd.DataFrame:
+    """
+    Build a synthetic catalogue by resampling laptops with unique ids and jittered prices.
+
+    Args:
+        data (pd.DataFrame): Dataset used by the app (laptops_data.csv).
+        rows (int): Number of rows.
+        seed (int): Random seed.
+
+    Returns:
+        pd.DataFrame: Synthetic catalogue with the same dtypes.
+    """
+    rng = np.random.default_rng(seed)
+    sample = data.iloc[rng.integers(len(data), size=rows)].reset_index(drop=True)
+    sample["laptop_id"] = sample["laptop_id"].astype(str) + "-" + pd.Series(np.arange(rows)).astype(str)
+    jitter = rng.uniform(0.8, 1.2, size=rows)
+    sample["current_price"] = (sample["current_price"] * jitter).round(-1)
+    sample["old_price"] = (sample["old_price"] * jitter).round(-1)
+    return sample
+
+def random_query(data: pd.DataFrame, rng: np.random.Generator) -> Query:
+    # Mix of facet, substring and range predicates with a random sort and page
+    brands = list(rng.choice(data["brand"].cat.categories, size=rng.integers(1, 4), replace=False))
+    return Query(
+        values={"brand": brands if rng.random() < 0.5 else [],
+                "cpu_brand": [rng.choice(["Intel", "AMD"])] if rng.random() < 0.3 else []},
+        contains={"gpu": rng.choice(["RTX", "GTX", "Radeon", ""])},
+        ranges={"ram": (float(rng.choice([8, 16, 32])), None),
+                "current_price": (None, float(rng.integers(300_000, 1_500_000)))},
+        sort_by=rng.choice(["discount_rate_percent", "current_price", "ram", "weight"]),
+        ascending=bool(rng.random() < 0.5),
+        page=int(rng.integers(0, 5)),
+    )
+
+def run(rows: int, queries: int, seed: int) -> None:
+    data = read_catalogue_csv(os.path.join(ROOT, "app", "data", "laptops_data.csv"))
+    catalogue = synthesize_catalogue(data, rows, seed)
+
+    start = time.perf_counter()
+    engine = QueryEngine(catalogue)
+    print(f"Index of {rows} rows built in {time.perf_counter() - start:.3f} s")
+
+    rng = np.random.default_rng(seed)
+    timings = []
+    matches = []
+    for _ in range(queries):
+        query = random_query(data, rng)
+        start = time.perf_counter()
+        result = engine.execute(query)
+        timings.append(time.perf_counter() - start)
+        matches.append(result.total)
+
+    timings = np.array(timings) * 1000
+    print(f"{queries} queries, median {np.median(matches):.0f} matches")
+    print(f"p50 {np.percentile(timings, 50):.2f} ms, p95 {np.percentile(timings, 95):.2f} ms, "
+          f"p99 {np.percentile(timings, 99):.2f} ms, max {timings.max():.2f} ms")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark catalogue queries on a synthetic catalogue")
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--queries", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    run(args.rows, args.queries, args.seed)
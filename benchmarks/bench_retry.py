@@ -0,0 +1,140 @@
+# Importing Necessary Libraries
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+from collections import Counter
+from typing import Dict
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "scraper"))
+
+from aiohttp import ClientSession, ClientTimeout, web
+from retry import BREAKERS, RETRY_POLICIES, CircuitBreaker, RetryPolicy
+from scraper import CUSTOM_HEADERS, request_with_retries
+
+FIXTURE_PATH = os.path.join(ROOT, "benchmarks", "fixtures", "listing_page.html")
+
+CAPTCHA_PAGE = "<html><head><title>Robot Check</title></head><body>Enter the characters you see below</body></html>"
+
+class FaultInjector:
+    """
+    Listing page server failing a share of the requests the way the shop does.
+
+    Outside the blocking phase every fault kind has its own rate. During the blocking phase
+    (a time window after the first request) most requests get a CAPTCHA page.
+
+    Args:
+        body (str): Listing page HTML.
+        rates (Dict[str, float]): Probability of "captcha", "throttled", "server", "reset" and "slow".
+        blocking (tuple): (start, end) seconds of the blocking phase.
+        blocking_rate (float): CAPTCHA probability during the blocking phase.
+        retry_after (int): Retry-After seconds sent with 429 answers.
+        slow_delay (float): Seconds a slow answer takes.
+    """
+    def __init__(self, body: str, rates: Dict[str, float], blocking: tuple, blocking_rate: float,
+                 retry_after: int, slow_delay: float) -> None:
+        self.body = body
+        self.rates = rates
+        self.blocking = blocking
+        self.blocking_rate = blocking_rate
+        self.retry_after = retry_after
+        self.slow_delay = slow_delay
+        self.started_at = None
+        self.answers = Counter()
+        self.blocked_requests = 0
+
+    def pick_fault(self, elapsed: float) -> str:
+        if self.blocking[0] <= elapsed < self.blocking[1]:
+            self.blocked_requests += 1
+            return "captcha" if random.random() < self.blocking_rate else "ok"
+        roll = random.random()
+        for fault, rate in self.rates.items():
+            if roll < rate:
+                return fault
+            roll -= rate
+        return "ok"
+
+    async def handle(self, request: web.Request) -> web.StreamResponse:
+        if self.started_at is None:
+            self.started_at = time.monotonic()
+        fault = self.pick_fault(time.monotonic() - self.started_at)
+        self.answers[fault] += 1
+
+        if fault == "captcha":
+            return web.Response(text=CAPTCHA_PAGE, content_type="text/html")
+        if fault == "throttled":
+            return web.Response(status=429, headers={"Retry-After": str(self.retry_after)})
+        if fault == "server":
+            return web.Response(status=random.choice([500, 502, 503]))
+        if fault == "reset":
+            request.transport.close()
+            return web.Response(status=500)
+        if fault == "slow":
+            await asyncio.sleep(self.slow_delay)
+        return web.Response(text=self.body, content_type="text/html")
+
+async def crawl(args: argparse.Namespace) -> None:
+    with open(FIXTURE_PATH, encoding="utf-8") as file:
+        body = file.read()
+
+    scale = args.time_scale
+    rates = {"captcha": args.captcha, "throttled": args.throttled, "server": args.server,
+             "reset": args.reset, "slow": args.slow}
+    injector = FaultInjector(body, rates, (args.block_start * scale, args.block_end * scale), args.block_rate,
+                             max(int(round(30 * scale)), 1), 120 * scale)
+    app = web.Application()
+    app.router.add_get("/offers/noutbuki/", injector.handle)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = runner.addresses[0][1]
+    host = f"127.0.0.1:{port}"
+
+    # Production delays scaled down so a run takes seconds, the breaker is disabled with --no-breaker
+    policies = {kind: RetryPolicy(policy.base_delay * scale, policy.max_delay * scale, policy.max_attempts)
+                for kind, policy in RETRY_POLICIES.items()}
+    BREAKERS[host] = CircuitBreaker(threshold=2 if args.no_breaker else 0.5, cooldown=30 * scale,
+                                    max_cooldown=600 * scale)
+
+    semaphore = asyncio.Semaphore(args.concurrency)
+    timeout = ClientTimeout(total=60 * scale, sock_read=30 * scale)
+
+    async def fetch(session: ClientSession, page: int) -> bool:
+        async with semaphore:
+            text = await request_with_retries(f"http://{host}/offers/noutbuki/?PAGEN_1={page}", CUSTOM_HEADERS,
+                                              session, deadline=180 * scale, policies=policies)
+            return text is not None
+
+    start = time.perf_counter()
+    async with ClientSession(timeout=timeout) as session:
+        results = await asyncio.gather(*(fetch(session, page) for page in range(1, args.pages + 1)))
+    elapsed = time.perf_counter() - start
+    await runner.cleanup()
+
+    requests = sum(injector.answers.values())
+    print(f"Pages: {sum(results)}/{args.pages} retrieved in {elapsed:.2f} s ({sum(results) / elapsed:.1f} pages/s)")
+    print(f"Requests: {requests} ({requests / args.pages:.2f} per page), answers: {dict(injector.answers)}")
+    print(f"Requests during the blocking phase: {injector.blocked_requests}, breaker trips: {BREAKERS[host].trips}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Crawl a local fault-injecting server through request_with_retries")
+    parser.add_argument("--pages", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--time-scale", type=float, default=0.01, help="Factor applied to every delay and timeout")
+    parser.add_argument("--captcha", type=float, default=0.05, help="CAPTCHA rate outside the blocking phase")
+    parser.add_argument("--throttled", type=float, default=0.05, help="Rate of 429 answers with Retry-After")
+    parser.add_argument("--server", type=float, default=0.05, help="Rate of 5xx answers")
+    parser.add_argument("--reset", type=float, default=0.02, help="Rate of dropped connections")
+    parser.add_argument("--slow", type=float, default=0.01, help="Rate of answers slower than the read timeout")
+    parser.add_argument("--block-start", type=float, default=100, help="Start of the blocking phase, unscaled seconds")
+    parser.add_argument("--block-end", type=float, default=250, help="End of the blocking phase, unscaled seconds")
+    parser.add_argument("--block-rate", type=float, default=0.9, help="CAPTCHA rate during the blocking phase")
+    parser.add_argument("--no-breaker", action="store_true", help="Never open the circuit breaker")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    random.seed(args.seed)
+    asyncio.run(crawl(args))
@@ -0,0 +1,336 @@
+# Importing Necessary Libraries
+import argparse
+import asyncio
+import cProfile
+import html
+import json
+import logging
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_DIR = os.path.join(ROOT, "app")
+sys.path.insert(0, os.path.join(ROOT, "scraper"))
+sys.path.insert(0, APP_DIR)
+sys.path.insert(0, os.path.join(APP_DIR, "pages"))
+
+# The assessment path runs against the deterministic local client, never a paid API
+os.environ["LAPTOPIO_COMPLETION_BACKEND"] = "fake"
+
+from aiohttp import ClientSession, web
+from bs4 import BeautifulSoup
+from streamlit import logger as streamlit_logger
+from bench_cleaning import scale_catalogue
+from cleaning import run_pipeline
+from parsers import parse_item_card, parse_page
+from scraper import parse_listing
+from catalogue import CATALOGUE_PATH, read_catalogue_csv
+from facets import build_facet_index, load_facets
+from segments import build_segment_index
+from assessment import build_assessment_prompt, get_catalogue_config
+from scoring import assess_many
+from main_page import load_comparison_laptop, show_sidebar
+
+FIXTURE_PATH = os.path.join(ROOT, "benchmarks", "fixtures", "listing_page.html")
+
+# Cards of the saved listing page, about the size of a page of the shop
+FIXTURE_CARDS = 48
+
+# Columns of laptops.csv that are not rendered as specification rows of a card
+CARD_COLUMNS = ["laptop id", "title", "old price", "current price", "image link"]
+
+def render_listing_page(raw: pd.DataFrame, page: int = 2, pages: int = 25) -> str:
+    """
+    Render scraped laptops back into the markup of a listing page of the shop.
+
+    Args:
+        raw (pd.DataFrame): Rows of the dataset saved by the scraper.
+        page (int): Number of the rendered page.
+        pages (int): Number of pages offered by the paginator.
+
+    Returns:
+        str: Listing page HTML.
+    """
+    cards = []
+    for _, laptop in raw.iterrows():
+        specs = "".join(
+            f'<div><span class="bx_catalog_item_prop">{html.escape(key)}:</span>'
+            f'<span class="bx_catalog_item_value">{html.escape(str(value))}</span></div>'
+            for key, value in laptop.drop(CARD_COLUMNS).dropna().items()
+        )
+        cards.append(f'''
+<div class="bx_catalog_item" data-id="{laptop['laptop id']}">
+  <div class="item_image_container"><img src="/local/templates/shop/images/lazy.svg" data-src="{laptop['image link']}"></div>
+  <div class="bx_catalog_item_title"><a href="/offers/{laptop['laptop id']}/" title="Ноутбук {html.escape(laptop['title'])} {laptop['laptop id']}">{html.escape(laptop['title'])}</a></div>
+  <div class="bx_catalog_item_scu_code" text="{laptop['laptop id']}">Код товара: {laptop['laptop id']}</div>
+  <div class="bx_catalog_item_price"><span class="old_price">{laptop['old price']}</span> <span class="current_price">{laptop['current price']}</span></div>
+  <div class="bx_catalog_item_spec">{specs}</div>
+</div>''')
+
+    paginator = "".join(f'<li><a href="/offers/noutbuki/?PAGEN_1={number}">{number}</a></li>'
+                        for number in range(1, pages + 1))
+    return f'''<!DOCTYPE html>
+<html lang="ru">
+<head><meta charset="utf-8"><title>Ноутбуки - купить в Алматы</title></head>
+<body>
+<div class="bx_catalog_list">{"".join(cards)}
+</div>
+<div class="bx-pagination"><ul>{paginator}<li class="bx-pag-next"><a href="/offers/noutbuki/?PAGEN_1={page + 1}">Вперед</a></li></ul></div>
+</body>
+</html>
+'''
+
+def load_fixture(refresh: bool = False) -> str:
+    # The saved page is rendered once from laptops.csv and reused so every run parses the same bytes
+    if refresh or not os.path.exists(FIXTURE_PATH):
+        raw = pd.read_csv(os.path.join(ROOT, "scraper", "data", "laptops.csv"), dtype=str)
+        os.makedirs(os.path.dirname(FIXTURE_PATH), exist_ok=True)
+        with open(FIXTURE_PATH, "w", encoding="utf-8") as file:
+            file.write(render_listing_page(raw.head(FIXTURE_CARDS)))
+    with open(FIXTURE_PATH, encoding="utf-8") as file:
+        return file.read()
+
+def scale_app_catalogue(data: pd.DataFrame, factor: int) -> pd.DataFrame:
+    # Same as bench_cleaning.scale_catalogue for the dataset used by the app
+    copies = []
+    for copy in range(factor):
+        chunk = data.copy()
+        if copy:
+            chunk["laptop_id"] = chunk["laptop_id"].astype(str) + f"-{copy}"
+        copies.append(chunk)
+    return pd.concat(copies, ignore_index=True)
+
+class Suite:
+    """
+    Runs benchmark scenarios and collects their timings.
+
+    Args:
+        repeat (int): Timed runs of every scenario.
+        profiler (Optional[str]): "cprofile" or "pyinstrument" to dump one extra profiled run per scenario.
+        profile_dir (str): Directory of the profile dumps.
+    """
+    def __init__(self, repeat: int, profiler: Optional[str] = None, profile_dir: str = "profiles") -> None:
+        self.repeat = repeat
+        self.profiler = profiler
+        self.profile_dir = profile_dir
+        self.results: List[Dict[str, Any]] = []
+
+    def measure(self, name: str, func: Callable[[], Any], items: int = 1, scale: int = 1, rows: int = 0) -> None:
+        """
+        Time a scenario and record its best and median run.
+
+        Args:
+            name (str): Scenario name.
+            func (Callable[[], Any]): One run of the scenario.
+            items (int): Items processed by one run (cards, rows, queries...), for the throughput.
+            scale (int): Catalogue scale factor.
+            rows (int): Catalogue rows at this scale.
+
+        Returns:
+            None
+        """
+        func()  # Warm-up run, fills caches the page would already have
+        timings = []
+        for _ in range(self.repeat):
+            start = time.perf_counter()
+            func()
+            timings.append(time.perf_counter() - start)
+
+        best, median = min(timings), statistics.median(timings)
+        self.results.append({"scenario": name, "scale": scale, "rows": rows, "items": items,
+                             "best_s": best, "median_s": median, "items_per_s": items / best})
+        print(f"{name:<24} {scale:>5}x {rows:>9} {best * 1000:>11.3f} {median * 1000:>11.3f} {items / best:>12.0f}")
+
+        if self.profiler:
+            self.profile(f"{name}-{scale}x", func)
+
+    def profile(self, label: str, func: Callable[[], Any]) -> None:
+        os.makedirs(self.profile_dir, exist_ok=True)
+        if self.profiler == "cprofile":
+            profile = cProfile.Profile()
+            profile.runcall(func)
+            profile.dump_stats(os.path.join(self.profile_dir, f"{label}.prof"))
+            return
+
+        try:
+            from pyinstrument import Profiler
+        except ImportError:
+            logging.warning("pyinstrument is not installed, use --profile cprofile instead")
+            self.profiler = None
+            return
+        profiler = Profiler()
+        profiler.start()
+        func()
+        profiler.stop()
+        with open(os.path.join(self.profile_dir, f"{label}.html"), "w") as file:
+            file.write(profiler.output_html())
+
+def bench_scraper(suite: Suite, fixture: str, pages: int) -> None:
+    soup = BeautifulSoup(fixture, "lxml")
+    cards = soup.select("[data-id]")
+    suite.measure("parse_item_card", lambda: [parse_item_card(card) for card in cards], len(cards))
+    for backend in ("bs4", "lxml"):
+        suite.measure(f"parse_page_{backend}", lambda: parse_page(fixture, backend), len(cards))
+
+    async def handler(request: web.Request) -> web.Response:
+        return web.Response(text=fixture, content_type="text/html")
+
+    async def crawl(url: str) -> None:
+        async with ClientSession() as session:
+            for _ in range(pages):
+                await parse_listing(url, session)
+
+    # The fixture is served from localhost on the same loop, so the run covers the request path without the network
+    app = web.Application()
+    app.router.add_get("/offers/noutbuki/", handler)
+    runner = web.AppRunner(app)
+    loop = asyncio.new_event_loop()
+    try:
+        loop.run_until_complete(runner.setup())
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        loop.run_until_complete(site.start())
+        port = runner.addresses[0][1]
+        url = f"http://127.0.0.1:{port}/offers/noutbuki/"
+        suite.measure("parse_listing", lambda: loop.run_until_complete(crawl(url)), pages * len(cards))
+    finally:
+        loop.run_until_complete(runner.cleanup())
+        loop.close()
+
+def bench_app(suite: Suite, scales: List[int], workdir: str) -> None:
+    raw = pd.read_csv(os.path.join(ROOT, "scraper", "data", "laptops.csv"))
+    data = read_catalogue_csv(os.path.join(APP_DIR, CATALOGUE_PATH))
+
+    # The pages read data/laptops_data.csv relative to the working directory, so it points to the scaled copy
+    os.makedirs(os.path.join(workdir, "data"), exist_ok=True)
+    os.chdir(workdir)
+
+    for factor in scales:
+        catalogue = scale_app_catalogue(data, factor)
+        catalogue.to_csv(CATALOGUE_PATH, index=False)
+        rows = len(catalogue)
+        scaled_raw = scale_catalogue(raw, factor)
+
+        suite.measure("clean_pipeline", lambda: run_pipeline(scaled_raw), len(scaled_raw), factor, rows)
+        suite.measure("load_csv", lambda: read_catalogue_csv(CATALOGUE_PATH), rows, factor, rows)
+        suite.measure("build_facets", lambda: build_facet_index(catalogue), rows, factor, rows)
+        suite.measure("show_sidebar", lambda: show_sidebar(load_facets()), 1, factor, rows)
+        suite.measure("build_segments", lambda: build_segment_index(catalogue), rows, factor, rows)
+        segments = ["gaming laptop", "macbook", "laptop"] * 100
+        suite.measure("pick_comparison", lambda: [load_comparison_laptop(segment) for segment in segments],
+                      len(segments), factor, rows)
+
+def bench_assessment(suite: Suite, configs: int) -> None:
+    data = read_catalogue_csv(CATALOGUE_PATH)
+    laptops = [get_catalogue_config(laptop) for laptop in data.head(configs).to_dict("records")]
+    requests = [(config, build_assessment_prompt(config)) for config in laptops]
+    suite.measure("build_prompts", lambda: [build_assessment_prompt(config) for config in laptops], configs)
+
+    # Every timed run asks for configurations the score store has not seen yet
+    runs = iter(range(1_000_000))
+    def assess_new() -> None:
+        run = next(runs)
+        assess_many([({**config, "run": run}, prompt) for config, prompt in requests])
+    suite.measure("assess_uncached", assess_new, configs)
+    suite.measure("assess_cached", lambda: assess_many(requests), configs)
+
+def get_metadata(args: argparse.Namespace) -> Dict[str, Any]:
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                                text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "pandas": pd.__version__,
+        "numpy": np.__version__,
+        "scales": args.scales,
+        "repeat": args.repeat,
+    }
+
+def compare(results: List[Dict[str, Any]], baseline_path: str, threshold: float) -> int:
+    """
+    Print the change of every scenario against a previous run.
+
+    Args:
+        results (List[Dict[str, Any]]): Results of this run.
+        baseline_path (str): JSON written by a previous run.
+        threshold (float): Relative slowdown of the time per item reported as a regression (0.2 is 20%).
+
+    Returns:
+        int: Number of regressions.
+    """
+    with open(baseline_path) as file:
+        baseline = {(result["scenario"], result["scale"]): result for result in json.load(file)["results"]}
+
+    regressions = 0
+    print(f"\n{'scenario':<24} {'scale':>6} {'before/s':>12} {'after/s':>12} {'change':>8}")
+    for result in results:
+        previous = baseline.get((result["scenario"], result["scale"]))
+        if previous is None:
+            continue
+        # Per item, so runs with other --pages or --configs stay comparable
+        change = previous["items_per_s"] / result["items_per_s"] - 1
+        flag = ""
+        if change > threshold:
+            regressions += 1
+            flag = "  REGRESSION"
+        print(f"{result['scenario']:<24} {result['scale']:>5}x {previous['items_per_s']:>12.0f} "
+              f"{result['items_per_s']:>12.0f} {change:>+8.1%}{flag}")
+    return regressions
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark scraper parsing, data loading and page render paths")
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 10, 100], help="Catalogue scale factors")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs of every scenario")
+    parser.add_argument("--pages", type=int, default=20, help="Listing pages fetched by the parse_listing scenario")
+    parser.add_argument("--configs", type=int, default=20, help="Configurations of the assessment scenarios")
+    parser.add_argument("--output", default=None, help="Results JSON, benchmarks/results/<timestamp>.json by default")
+    parser.add_argument("--compare", default=None, help="Results JSON of a previous run to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Relative slowdown reported as a regression")
+    parser.add_argument("--profile", choices=["cprofile", "pyinstrument"], default=None,
+                        help="Dump a profile of every scenario")
+    parser.add_argument("--profile-dir", default=os.path.join(ROOT, "benchmarks", "profiles"))
+    parser.add_argument("--refresh-fixture", action="store_true", help="Render the saved listing page again")
+    return parser.parse_args()
+
+def main() -> None:
+    args = parse_args()
+    # Streamlit warns about the missing script context on every widget call outside `streamlit run`
+    streamlit_logger.set_log_level("error")
+    logging.getLogger().setLevel(logging.ERROR)
+
+    output = args.output or os.path.join(ROOT, "benchmarks", "results",
+                                         f"{datetime.now().strftime('%Y%m%d-%H%M%S')}.json")
+    output = os.path.abspath(output)
+    suite = Suite(args.repeat, args.profile, os.path.abspath(args.profile_dir))
+
+    print(f"{'scenario':<24} {'scale':>6} {'rows':>9} {'best, ms':>11} {'median, ms':>11} {'items/s':>12}")
+    bench_scraper(suite, load_fixture(args.refresh_fixture), args.pages)
+    with tempfile.TemporaryDirectory() as workdir:
+        bench_app(suite, args.scales, workdir)
+        bench_assessment(suite, args.configs)
+        os.chdir(ROOT)
+
+    os.makedirs(os.path.dirname(output), exist_ok=True)
+    with open(output, "w") as file:
+        json.dump({"meta": get_metadata(args), "results": suite.results}, file, indent=2)
+    print(f"\nResults written to {output}")
+
+    if args.compare and compare(suite.results, args.compare, args.threshold):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
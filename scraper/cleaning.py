@@ -0,0 +1,235 @@
+# Importing Necessary Libraries
+import argparse
+import logging
+import time
+import numpy as np
+import pandas as pd
+from typing import Dict, Tuple
+
+# Setting up config
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+# Scraped (russian) column names and their english equivalents
+COLUMN_NAMES = {
+    "Операционная система": "Operational system",
+    "Процессор": "CPU",
+    "Интегрированная в процессор графика": "Integrated graphics",
+    "Объем оперативной памяти, ГБ": "RAM",
+    "Жесткий диск": "HDD",
+    "Твердотельный накопитель": "SSD",
+    "Диагональ экрана, дюйм": "Display Diagonal",
+    "Разрешение экрана": "Screen resolution",
+    "Вес, кг": "Weight",
+    "Внимание": "Warning",
+    "Модель процессора": "CPU model",
+    "Частота процессора, ГГц": "CPU frequency",
+    "Конфигурация оперативной памяти": "RAM Configuration",
+    "Модель дискретной видеокарты": "GPU",
+    "Вес": "Weight_1"
+}
+
+# Storage units and their size in GB
+STORAGE_UNITS = {"ТБ": 1024, "ГБ": 1}
+
+# First word of the GPU model and the GPU brand
+GPU_BRANDS = {
+    "GeForce": "NVIDIA",
+    "MX": "NVIDIA",
+    "MX150": "NVIDIA",
+    "MX250": "NVIDIA",
+    "Radeon": "AMD",
+    "No": "Intel",
+}
+
+# Column order of the cleansed dataset
+CLEANSED_COLUMNS = ["laptop_id", "brand", "model",
+                    "old_price", "current_price", "discount_rate_percent",
+                    "operational_system", "graphics_type", "integrated_graphics",
+                    "gpu", "cpu_brand", "cpu_model",
+                    "cpu_frequency", "ram", "memory_type",
+                    "hdd_capacity", "ssd_capacity", "display_diagonal", "resolution",
+                    "video_standard", "weight"]
+
+def split_first_word(column: pd.Series) -> Tuple[pd.Series, pd.Series]:
+    """
+    Split strings into their first word and the rest joined by single spaces.
+
+    Args:
+        column (pd.Series): String column, e.g. "Apple MacBook Air".
+
+    Returns:
+        Tuple[pd.Series, pd.Series]: First words ("Apple") and the rest ("MacBook Air").
+    """
+    parts = column.str.extract(r"^\s*(\S+)\s*(.*?)\s*$")
+    return parts[0], parts[1].str.replace(r"\s+", " ", regex=True)
+
+def parse_price(column: pd.Series) -> pd.Series:
+    """
+    Convert prices like "849 990 ₸" into float64 by removing the currency symbol and spaces between numbers.
+
+    Args:
+        column (pd.Series): Scraped price column.
+
+    Returns:
+        pd.Series: Prices as float64, NaN where missing.
+    """
+    digits = column.str.replace(r"\s*\S+\s*$", "", regex=True).str.replace(r"\s+", "", regex=True)
+    return pd.to_numeric(digits).astype(np.float64)
+
+def extract_capacity(column: pd.Series) -> pd.Series:
+    """
+    Convert storage like "512 ГБ SSD" / "1 ТБ HDD" into GB, "No" into 0.
+
+    Args:
+        column (pd.Series): HDD or SSD column.
+
+    Returns:
+        pd.Series: Capacity in GB as float64.
+    """
+    parts = column.str.extract(r"^\s*(\d+)\s+(\S+)")
+    units = parts[1].map(STORAGE_UNITS)
+    capacity = parts[0].astype(np.float64) * units
+    return capacity.where(column != "No", 0.0)
+
+def clean_raw(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Rename scraped columns and fill missing values the same way the notebook does.
+
+    Args:
+        df (pd.DataFrame): Dataset saved by the scraper (laptops.csv).
+
+    Returns:
+        pd.DataFrame: Dataset with english snake_case columns and no missing hardware values.
+    """
+    df = df.rename(columns=COLUMN_NAMES)
+    df.columns = [column.replace(" ", "_").lower() for column in df.columns]
+    df = df.drop(["cpu_model", "ram_configuration"], axis=1)
+
+    # Integrated graphics: most occurred graphic when both are missing, "No" when only GPU is present
+    no_graphics = df["integrated_graphics"].isna() & df["gpu"].isna()
+    df.loc[no_graphics, "integrated_graphics"] = df["integrated_graphics"].mode()[0]
+    df.loc[df["integrated_graphics"].isna() & df["gpu"].notna(), "integrated_graphics"] = "No"
+
+    df["hdd"] = df["hdd"].fillna("No")
+    df["ssd"] = df["ssd"].fillna("No")
+
+    # Most common resolution across all VivoBook laptops
+    vivo_screen_resolution = df.loc[df["title"].str.contains("VivoBook"), "screen_resolution"].mode()[0]
+    df["screen_resolution"] = df["screen_resolution"].fillna(vivo_screen_resolution)
+
+    # Weight from the "Вес" column ("1.5 кг"), values above 4 kg are treated as outliers
+    weight_1 = pd.to_numeric(df["weight_1"].str.split().str[0], errors="coerce")
+    weight_1 = weight_1.where(weight_1 < 4)
+    missing_weight = df["weight"].isna()
+    df.loc[missing_weight, "weight"] = weight_1[missing_weight]
+    macbook_pro_weight = df.loc[df["title"].str.contains("Apple MacBook Pro"), "weight"].mode()[0]
+    df.loc[df["weight"].isna(), "weight"] = macbook_pro_weight
+    df = df.drop(["weight_1", "warning"], axis=1)
+
+    # The notebook assigns the Air mode and then the Pro mode to every missing frequency,
+    # so every missing value ends up with the MacBook Pro mode
+    macbooks_w_freq = df["title"].str.contains("Apple") & df["cpu_frequency"].notna()
+    freq_pro = df.loc[macbooks_w_freq & df["title"].str.contains("Pro"), "cpu_frequency"].mode()[0]
+    df["cpu_frequency"] = df["cpu_frequency"].fillna(freq_pro)
+
+    df["gpu"] = df["gpu"].fillna("No")
+    df["usb_type-c_power_delivery"] = df["usb_type-c_power_delivery"].fillna("No")
+
+    return df
+
+def engineer_features(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Derive brand/model, prices, CPU, graphics, memory and display features with vectorized string ops.
+
+    Args:
+        df (pd.DataFrame): Dataset returned by clean_raw.
+
+    Returns:
+        pd.DataFrame: Cleansed dataset with CLEANSED_COLUMNS.
+    """
+    df["brand"], df["model"] = split_first_word(df["title"])
+    df["model"] = df["model"].str.replace("с дисплеем", "with display")
+
+    df["old_price"] = parse_price(df["old_price"])
+    df["current_price"] = parse_price(df["current_price"])
+    df["discount_rate_percent"] = np.round((df["old_price"] - df["current_price"]) / df["old_price"] * 100, 2)
+
+    df.loc[df["operational_system"] == "Отсутствует", "operational_system"] = "DOS"
+
+    df["cpu_brand"], df["cpu_model"] = split_first_word(df["cpu"])
+
+    df["graphics_type"] = np.select([df["gpu"] == "No", df["integrated_graphics"] == "No"],
+                                    ["Integrated", "Discrete"], default="Both")
+
+    df.loc[df["hdd"] == "HDD нет", "hdd"] = "No"
+    df.loc[df["ssd"] == "SSD нет", "ssd"] = "No"
+    df["memory_type"] = np.select([df["hdd"] == "No", df["ssd"] == "No"], ["SSD", "HDD"], default="SHDD")
+    df["hdd_capacity"] = extract_capacity(df["hdd"])
+    df["ssd_capacity"] = extract_capacity(df["ssd"])
+
+    # "1920 x 1080 Full HD" -> resolution "1920 x 1080", video standard "Full HD" ("Other" if missing)
+    display = df["screen_resolution"].str.extract(r"^\s*(\S+(?:\s+\S+){0,2})\s*(.*?)\s*$")
+    df["resolution"] = display[0].str.replace(r"\s+", " ", regex=True)
+    df["video_standard"] = display[1].str.replace(r"\s+", " ", regex=True).replace("", "Other")
+
+    df["weight"] = df["weight"].astype(str).str.split().str[0].astype(float)
+
+    return df[CLEANSED_COLUMNS].copy()
+
+def add_app_features(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Add the GPU brand and CPU + GPU combination columns used by the Streamlit app.
+
+    Args:
+        df (pd.DataFrame): Cleansed dataset.
+
+    Returns:
+        pd.DataFrame: Dataset saved as app/data/laptops_data.csv.
+    """
+    df = df.copy()
+    # Mapped once per distinct GPU name instead of once per row
+    gpu_type = df["gpu"].str.extract(r"^\s*(\S+)")[0].astype("category")
+    df["gpu_brand"] = gpu_type.map(lambda name: GPU_BRANDS.get(name, name)).astype(object)
+    df["cpu_gpu_combination"] = df["cpu_brand"] + " + " + df["gpu_brand"]
+    return df
+
+def run_pipeline(raw: pd.DataFrame) -> Dict[str, pd.DataFrame]:
+    """
+    Transform the scraped dataset into the cleansed, app and image link datasets.
+
+    Args:
+        raw (pd.DataFrame): Dataset saved by the scraper (laptops.csv).
+
+    Returns:
+        Dict[str, pd.DataFrame]: "cleansed", "app" and "images" datasets.
+    """
+    df = clean_raw(raw)
+    images = df[["laptop_id", "image_link"]].copy()
+    cleansed = engineer_features(df.drop("image_link", axis=1))
+    return {
+        "cleansed": cleansed,
+        "app": add_app_features(cleansed),
+        "images": images,
+    }
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Clean the scraped laptops dataset")
+    parser.add_argument("--input", default="data/laptops.csv", help="Dataset saved by the scraper")
+    parser.add_argument("--cleansed", default="data/laptops_cleansed.csv", help="Cleansed dataset")
+    parser.add_argument("--app", default="../app/data/laptops_data.csv", help="Dataset used by the Streamlit app")
+    parser.add_argument("--images", default="data/laptop_images.csv", help="Laptop image links")
+    return parser.parse_args()
+
+def main() -> None:
+    args = parse_args()
+
+    start_time = time.time()
+    datasets = run_pipeline(pd.read_csv(args.input))
+    for key, name in (("cleansed", args.cleansed), ("app", args.app), ("images", args.images)):
+        datasets[key].to_csv(name, index=False)
+        logging.info(f"Dataset was saved with dirname: {name}")
+
+    logging.info(f"Cleaned {len(datasets['cleansed'])} laptops in {round(time.time() - start_time, 2)} seconds")
+
+if __name__ == "__main__":
+    main()
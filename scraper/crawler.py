@@ -0,0 +1,367 @@
+# Importing Necessary Libraries
+import argparse
+import asyncio
+import heapq
+import logging
+import os
+import time
+from collections import Counter
+from typing import Dict, List, NamedTuple, Optional, Set, Tuple
+from urllib.parse import parse_qsl, urldefrag, urlencode, urljoin, urlparse, urlunparse
+from aiohttp import ClientSession, TCPConnector
+from http_cache import ResponseCache
+from parsers import PARSERS, parse_page
+from price_history import HISTORY_PATH, record_file
+from scraper import CLIENT_TIMEOUT, TokenBucket, build_page_url, get_page_number, parse_listing, save_csv
+from sinks import ProductSink, SINKS, get_sink
+
+class Site(NamedTuple):
+    """
+    Politeness budget and parser of one host.
+
+    Attributes:
+        parser (str): Backend of parsers.PARSERS, see parsers.register_parser for other shops.
+        rate (float): Maximum requests per second sent to the host.
+        concurrency (int): Maximum pages of the host fetched at the same time.
+    """
+    parser: str = "bs4"
+    rate: float = 0.5
+    concurrency: int = 4
+
+# Sites by host (netloc), e.g. SITES["www.competitor.kz"] = Site(parser="competitor", rate=1)
+SITES: Dict[str, Site] = {}
+
+# Budget of the hosts missing from SITES, unless the crawler is given another default
+DEFAULT_SITE = Site()
+
+# Seeds given as a category slug (e.g. "noutbuki") instead of a URL are listing pages of shop.kz
+CATEGORY_URL = "https://shop.kz/offers/{}/"
+
+def get_seed_url(seed: str) -> str:
+    return seed if "://" in seed else CATEGORY_URL.format(seed.strip("/"))
+
+def normalize_url(url: str) -> str:
+    """
+    Canonical form of a listing page URL used to crawl every page once.
+
+    The fragment is dropped, the host is lowercased, query parameters are sorted and the
+    first page loses its explicit pagination parameter.
+
+    Args:
+        url (str): Listing page URL.
+
+    Returns:
+        str: Canonical URL.
+    """
+    url, _ = urldefrag(url)
+    parsed = urlparse(build_page_url(url, get_page_number(url)))
+    return urlunparse(parsed._replace(netloc=parsed.netloc.lower(), query=urlencode(sorted(parse_qsl(parsed.query)))))
+
+class HostFrontier:
+    """
+    Pages of one host waiting to be fetched, popped by page number so the first pages of every seed go first.
+
+    A worker asking for a page waits while the queue is empty and another page of the host is still
+    in flight, since that page may link to more pages. The host is done when both are empty.
+    """
+    def __init__(self) -> None:
+        self.heap: List[Tuple[int, int, str, int]] = []
+        self.in_flight = 0
+        self.changed = asyncio.Condition()
+
+    async def put(self, priority: int, order: int, url: str, seed: int) -> None:
+        async with self.changed:
+            heapq.heappush(self.heap, (priority, order, url, seed))
+            self.changed.notify()
+
+    async def get(self) -> Optional[Tuple[str, int]]:
+        """
+        Take the next page to fetch.
+
+        Returns:
+            Optional[Tuple[str, int]]: URL of the page and index of its seed, None once the host is done.
+        """
+        async with self.changed:
+            while not self.heap:
+                if self.in_flight == 0:
+                    return None
+                await self.changed.wait()
+            self.in_flight += 1
+            _, _, url, seed = heapq.heappop(self.heap)
+            return url, seed
+
+    async def done(self) -> None:
+        async with self.changed:
+            self.in_flight -= 1
+            self.changed.notify_all()
+
+class Crawler:
+    """
+    Crawl scheduler of listing pages of several categories and shops in one job.
+
+    Every seed is the first listing page of a category, its other pages are discovered from the
+    paginator and queued in the frontier of its host once. All hosts are crawled at the same time
+    over one pooled session, each by its own workers spaced out by its own token bucket and
+    circuit breaker, so a slow or blocking shop does not hold the others back.
+
+    With a sink, pages are written by seed and page number as soon as every page before them is
+    written, and numbered seed * max_pages + page. The checkpoint of the sink then tells which
+    seeds are done and where the current one stopped, so a resumed sink skips the seeds already
+    written and the pages of the current seed up to its checkpoint. The checkpoint stops before
+    the first page that could not be retrieved. Resuming needs the same seeds and max_pages.
+
+    Args:
+        seeds (List[str]): Listing URLs or shop.kz category slugs.
+        max_pages (int): Maximum number of pages crawled per seed.
+        cache (Optional[ResponseCache]): The on-disk response cache.
+        sink (Optional[ProductSink]): Streaming writer for scraped products, pages are written in seed and page order.
+        default_site (Site): Budget and parser of the hosts missing from sites.
+        sites (Optional[Dict[str, Site]]): Budgets and parsers by host, SITES by default.
+    """
+    def __init__(self, seeds: List[str], max_pages: int = 100, cache: Optional[ResponseCache] = None,
+                 sink: Optional[ProductSink] = None, default_site: Site = DEFAULT_SITE,
+                 sites: Optional[Dict[str, Site]] = None) -> None:
+        self.seeds = [normalize_url(get_seed_url(seed)) for seed in seeds]
+        self.max_pages = max_pages
+        self.cache = cache
+        self.sink = sink
+        self.default_site = default_site
+        self.sites = SITES if sites is None else sites
+        self.frontiers: Dict[str, HostFrontier] = {}
+        self.seen: Set[str] = set()
+        self.remaining: Counter = Counter()
+        self.order = 0
+        self.pages: Dict[Tuple[int, int], List[Dict[str, str]]] = {}
+        self.finished: Dict[Tuple[int, int], Optional[List[Dict[str, str]]]] = {}
+        self.written = (0, 0)
+        self.stopped = False
+        self.stats: Dict[str, Counter] = {}
+
+    def get_site(self, host: str) -> Site:
+        return self.sites.get(host, self.default_site)
+
+    async def schedule(self, url: str, seed: int) -> None:
+        url = normalize_url(url)
+        # Capped by page number rather than count, so the pages of a seed are always 1 to N
+        if url in self.seen or get_page_number(url) > self.max_pages:
+            return
+        self.seen.add(url)
+        self.remaining[seed] += 1
+        self.order += 1
+        await self.frontiers[urlparse(url).netloc].put(get_page_number(url), self.order, url, seed)
+
+    def is_complete(self) -> bool:
+        # Every seed was written to the sink
+        return self.written[0] == len(self.seeds) and not self.stopped
+
+    def flush(self) -> None:
+        """
+        Write the finished pages that follow the last written page, by seed and page number.
+
+        A seed is over once none of its pages are queued or in flight, its pages found later
+        would have been scheduled by the pages already finished.
+
+        Returns:
+            None
+        """
+        while not self.stopped:
+            seed, page = self.written
+            if (seed, page + 1) in self.finished:
+                products = self.finished.pop((seed, page + 1))
+                if products is None:
+                    logging.error(f"Page {page + 1} of {self.seeds[seed]} could not be retrieved, "
+                                  f"the sink stops before it")
+                    self.stopped = True
+                    return
+                self.sink.write_page(seed * self.max_pages + page + 1, products)
+                self.written = (seed, page + 1)
+            elif seed < len(self.seeds) and self.remaining[seed] == 0:
+                self.written = (seed + 1, 0)
+            else:
+                return
+
+    def finish(self, seed: int, page: int, products: Optional[List[Dict[str, str]]]) -> None:
+        if self.sink:
+            # Pages the resumed sink already holds are fetched again only for their paginator
+            if (seed, page) > self.written:
+                self.finished[seed, page] = products
+            self.remaining[seed] -= 1
+            self.flush()
+        else:
+            self.remaining[seed] -= 1
+            if products is not None:
+                self.pages[seed, page] = products
+
+    async def fetch(self, url: str, seed: int, session: ClientSession, bucket: TokenBucket,
+                    backend: str) -> Optional[List[Dict[str, str]]]:
+        host = urlparse(url).netloc
+        await bucket.acquire()
+        products, links = await parse_listing(url, session, self.cache, backend)
+        if links is None and self.cache and self.cache.is_unchanged(url):
+            # Unchanged page was not re-parsed, its paginator is still needed
+            _, links = parse_page(self.cache.get_body(url), backend)
+
+        self.stats[host]["pages"] += 1
+        self.stats[host]["products"] += len(products)
+        if links is None:
+            self.stats[host]["failed"] += 1
+            logging.warning(f"Page {url} could not be retrieved")
+            return None
+
+        category = urlparse(self.seeds[seed]).path
+        for product in products:
+            product["shop"] = host
+            product["category"] = category
+
+        for href in [links.next_href, *links.page_hrefs]:
+            # Only pages of the same host are followed, other shops come from their own seeds
+            if href and urlparse(urljoin(url, href)).netloc == host:
+                await self.schedule(urljoin(url, href), seed)
+        return products
+
+    async def work(self, host: str, session: ClientSession, bucket: TokenBucket, backend: str) -> None:
+        frontier = self.frontiers[host]
+        while True:
+            item = await frontier.get()
+            if item is None:
+                return
+            url, seed = item
+            products = None
+            try:
+                products = await self.fetch(url, seed, session, bucket, backend)
+            except Exception as error:
+                logging.error(f"Crawling {url} failed: {error!r}")
+            finally:
+                # Links of the page are scheduled before it counts as finished
+                self.finish(seed, get_page_number(url), products)
+                await frontier.done()
+
+    async def crawl_host(self, host: str, session: ClientSession) -> None:
+        site = self.get_site(host)
+        if site.parser not in PARSERS:
+            raise ValueError(f"Unknown parser backend of {host}: {site.parser}")
+
+        start = time.perf_counter()
+        bucket = TokenBucket(site.rate, capacity=site.concurrency)
+        await asyncio.gather(*(self.work(host, session, bucket, site.parser) for _ in range(site.concurrency)))
+        stats = self.stats[host]
+        logging.info(f"{host}: {stats['pages']} pages ({stats['failed']} failed), {stats['products']} products "
+                     f"in {time.perf_counter() - start:.2f} seconds")
+
+    async def run(self, session: Optional[ClientSession] = None) -> List[Dict[str, str]]:
+        """
+        Crawl every seed.
+
+        Args:
+            session (Optional[ClientSession]): Session to use, a pooled one is opened by default.
+
+        Returns:
+            List[Dict[str, str]]: Products ordered by seed and page number (empty when streamed to a sink).
+        """
+        if self.sink and self.sink.last_page:
+            seed, page = divmod(self.sink.last_page - 1, self.max_pages)
+            self.written = (seed, page + 1)
+            logging.info(f"Resuming after page {page + 1} of {self.seeds[seed]}")
+
+        for seed, url in enumerate(self.seeds):
+            host = urlparse(url).netloc
+            if host not in self.frontiers:
+                self.frontiers[host] = HostFrontier()
+                self.stats[host] = Counter()
+            if seed >= self.written[0]:
+                await self.schedule(url, seed)
+
+        if session is None:
+            sites = [self.get_site(host) for host in self.frontiers]
+            connector = TCPConnector(limit=sum(site.concurrency for site in sites),
+                                     limit_per_host=max(site.concurrency for site in sites))
+            async with ClientSession(timeout=CLIENT_TIMEOUT, connector=connector) as session:
+                await asyncio.gather(*(self.crawl_host(host, session) for host in self.frontiers))
+        else:
+            await asyncio.gather(*(self.crawl_host(host, session) for host in self.frontiers))
+
+        return [product for key in sorted(self.pages) for product in self.pages[key]]
+
+async def execute_crawl(seeds: List[str], max_pages: int = 100, name: str = "laptops.csv",
+                        cache: Optional[ResponseCache] = None, sink: Optional[ProductSink] = None,
+                        default_site: Site = DEFAULT_SITE) -> List[Dict[str, str]]:
+    """
+    Crawl several categories and shops in one job and save the products.
+
+    Args:
+        seeds (List[str]): Listing URLs or shop.kz category slugs.
+        max_pages (int): Maximum number of pages crawled per seed.
+        name (str): The name of the CSV file.
+        cache (Optional[ResponseCache]): The on-disk response cache.
+        sink (Optional[ProductSink]): Streaming writer for scraped products, resumable (see Crawler).
+        default_site (Site): Budget and parser of the hosts missing from SITES.
+
+    Returns:
+        List[Dict[str, str]]: The scraped products ordered by seed and page number (empty when streamed to a sink).
+    """
+    start_time = time.time()
+    logging.info(f"Started crawling {len(seeds)} seeds at "
+                 f"{time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(start_time))}")
+
+    crawler = Crawler(seeds, max_pages, cache, sink, default_site)
+    laptops = await crawler.run()
+    if sink:
+        if crawler.is_complete():
+            sink.finalize()
+        else:
+            logging.error(f"Stopped after page {sink.last_page}, run again with --resume to continue")
+    else:
+        save_csv(laptops, name)
+
+    end_time = time.time()
+    logging.info(f"Finished crawling at {time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(end_time))}")
+    logging.info(f"Total time taken: {round((end_time - start_time), 2)} seconds")
+    return laptops
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Crawl laptop listings of several categories and shops in one job")
+    parser.add_argument("seeds", nargs="*", help="Listing URLs or shop.kz category slugs")
+    parser.add_argument("--seeds-file", help="File with one seed per line")
+    parser.add_argument("--max-pages", type=int, default=100, help="Maximum number of pages crawled per seed")
+    parser.add_argument("--rate", type=float, default=DEFAULT_SITE.rate,
+                        help="Maximum requests per second to each host missing from SITES")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_SITE.concurrency,
+                        help="Maximum pages fetched at once from each host missing from SITES")
+    parser.add_argument("--parser", choices=sorted(PARSERS), default=DEFAULT_SITE.parser,
+                        help="Parser backend of the hosts missing from SITES")
+    parser.add_argument("--cache", action="store_true", help="Send conditional requests through the on-disk cache")
+    parser.add_argument("--sink", choices=sorted(SINKS),
+                        help="Stream each parsed page to a CSV, JSON Lines or Parquet file instead of saving at the end")
+    parser.add_argument("--resume", action="store_true",
+                        help="Resume the sink from its last completed page (same seeds and --max-pages)")
+    parser.add_argument("--history", nargs="?", const=HISTORY_PATH, default=None,
+                        help="Record the saved catalogue as a run of the price history database")
+    return parser.parse_args()
+
+async def main() -> None:
+    args = parse_args()
+    seeds = list(args.seeds)
+    if args.seeds_file:
+        with open(args.seeds_file, encoding="utf-8") as file:
+            seeds += [line.strip() for line in file if line.strip() and not line.startswith("#")]
+    if not seeds:
+        seeds = ["noutbuki"]
+
+    default_site = Site(args.parser, args.rate, args.concurrency)
+    sink = get_sink(args.sink, resume=args.resume) if args.sink else None
+    cache = ResponseCache() if args.cache else None
+    try:
+        await execute_crawl(seeds, args.max_pages, cache=cache, sink=sink, default_site=default_site)
+    finally:
+        if cache:
+            cache.close()
+
+    if args.history:
+        catalogue = sink.name if sink else "laptops.csv"
+        if os.path.exists(catalogue):
+            record_file(catalogue, args.history)
+        else:
+            logging.error(f"No catalogue was saved at {catalogue}, the run was not recorded")
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,226 @@
+# Importing Necessary Libraries
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import time
+import zlib
+from typing import Dict, List, Optional
+
+# Default location of the on-disk response cache
+CACHE_PATH = ".cache/http_cache.sqlite"
+
+# Share of max_bytes stored bodies may exceed before a run evicts, so stores do not evict one entry at a time
+EVICT_SLACK = 0.1
+
+class ResponseCache:
+    """
+    Persistent response cache for listing pages stored in SQLite.
+
+    Every entry keeps the ETag/Last-Modified validators of the response, the
+    compressed body, its SHA-256 hash and the products parsed from it, so an
+    unchanged page can be answered without downloading or parsing it again.
+
+    Args:
+        path (str): Path to the SQLite database file.
+        ttl (float): Seconds after which an entry is evicted.
+        max_bytes (float): Maximum total size of stored bodies, least recently used entries are evicted first
+            when the cache is opened, when stores exceed it by EVICT_SLACK and when it is closed.
+    """
+    def __init__(self, path: str = CACHE_PATH, ttl: float = 7 * 24 * 3600, max_bytes: float = 256 * 1024 * 1024) -> None:
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self.unchanged: Dict[str, bool] = {}
+        self.connection = sqlite3.connect(path)
+        self.connection.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                url TEXT PRIMARY KEY,
+                etag TEXT,
+                last_modified TEXT,
+                body_hash TEXT NOT NULL,
+                body BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                products TEXT,
+                fetched_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+        """)
+        self.connection.commit()
+        self.evict()
+
+    def conditional_headers(self, url: str) -> Dict[str, str]:
+        """
+        Build conditional request headers from the validators of a cached response.
+
+        Args:
+            url (str): The requested URL.
+
+        Returns:
+            Dict[str, str]: If-None-Match / If-Modified-Since headers, empty if the URL is not cached.
+        """
+        row = self.connection.execute(
+            "SELECT etag, last_modified FROM responses WHERE url = ?", (url,)).fetchone()
+        headers: Dict[str, str] = {}
+        if row:
+            etag, last_modified = row
+            if etag:
+                headers["If-None-Match"] = etag
+            if last_modified:
+                headers["If-Modified-Since"] = last_modified
+        return headers
+
+    def get_body(self, url: str) -> Optional[str]:
+        """
+        Get the cached body of a URL.
+
+        Args:
+            url (str): The requested URL.
+
+        Returns:
+            Optional[str]: The decompressed body if cached, None otherwise.
+        """
+        row = self.connection.execute("SELECT body FROM responses WHERE url = ?", (url,)).fetchone()
+        if not row:
+            return None
+        self.connection.execute("UPDATE responses SET accessed_at = ? WHERE url = ?", (time.time(), url))
+        self.connection.commit()
+        return zlib.decompress(row[0]).decode("utf-8")
+
+    def not_modified(self, url: str) -> Optional[str]:
+        """
+        Register a 304 Not Modified answer and return the cached body.
+
+        Args:
+            url (str): The requested URL.
+
+        Returns:
+            Optional[str]: The cached body, None if the URL is not cached.
+        """
+        self.unchanged[url] = True
+        now = time.time()
+        self.connection.execute("UPDATE responses SET fetched_at = ? WHERE url = ?", (now, url))
+        return self.get_body(url)
+
+    def store(self, url: str, body: str, etag: Optional[str] = None, last_modified: Optional[str] = None) -> bool:
+        """
+        Store a fresh response body, keeping parsed products if the body hash did not change.
+
+        Args:
+            url (str): The requested URL.
+            body (str): The response body.
+            etag (Optional[str]): ETag header of the response.
+            last_modified (Optional[str]): Last-Modified header of the response.
+
+        Returns:
+            bool: True if the body differs from the cached one.
+        """
+        body_hash = hashlib.sha256(body.encode("utf-8")).hexdigest()
+        row = self.connection.execute("SELECT body_hash, size FROM responses WHERE url = ?", (url,)).fetchone()
+        changed = not row or row[0] != body_hash
+        self.unchanged[url] = not changed
+
+        blob = zlib.compress(body.encode("utf-8"))
+        now = time.time()
+        if changed:
+            self.connection.execute("""
+                INSERT OR REPLACE INTO responses
+                    (url, etag, last_modified, body_hash, body, size, products, fetched_at, accessed_at)
+                VALUES (?, ?, ?, ?, ?, ?, NULL, ?, ?)
+            """, (url, etag, last_modified, body_hash, blob, len(blob), now, now))
+            self.total_bytes += len(blob) - (row[1] if row else 0)
+        else:
+            self.connection.execute("""
+                UPDATE responses SET etag = ?, last_modified = ?, fetched_at = ?, accessed_at = ? WHERE url = ?
+            """, (etag, last_modified, now, now, url))
+        self.connection.commit()
+
+        if self.total_bytes > self.max_bytes * (1 + EVICT_SLACK):
+            self.evict()
+        return changed
+
+    def is_unchanged(self, url: str) -> bool:
+        """
+        Check whether the last fetch of a URL returned the same body as the cached one.
+
+        Args:
+            url (str): The requested URL.
+
+        Returns:
+            bool: True if the page did not change since it was cached.
+        """
+        return self.unchanged.get(url, False)
+
+    def get_products(self, url: str) -> Optional[List[Dict[str, str]]]:
+        """
+        Get the products parsed from the cached body of a URL.
+
+        Args:
+            url (str): The requested URL.
+
+        Returns:
+            Optional[List[Dict[str, str]]]: The products if they were stored, None otherwise.
+        """
+        row = self.connection.execute("SELECT products FROM responses WHERE url = ?", (url,)).fetchone()
+        if not row or row[0] is None:
+            return None
+        return json.loads(row[0])
+
+    def set_products(self, url: str, products: List[Dict[str, str]]) -> None:
+        """
+        Store the products parsed from the cached body of a URL.
+
+        Args:
+            url (str): The requested URL.
+            products (List[Dict[str, str]]): The parsed products.
+
+        Returns:
+            None
+        """
+        self.connection.execute("UPDATE responses SET products = ? WHERE url = ?",
+                                (json.dumps(products, ensure_ascii=False), url))
+        self.connection.commit()
+
+    def get_urls(self) -> List[str]:
+        """
+        Get the URLs of every cached response, the archive re-parsed without touching the network.
+
+        Returns:
+            List[str]: Cached URLs.
+        """
+        return [row[0] for row in self.connection.execute("SELECT url FROM responses")]
+
+    def evict(self) -> None:
+        """
+        Evict entries older than the TTL, then least recently used entries until the size limit is met.
+
+        Returns:
+            None
+        """
+        expired = self.connection.execute("DELETE FROM responses WHERE fetched_at < ?",
+                                          (time.time() - self.ttl,)).rowcount
+
+        total = self.connection.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        evicted = 0
+        if total > self.max_bytes:
+            rows = self.connection.execute("SELECT url, size FROM responses ORDER BY accessed_at").fetchall()
+            for url, size in rows:
+                if total <= self.max_bytes:
+                    break
+                self.connection.execute("DELETE FROM responses WHERE url = ?", (url,))
+                total -= size
+                evicted += 1
+        self.connection.commit()
+        self.total_bytes = total
+
+        if expired or evicted:
+            logging.info(f"Evicted {expired} expired and {evicted} least recently used cache entries")
+
+    def close(self) -> None:
+        self.evict()
+        self.connection.close()
@@ -0,0 +1,70 @@
+# Importing Necessary Libraries
+import os
+import sys
+import logging
+import importlib.util
+from contextlib import nullcontext
+from typing import Callable, ContextManager, Dict, Optional, Tuple
+
+# The tracing layer lives in the app, next to the scraper in the repository
+TRACING_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "app", "tracing.py")
+
+def load_tracing():
+    """
+    Import the app's tracing module, from the path or from its file in the repository.
+
+    The file is loaded on its own rather than adding app/ to the path, so the app's modules
+    cannot shadow the scraper's.
+
+    Returns:
+        Optional[module]: The tracing module, None when the scraper is deployed without the app.
+    """
+    try:
+        import tracing
+        return tracing
+    except ImportError:
+        pass
+    if not os.path.exists(TRACING_PATH):
+        return None
+    spec = importlib.util.spec_from_file_location("tracing", TRACING_PATH)
+    tracing = importlib.util.module_from_spec(spec)
+    sys.modules["tracing"] = tracing
+    spec.loader.exec_module(tracing)
+    return tracing
+
+tracing = load_tracing()
+if tracing is not None:
+    ENABLED, REGISTRY, inc, span, timed = tracing.ENABLED, tracing.REGISTRY, tracing.inc, tracing.span, tracing.timed
+else:
+    ENABLED = False
+
+    class NullRegistry:
+        """
+        Registry of the scraper deployed without the app, every metric is dropped.
+        """
+        def add_collector(self, name: str, collector: Callable[[], Dict[str, float]]) -> None:
+            pass
+
+        def inc(self, name: str, amount: float = 1) -> None:
+            pass
+
+        def flush(self) -> None:
+            pass
+
+        def snapshot(self) -> Tuple[Dict[str, float], Dict[str, Dict[str, float]]]:
+            return {}, {}
+
+    REGISTRY = NullRegistry()
+
+    def inc(name: str, amount: float = 1) -> None:
+        pass
+
+    def span(name: str) -> ContextManager[None]:
+        return nullcontext()
+
+    def timed(name: Optional[str] = None) -> Callable[[Callable], Callable]:
+        return lambda func: func
+
+    if os.environ.get("LAPTOPIO_METRICS", "0") not in ("", "0"):
+        logging.warning(f"LAPTOPIO_METRICS is set but {os.path.normpath(TRACING_PATH)} was not found, "
+                        f"scraper metrics are disabled")
@@ -0,0 +1,264 @@
+# Importing Necessary Libraries
+import html
+import re
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+from bs4 import BeautifulSoup
+from lxml import etree
+from lxml import html as lxml_html
+
+# Cheap <title> scan used instead of building a full tree for the CAPTCHA check
+TITLE_PATTERN = re.compile(r"<title[^>]*>(.*?)</title>", re.IGNORECASE | re.DOTALL)
+
+class ListingPage(NamedTuple):
+    """
+    Pagination links of a listing page, extracted by every parser backend.
+
+    Attributes:
+        next_href (Optional[str]): The href of the "next page" button.
+        page_hrefs (List[str]): The hrefs of all paginator links.
+    """
+    next_href: Optional[str]
+    page_hrefs: List[str]
+
+def is_captcha_page(text: str) -> bool:
+    """
+    Check whether the response is a "Robot Check" CAPTCHA page without parsing it.
+
+    Args:
+        text (str): The response body.
+
+    Returns:
+        bool: True if the page title is "Robot Check".
+    """
+    match = TITLE_PATTERN.search(text)
+    return bool(match) and html.unescape(match.group(1)) == "Robot Check"
+
+def parse_item_card(item: BeautifulSoup) -> Dict[str, str]:
+    """
+    Parse an individual item card to extract laptop information.
+
+    Args:
+        item (BeautifulSoup): The BeautifulSoup object representing the item card.
+
+    Returns:
+        Dict[str, str]: A dictionary containing the laptop information.
+    """
+    laptop_info: Dict[str, str] = {}
+
+    # Laptop ID
+    id_element = item.select_one("div.bx_catalog_item_scu_code")
+    if id_element:
+        idd = id_element.attrs.get("text")
+        laptop_info["laptop id"] = idd
+
+    # Brand and model of laptop
+    title_element = item.select_one("div.bx_catalog_item_title")
+    if title_element:
+        title = " ".join(title_element.select_one("a").attrs.get("title").split()[1:-1])
+        laptop_info["title"] = title
+
+    # Both old and current price for laptop
+    price_element = item.select_one("div.bx_catalog_item_price")
+    if price_element:
+        old_price_element = price_element.select_one(".old_price")
+        curr_price_element = price_element.select_one(".current_price")
+
+        if old_price_element and curr_price_element:
+            old_price = old_price_element.get_text(strip=True)
+            current_price = curr_price_element.get_text(strip=True)
+
+            laptop_info["old price"] = old_price
+            laptop_info["current price"] = current_price
+
+    # All technical information including GPU, CPU, RAM configurations
+    specs_element = item.select_one("div.bx_catalog_item_spec")
+    if specs_element:
+        specs = specs_element.select("div")
+        for spec in specs:
+            key_element = spec.select_one(".bx_catalog_item_prop")
+            value_element = spec.select_one(".bx_catalog_item_value")
+            if key_element and value_element:
+                key = key_element.get_text(strip=True)[:-1]
+                value = value_element.get_text(strip=True)
+                laptop_info[key] = value
+
+    # Link on the laptop image (for further purposes)
+    image_element = item.select_one('.item_image_container img')
+    if image_element and 'data-src' in image_element.attrs:
+        image_link = image_element['data-src']
+        laptop_info["image link"] = image_link
+
+    return laptop_info
+
+def parse_page_soup(text: str) -> Tuple[List[Dict[str, str]], ListingPage]:
+    """
+    Parse a listing page with BeautifulSoup CSS selection (reference backend).
+
+    Args:
+        text (str): The listing page HTML.
+
+    Returns:
+        Tuple[List[Dict[str, str]], ListingPage]: Parsed item cards and pagination links.
+    """
+    soup = BeautifulSoup(text, "lxml")
+    products = [parse_item_card(item) for item in soup.select("[data-id]")]
+
+    next_button = soup.select_one("li.bx-pag-next a")
+    page = ListingPage(next_button["href"] if next_button else None,
+                       [link["href"] for link in soup.select(".bx-pagination a[href]")])
+    return products, page
+
+def has_class(name: str) -> str:
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+# Compiled once per process, XPath equivalents of the CSS selectors in parse_item_card
+XPATH_CARDS = etree.XPath("//*[@data-id]")
+XPATH_ID = etree.XPath(f".//div[{has_class('bx_catalog_item_scu_code')}]")
+XPATH_TITLE = etree.XPath(f".//div[{has_class('bx_catalog_item_title')}]")
+XPATH_LINK = etree.XPath(".//a")
+XPATH_PRICE = etree.XPath(f".//div[{has_class('bx_catalog_item_price')}]")
+XPATH_OLD_PRICE = etree.XPath(f".//*[{has_class('old_price')}]")
+XPATH_CURRENT_PRICE = etree.XPath(f".//*[{has_class('current_price')}]")
+XPATH_SPECS = etree.XPath(f".//div[{has_class('bx_catalog_item_spec')}]")
+XPATH_DIVS = etree.XPath(".//div")
+XPATH_PROP = etree.XPath(f".//*[{has_class('bx_catalog_item_prop')}]")
+XPATH_VALUE = etree.XPath(f".//*[{has_class('bx_catalog_item_value')}]")
+XPATH_IMAGE = etree.XPath(f".//*[{has_class('item_image_container')}]//img")
+XPATH_NEXT = etree.XPath(f"//li[{has_class('bx-pag-next')}]//a")
+XPATH_PAGINATOR = etree.XPath(f"//*[{has_class('bx-pagination')}]//a[@href]")
+XPATH_TEXT = etree.XPath(".//text()")
+
+def get_text(element) -> str:
+    # Same as BeautifulSoup's get_text(strip=True)
+    return "".join(text.strip() for text in XPATH_TEXT(element) if text.strip())
+
+def first(elements: list):
+    return elements[0] if elements else None
+
+def parse_item_card_lxml(item) -> Dict[str, str]:
+    """
+    Parse an individual item card with compiled XPath, giving the same dictionary as parse_item_card.
+
+    Args:
+        item (lxml.html.HtmlElement): The element representing the item card.
+
+    Returns:
+        Dict[str, str]: A dictionary containing the laptop information.
+    """
+    laptop_info: Dict[str, str] = {}
+
+    # Laptop ID
+    id_element = first(XPATH_ID(item))
+    if id_element is not None:
+        laptop_info["laptop id"] = id_element.get("text")
+
+    # Brand and model of laptop
+    title_element = first(XPATH_TITLE(item))
+    if title_element is not None:
+        laptop_info["title"] = " ".join(first(XPATH_LINK(title_element)).get("title").split()[1:-1])
+
+    # Both old and current price for laptop
+    price_element = first(XPATH_PRICE(item))
+    if price_element is not None:
+        old_price_element = first(XPATH_OLD_PRICE(price_element))
+        curr_price_element = first(XPATH_CURRENT_PRICE(price_element))
+
+        if old_price_element is not None and curr_price_element is not None:
+            laptop_info["old price"] = get_text(old_price_element)
+            laptop_info["current price"] = get_text(curr_price_element)
+
+    # All technical information including GPU, CPU, RAM configurations
+    specs_element = first(XPATH_SPECS(item))
+    if specs_element is not None:
+        for spec in XPATH_DIVS(specs_element):
+            key_element = first(XPATH_PROP(spec))
+            value_element = first(XPATH_VALUE(spec))
+            if key_element is not None and value_element is not None:
+                laptop_info[get_text(key_element)[:-1]] = get_text(value_element)
+
+    # Link on the laptop image (for further purposes)
+    image_element = first(XPATH_IMAGE(item))
+    if image_element is not None and image_element.get("data-src") is not None:
+        laptop_info["image link"] = image_element.get("data-src")
+
+    return laptop_info
+
+def parse_page_lxml(text: str) -> Tuple[List[Dict[str, str]], ListingPage]:
+    """
+    Parse a listing page with compiled XPath over an lxml tree.
+
+    Args:
+        text (str): The listing page HTML.
+
+    Returns:
+        Tuple[List[Dict[str, str]], ListingPage]: Parsed item cards and pagination links.
+    """
+    root = lxml_html.document_fromstring(text)
+    products = [parse_item_card_lxml(item) for item in XPATH_CARDS(root)]
+
+    next_button = first(XPATH_NEXT(root))
+    page = ListingPage(next_button.get("href") if next_button is not None else None,
+                       [link.get("href") for link in XPATH_PAGINATOR(root)])
+    return products, page
+
+class CardPageParser:
+    """
+    Listing page parser of another shop, built from a card parser following the parse_item_card contract.
+
+    The card parser receives the BeautifulSoup element of one item card and returns a dictionary
+    of its fields, with "laptop id", "title" and "current price" named as for shop.kz. Instances
+    are picklable as long as the card parser is a module-level function, so they also run in the
+    parser process pool (register them at import time, before the pool is started).
+
+    Args:
+        parse_card (Callable[[BeautifulSoup], Dict[str, str]]): Parser of one item card.
+        card_selector (str): CSS selector of the item cards.
+        next_selector (str): CSS selector of the "next page" link.
+        paginator_selector (str): CSS selector of the paginator links.
+    """
+    def __init__(self, parse_card: Callable[[BeautifulSoup], Dict[str, str]], card_selector: str = "[data-id]",
+                 next_selector: str = "li.bx-pag-next a", paginator_selector: str = ".bx-pagination a[href]") -> None:
+        self.parse_card = parse_card
+        self.card_selector = card_selector
+        self.next_selector = next_selector
+        self.paginator_selector = paginator_selector
+
+    def __call__(self, text: str) -> Tuple[List[Dict[str, str]], ListingPage]:
+        soup = BeautifulSoup(text, "lxml")
+        products = [self.parse_card(item) for item in soup.select(self.card_selector)]
+
+        next_button = soup.select_one(self.next_selector)
+        page = ListingPage(next_button.get("href") if next_button else None,
+                           [link["href"] for link in soup.select(self.paginator_selector) if link.get("href")])
+        return products, page
+
+PARSERS: Dict[str, Callable[[str], Tuple[List[Dict[str, str]], ListingPage]]] = {
+    "bs4": parse_page_soup,
+    "lxml": parse_page_lxml,
+}
+
+def register_parser(name: str, parser: Callable[[str], Tuple[List[Dict[str, str]], ListingPage]]) -> None:
+    """
+    Register the listing page parser of a site, e.g. `register_parser("competitor", CardPageParser(parse_card))`.
+
+    Args:
+        name (str): Backend name used in crawler.SITES.
+        parser (Callable[[str], Tuple[List[Dict[str, str]], ListingPage]]): Page parser.
+
+    Returns:
+        None
+    """
+    PARSERS[name] = parser
+
+def parse_page(text: str, backend: str = "bs4") -> Tuple[List[Dict[str, str]], ListingPage]:
+    """
+    Parse a listing page with the chosen backend. Module-level so it can run in a process pool.
+
+    Args:
+        text (str): The listing page HTML.
+        backend (str): One of "bs4", "lxml" or a backend added by register_parser.
+
+    Returns:
+        Tuple[List[Dict[str, str]], ListingPage]: Parsed item cards and pagination links.
+    """
+    return PARSERS[backend](text)
@@ -0,0 +1,385 @@
+# Importing Necessary Libraries
+import argparse
+import asyncio
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+import pandas as pd
+from aiohttp import ClientSession
+from cleaning import run_pipeline
+from http_cache import ResponseCache
+from parsers import PARSERS, parse_page
+from scraper import (CLIENT_TIMEOUT, CUSTOM_HEADERS, TokenBucket, build_page_url, get_page_number, get_page_urls,
+                     request_with_retries)
+from sinks import ProductSink, SINKS, get_sink
+from metrics import REGISTRY
+
+# Archive of fetched pages re-parsed by --from-archive, kept apart from the evicting cache of scraper.py
+ARCHIVE_PATH = ".cache/archive.sqlite"
+
+# Paths of the cleaned datasets, the same as the defaults of cleaning.py
+CLEANED_OUTPUTS = {
+    "cleansed": "data/laptops_cleansed.csv",
+    "app": "../app/data/laptops_data.csv",
+    "images": "data/laptop_images.csv",
+}
+
+class Stage:
+    """
+    One stage of the pipeline: worker coroutines taking items from a bounded input queue.
+
+    A full queue blocks the stage feeding it, so pages cannot pile up in memory when a later
+    stage falls behind (backpressure).
+
+    Args:
+        name (str): Stage name used in logs and metrics.
+        workers (int): Number of worker coroutines.
+        handle (Callable[[Any], Awaitable[None]]): Processes one item.
+        queue_size (int): Capacity of the input queue.
+    """
+    def __init__(self, name: str, workers: int, handle: Callable[[Any], Awaitable[None]], queue_size: int) -> None:
+        self.name = name
+        self.workers = workers
+        self.handle = handle
+        self.queue: asyncio.Queue = asyncio.Queue(queue_size)
+        self.processed = 0
+        self.failed = 0
+        self.busy = 0.0
+        self.max_depth = 0
+
+    async def put(self, item: Any) -> None:
+        await self.queue.put(item)
+        self.max_depth = max(self.max_depth, self.queue.qsize())
+
+    async def work(self) -> None:
+        while True:
+            item = await self.queue.get()
+            if item is None:  # End of the stream
+                return
+            start = time.perf_counter()
+            try:
+                await self.handle(item)
+            except Exception as error:
+                self.failed += 1
+                logging.error(f"Stage {self.name} failed on an item: {error!r}")
+            self.busy += time.perf_counter() - start
+            self.processed += 1
+
+    async def run(self) -> None:
+        await asyncio.gather(*(self.work() for _ in range(self.workers)))
+
+    async def close(self) -> None:
+        # One end-of-stream marker per worker, queued after every item
+        for _ in range(self.workers):
+            await self.queue.put(None)
+
+    def get_stats(self) -> Dict[str, float]:
+        # Busy time includes waiting on the next stage's full queue, a stage that is never blocked is the bottleneck
+        return {"workers": self.workers, "queue_depth": self.queue.qsize(), "max_queue_depth": self.max_depth,
+                "processed": self.processed, "failed": self.failed, "busy_seconds": round(self.busy, 3)}
+
+def infer_types(raw: pd.DataFrame) -> pd.DataFrame:
+    # Numeric columns are converted the way pd.read_csv infers them, so cleaning sees the same dtypes
+    raw = raw.mask(raw == "")
+    for column in raw.columns:
+        numbers = pd.to_numeric(raw[column], errors="coerce")
+        if numbers.notna().sum() == raw[column].notna().sum():
+            raw[column] = numbers
+    return raw
+
+class Pipeline:
+    """
+    Staged scraping pipeline: fetch → parse → batch → sink, then cleaning.
+
+    Pages are fetched on the event loop, parsed in a process pool and released in page order
+    by the batch stage, which turns them into columnar batches. Cleaning is not streamed:
+    missing values are imputed with modes of the whole dataset, so the vectorized cleaning of
+    cleaning.py runs once over all batches when the stream ends. The sink stage writes the
+    scraped products page by page and the cleaned datasets at the end. Stages are connected by
+    bounded queues, and their worker counts, queue depths and failed items are exported to the
+    metrics registry and logged while running.
+
+    Args:
+        sink (ProductSink): Writer of the scraped products.
+        outputs (Optional[Dict[str, str]]): Paths of the "cleansed", "app" and "images" datasets, not cleaned if empty.
+        parse_workers (int): Processes parsing pages, 0 parses on the event loop.
+        backend (str): Parser backend of listing pages.
+        batch_size (int): Products per columnar batch of the batch stage.
+        queue_size (int): Capacity of the queue in front of every stage.
+        report_interval (float): Seconds between two progress lines in the log.
+    """
+    def __init__(self, sink: ProductSink, outputs: Optional[Dict[str, str]] = None, parse_workers: int = 0,
+                 backend: str = "bs4", batch_size: int = 1000, queue_size: int = 16,
+                 report_interval: float = 10) -> None:
+        self.sink = sink
+        self.outputs = CLEANED_OUTPUTS if outputs is None else outputs
+        self.backend = backend
+        self.batch_size = batch_size
+        self.queue_size = queue_size
+        self.report_interval = report_interval
+        self.executor = ProcessPoolExecutor(max_workers=parse_workers) if parse_workers > 0 else None
+
+        self.parse = Stage("parse", max(parse_workers, 1), self.parse_page, queue_size)
+        self.batcher = Stage("batch", 1, self.batch_page, queue_size)
+        self.write = Stage("sink", 1, self.write_item, queue_size)
+        self.stages: List[Stage] = []
+
+        # Pages parsed out of order wait in the batch stage until every previous page arrived
+        self.pending: Dict[int, List[Dict[str, str]]] = {}
+        self.next_page = 1
+        self.batch: List[Dict[str, str]] = []
+        self.frames: List[pd.DataFrame] = []
+
+    async def parse_page(self, item: Tuple[int, str]) -> None:
+        page, body = item
+        try:
+            if self.executor:
+                loop = asyncio.get_running_loop()
+                products, _ = await loop.run_in_executor(self.executor, parse_page, body, self.backend)
+            else:
+                products, _ = parse_page(body, self.backend)
+        except Exception as error:
+            # An empty page keeps the following pages flowing through the batch stage
+            self.parse.failed += 1
+            logging.error(f"Page {page} could not be parsed: {error!r}")
+            products = []
+        await self.batcher.put((page, [product for product in products if product]))
+
+    async def batch_page(self, item: Tuple[int, List[Dict[str, str]]]) -> None:
+        page, products = item
+        self.pending[page] = products
+        while self.next_page in self.pending:
+            products = self.pending.pop(self.next_page)
+            await self.write.put(("page", self.next_page, products))
+            self.next_page += 1
+
+            self.batch.extend(products)
+            if len(self.batch) >= self.batch_size:
+                self.frames.append(pd.DataFrame(self.batch, dtype=object))
+                self.batch = []
+
+    async def flush_pending(self) -> None:
+        # Pages after a page lost by a failed stage are written in order anyway
+        for page in sorted(self.pending):
+            products = self.pending.pop(page)
+            await self.write.put(("page", page, products))
+            self.batch.extend(products)
+
+    def finish_cleaning(self) -> Optional[Dict[str, pd.DataFrame]]:
+        """
+        Impute and clean every batch at once with the vectorized steps of cleaning.py.
+
+        Returns:
+            Optional[Dict[str, pd.DataFrame]]: "cleansed", "app" and "images" datasets, None if nothing was scraped.
+        """
+        if self.batch:
+            self.frames.append(pd.DataFrame(self.batch, dtype=object))
+            self.batch = []
+        if not self.outputs or not self.frames:
+            return None
+        try:
+            return run_pipeline(infer_types(pd.concat(self.frames, ignore_index=True)))
+        except (KeyError, IndexError) as error:
+            # Too few laptops to impute from (e.g. a column never scraped), the scraped products are still saved
+            logging.error(f"Datasets could not be cleaned: {error!r}")
+            return None
+
+    async def write_item(self, item: Tuple) -> None:
+        if item[0] == "page":
+            _, page, products = item
+            self.sink.write_page(page, products)
+        else:
+            for key, dataset in item[1].items():
+                dataset.to_csv(self.outputs[key], index=False)
+                logging.info(f"Dataset was saved with dirname: {self.outputs[key]}")
+
+    def get_metrics(self) -> Dict[str, float]:
+        return {f"{stage.name}_{key}": value for stage in self.stages for key, value in stage.get_stats().items()}
+
+    async def report(self) -> None:
+        while True:
+            await asyncio.sleep(self.report_interval)
+            logging.info("Pipeline: " + ", ".join(
+                f"{stage.name} {stage.processed} done, {stage.queue.qsize()} queued" for stage in self.stages))
+
+    async def run(self, source: Stage, items: List[Tuple[int, str]]) -> Dict[str, Dict[str, float]]:
+        """
+        Stream items through the source stage and every following stage until all are written.
+
+        Args:
+            source (Stage): First stage, fetching pages from the network or the archive.
+            items (List[Tuple[int, str]]): Page numbers and URLs fed to the source stage.
+
+        Returns:
+            Dict[str, Dict[str, float]]: Final statistics by stage name.
+        """
+        self.stages = [source, self.parse, self.batcher, self.write]
+        REGISTRY.add_collector("pipeline", self.get_metrics)
+        tasks = [asyncio.ensure_future(stage.run()) for stage in self.stages]
+        reporter = asyncio.ensure_future(self.report())
+        try:
+            for item in items:
+                await source.put(item)
+
+            # Each stage is drained before the next one is told the stream ended
+            for stage, task in zip(self.stages[:-1], tasks):
+                await stage.close()
+                await task
+            await self.flush_pending()
+            datasets = self.finish_cleaning()
+            if datasets:
+                await self.write.put(("datasets", datasets))
+            await self.write.close()
+            await tasks[-1]
+        finally:
+            reporter.cancel()
+            for task in tasks:
+                task.cancel()
+            if self.executor:
+                self.executor.shutdown()
+
+        self.sink.finalize()
+        stats = {stage.name: stage.get_stats() for stage in self.stages}
+        for name, stage_stats in stats.items():
+            logging.info(f"Stage {name}: {stage_stats}")
+            if stage_stats["failed"]:
+                logging.warning(f"Stage {name} lost {stage_stats['failed']} items, see the errors above")
+        return stats
+
+    async def crawl(self, url: str, max_pages: int = 100, concurrency: int = 4, rate: float = 0.5,
+                    cache: Optional[ResponseCache] = None) -> Dict[str, Dict[str, float]]:
+        """
+        Fetch the listing pages of a category from the network and stream them through the pipeline.
+
+        Args:
+            url (str): The starting URL for scraping.
+            max_pages (int): Number of pages needed to parse.
+            concurrency (int): Workers of the fetch stage.
+            rate (float): Maximum number of requests per second sent to the host.
+            cache (Optional[ResponseCache]): The archive of fetched pages (see open_archive).
+
+        Returns:
+            Dict[str, Dict[str, float]]: Final statistics by stage name.
+        """
+        bucket = TokenBucket(rate, capacity=concurrency)
+        async with ClientSession(timeout=CLIENT_TIMEOUT) as session:
+            async def fetch_page(item: Tuple[int, str]) -> None:
+                page, page_url = item
+                await bucket.acquire()
+                body = await request_with_retries(page_url, CUSTOM_HEADERS, session, cache=cache)
+                if body is None:
+                    fetch.failed += 1
+                    logging.error(f"Page {page} could not be retrieved")
+                    await self.batcher.put((page, []))
+                else:
+                    await self.parse.put((page, body))
+
+            # The paginator of the first page gives every page URL up front
+            await bucket.acquire()
+            body = await request_with_retries(url, CUSTOM_HEADERS, session, cache=cache)
+            if body is None:
+                raise RuntimeError("First page could not be retrieved")
+            _, links = parse_page(body, self.backend)
+            page_urls = get_page_urls(links, url, max_pages)
+            logging.info(f"Found {len(page_urls)} pages to parse")
+
+            fetch = Stage("fetch", concurrency, fetch_page, self.queue_size)
+            await self.parse.put((1, body))
+            return await self.run(fetch, list(enumerate(page_urls[1:], start=2)))
+
+    async def reparse(self, cache: ResponseCache, url: Optional[str] = None,
+                      max_pages: Optional[int] = None) -> Dict[str, Dict[str, float]]:
+        """
+        Rebuild the datasets from the pages stored in the response cache without touching the network.
+
+        Args:
+            cache (ResponseCache): The archive of fetched pages (see open_archive).
+            url (Optional[str]): Any listing URL of the category to re-parse, every archived page by default.
+            max_pages (Optional[int]): Maximum number of pages re-parsed.
+
+        Returns:
+            Dict[str, Dict[str, float]]: Final statistics by stage name.
+        """
+        page_urls = get_archived_pages(cache, url)[:max_pages]
+        logging.info(f"Found {len(page_urls)} archived pages to parse")
+
+        async def read_page(item: Tuple[int, str]) -> None:
+            page, page_url = item
+            body = cache.get_body(page_url)
+            if body is None:
+                read.failed += 1
+                logging.error(f"Page {page} is missing from the archive")
+                await self.batcher.put((page, []))
+            else:
+                await self.parse.put((page, body))
+
+        read = Stage("archive", 1, read_page, self.queue_size)
+        return await self.run(read, list(enumerate(page_urls, start=1)))
+
+def open_archive(path: str = ARCHIVE_PATH) -> ResponseCache:
+    """
+    Open the archive of fetched pages, a response cache that never evicts.
+
+    Entries of a regular ResponseCache expire after its TTL and are evicted above its size
+    limit whenever it is opened, which would silently drop pages from a later re-parse.
+
+    Args:
+        path (str): Path to the SQLite database file.
+
+    Returns:
+        ResponseCache: The archive.
+    """
+    return ResponseCache(path, ttl=float("inf"), max_bytes=float("inf"))
+
+def get_archived_pages(cache: ResponseCache, url: Optional[str] = None) -> List[str]:
+    """
+    List the archived listing pages ordered by category and page number.
+
+    Args:
+        cache (ResponseCache): The archive of fetched pages.
+        url (Optional[str]): Any listing URL of the category to keep, every category by default.
+
+    Returns:
+        List[str]: Archived page URLs.
+    """
+    urls = cache.get_urls()
+    if url:
+        urls = [page_url for page_url in urls if build_page_url(page_url, 1) == build_page_url(url, 1)]
+    return sorted(urls, key=lambda page_url: (build_page_url(page_url, 1), get_page_number(page_url)))
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Scrape, parse and clean laptop listings in a staged pipeline")
+    parser.add_argument("--url", default="https://shop.kz/offers/noutbuki/", help="Starting listing URL")
+    parser.add_argument("--from-archive", action="store_true",
+                        help="Re-parse the pages stored in the response cache instead of fetching them")
+    parser.add_argument("--all-categories", action="store_true", help="Re-parse the archived pages of every URL")
+    parser.add_argument("--archive", default=ARCHIVE_PATH, help="Path of the archive of fetched pages, never evicted")
+    parser.add_argument("--max-pages", type=int, default=100, help="Number of pages needed to parse")
+    parser.add_argument("--concurrency", type=int, default=4, help="Workers of the fetch stage")
+    parser.add_argument("--rate", type=float, default=0.5, help="Maximum requests per second to the host")
+    parser.add_argument("--parse-workers", type=int, default=os.cpu_count() or 1,
+                        help="Processes of the parse stage, 0 parses on the event loop")
+    parser.add_argument("--parser", choices=sorted(PARSERS), default="bs4", help="Parser backend of listing pages")
+    parser.add_argument("--sink", choices=sorted(SINKS), default="csv", help="Format of the scraped products file")
+    parser.add_argument("--no-clean", action="store_true", help="Only save the scraped products")
+    return parser.parse_args()
+
+async def main() -> None:
+    args = parse_args()
+    pipeline = Pipeline(get_sink(args.sink), {} if args.no_clean else None, args.parse_workers, args.parser)
+
+    start_time = time.time()
+    archive = open_archive(args.archive)
+    try:
+        if args.from_archive:
+            await pipeline.reparse(archive, None if args.all_categories else args.url, args.max_pages)
+        else:
+            await pipeline.crawl(args.url, args.max_pages, args.concurrency, args.rate, archive)
+    finally:
+        archive.close()
+    logging.info(f"Total time taken: {round(time.time() - start_time, 2)} seconds")
+
+if __name__ == "__main__":
+    asyncio.run(main())
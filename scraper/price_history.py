@@ -0,0 +1,317 @@
+# Importing Necessary Libraries
+import argparse
+import logging
+import os
+import sqlite3
+import time
+from typing import Dict, List, NamedTuple, Optional, Tuple
+import pandas as pd
+from cleaning import parse_price
+
+# Default location of the price history database
+HISTORY_PATH = "data/price_history.sqlite"
+
+# Pseudo-field recording listing events: "1" when a laptop appears, "0" when it is delisted
+LISTED = "__listed"
+
+PRICE_FIELD = "current price"
+
+class RunSummary(NamedTuple):
+    """
+    Outcome of recording one scraper run.
+
+    Attributes:
+        run_id (int): Id of the run.
+        added (int): Laptops listed for the first time or listed again.
+        delisted (int): Laptops missing from the run.
+        changes (int): Changed fields written, listing events included.
+    """
+    run_id: int
+    added: int
+    delisted: int
+    changes: int
+
+def read_products(path: str) -> pd.DataFrame:
+    """
+    Read a catalogue saved by the scraper or one of its sinks as strings.
+
+    Args:
+        path (str): laptops.csv, laptops.jsonl or laptops.parquet.
+
+    Returns:
+        pd.DataFrame: Scraped products.
+    """
+    if path.endswith(".jsonl"):
+        return pd.read_json(path, lines=True, dtype=False).astype(object)
+    if path.endswith(".parquet"):
+        return pd.read_parquet(path)
+    return pd.read_csv(path, dtype=str)
+
+def to_long(products: pd.DataFrame, key: str = "laptop id") -> pd.DataFrame:
+    # One (laptop_id, field, value) row per non-empty field of every laptop
+    products = products.drop_duplicates(key).set_index(key)
+    products.index = products.index.astype(str).rename("laptop_id")
+    long = products.astype(object).stack().rename("value").reset_index()
+    long.columns = ["laptop_id", "field", "value"]
+    long["value"] = long["value"].astype(str)
+    return long
+
+class PriceHistory:
+    """
+    Append-only history of scraped laptops stored in SQLite with delta encoding.
+
+    A run only writes the fields that changed since the previous run (price, discount,
+    specs...), and a listing event when a laptop appears or is delisted, so storage grows
+    with the number of changes instead of runs times catalogue size. The latest value of
+    every field is kept in a separate table the next run is diffed against.
+
+    Args:
+        path (str): Path to the SQLite database file.
+    """
+    def __init__(self, path: str = HISTORY_PATH) -> None:
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.connection = sqlite3.connect(path)
+        self.connection.executescript("""
+            CREATE TABLE IF NOT EXISTS runs (
+                run_id INTEGER PRIMARY KEY,
+                started_at REAL NOT NULL,
+                source TEXT,
+                laptops INTEGER NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS changes (
+                laptop_id TEXT NOT NULL,
+                field TEXT NOT NULL,
+                run_id INTEGER NOT NULL,
+                value TEXT,
+                PRIMARY KEY (laptop_id, field, run_id)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS changes_run ON changes (run_id, field);
+            CREATE TABLE IF NOT EXISTS latest (
+                laptop_id TEXT NOT NULL,
+                field TEXT NOT NULL,
+                value TEXT NOT NULL,
+                PRIMARY KEY (laptop_id, field)
+            ) WITHOUT ROWID;
+        """)
+        self.connection.commit()
+
+    def close(self) -> None:
+        self.connection.close()
+
+    def get_latest(self) -> pd.DataFrame:
+        return pd.read_sql_query("SELECT laptop_id, field, value FROM latest", self.connection)
+
+    def record_run(self, products: pd.DataFrame, started_at: Optional[float] = None,
+                   source: Optional[str] = None) -> RunSummary:
+        """
+        Diff a scraped catalogue against the latest state and append the changed fields.
+
+        Args:
+            products (pd.DataFrame): Catalogue of the run, one row per laptop with a "laptop id" column.
+            started_at (Optional[float]): Unix time of the run, now by default.
+            source (Optional[str]): File the catalogue was read from.
+
+        Returns:
+            RunSummary: Run id and counts of the written changes.
+        """
+        current = to_long(products)
+        latest = self.get_latest()
+        merged = latest.merge(current, on=["laptop_id", "field"], how="outer", suffixes=("_old", ""))
+
+        listed_before = set(latest.loc[(latest["field"] == LISTED) & (latest["value"] == "1"), "laptop_id"])
+        listed_now = set(current["laptop_id"])
+        merged = merged[merged["field"] != LISTED]
+
+        # Fields of delisted laptops keep their last value, the delisting is the only change
+        merged = merged[merged["laptop_id"].isin(listed_now)]
+        changed = merged[merged["value_old"].fillna("\0") != merged["value"].fillna("\0")]
+
+        added = sorted(listed_now - listed_before)
+        delisted = sorted(listed_before - listed_now)
+        events = pd.DataFrame({"laptop_id": added + delisted, "field": LISTED,
+                               "value": ["1"] * len(added) + ["0"] * len(delisted)})
+        deltas = pd.concat([changed[["laptop_id", "field", "value"]], events], ignore_index=True)
+        deltas = deltas.astype(object).where(deltas.notna(), None)
+
+        with self.connection:
+            cursor = self.connection.execute("INSERT INTO runs (started_at, source, laptops) VALUES (?, ?, ?)",
+                                             (started_at or time.time(), source, len(listed_now)))
+            run_id = cursor.lastrowid
+            rows = list(deltas[["laptop_id", "field", "value"]].itertuples(index=False, name=None))
+            self.connection.executemany("INSERT INTO changes VALUES (?, ?, ?, ?)",
+                                        [(laptop_id, field, run_id, value) for laptop_id, field, value in rows])
+            self.connection.executemany("DELETE FROM latest WHERE laptop_id = ? AND field = ?",
+                                        [(laptop_id, field) for laptop_id, field, value in rows if value is None])
+            self.connection.executemany("INSERT OR REPLACE INTO latest VALUES (?, ?, ?)",
+                                        [row for row in rows if row[2] is not None])
+
+        summary = RunSummary(run_id, len(added), len(delisted), len(deltas))
+        logging.info(f"Run {run_id} recorded: {summary.added} listed, {summary.delisted} delisted, "
+                     f"{summary.changes} changed fields")
+        return summary
+
+    def get_runs(self) -> pd.DataFrame:
+        return pd.read_sql_query("SELECT run_id, started_at, source, laptops FROM runs ORDER BY run_id", self.connection)
+
+    def get_last_run(self) -> Optional[int]:
+        return self.connection.execute("SELECT MAX(run_id) FROM runs").fetchone()[0]
+
+    def get_series(self, laptop_id: str, field: str = PRICE_FIELD) -> pd.DataFrame:
+        """
+        Time series of one field of a laptop: its value from every run it changed in.
+
+        Args:
+            laptop_id (str): Laptop id from the scraped catalogue.
+            field (str): Scraped field, e.g. "current price" or "old price".
+
+        Returns:
+            pd.DataFrame: run_id, started_at (datetime), value and, for prices, the parsed price.
+        """
+        series = pd.read_sql_query("""
+            SELECT changes.run_id, runs.started_at, changes.value
+            FROM changes JOIN runs ON runs.run_id = changes.run_id
+            WHERE changes.laptop_id = ? AND changes.field = ?
+            ORDER BY changes.run_id
+        """, self.connection, params=(str(laptop_id), field))
+        series["started_at"] = pd.to_datetime(series["started_at"], unit="s")
+        if "price" in field:
+            series["price"] = parse_price(series["value"].astype(object).where(series["value"].notna(), None))
+        return series
+
+    def get_snapshot(self, run_id: Optional[int] = None) -> pd.DataFrame:
+        """
+        Rebuild the catalogue as listed by a run.
+
+        Args:
+            run_id (Optional[int]): Run to rebuild, the last run by default.
+
+        Returns:
+            pd.DataFrame: One row per laptop listed in the run, one column per field.
+        """
+        run_id = run_id or self.get_last_run()
+        values = pd.read_sql_query("""
+            SELECT changes.laptop_id, changes.field, changes.value
+            FROM changes JOIN (
+                SELECT laptop_id, field, MAX(run_id) AS run_id FROM changes
+                WHERE run_id <= ? GROUP BY laptop_id, field
+            ) AS last USING (laptop_id, field, run_id)
+        """, self.connection, params=(run_id,))
+        snapshot = values.pivot(index="laptop_id", columns="field", values="value")
+        if LISTED not in snapshot:
+            return snapshot.iloc[0:0]
+        snapshot = snapshot[snapshot[LISTED] == "1"].drop(columns=LISTED)
+        return snapshot.dropna(axis=1, how="all").rename_axis("laptop id").reset_index()
+
+    def get_price_changes(self, run_id: Optional[int] = None, field: str = PRICE_FIELD) -> pd.DataFrame:
+        """
+        Price changes of a run against the previous known price of each laptop, biggest drops first.
+
+        Args:
+            run_id (Optional[int]): Run to inspect, the last run by default.
+            field (str): Price field.
+
+        Returns:
+            pd.DataFrame: laptop_id, previous and new price, change and change_percent.
+        """
+        run_id = run_id or self.get_last_run()
+        changes = pd.read_sql_query("""
+            SELECT new.laptop_id, new.value AS new_value, (
+                SELECT old.value FROM changes AS old
+                WHERE old.laptop_id = new.laptop_id AND old.field = new.field AND old.run_id < new.run_id
+                ORDER BY old.run_id DESC LIMIT 1
+            ) AS previous_value
+            FROM changes AS new
+            WHERE new.run_id = ? AND new.field = ?
+        """, self.connection, params=(run_id, field))
+
+        changes["previous_price"] = parse_price(changes["previous_value"].astype(object))
+        changes["new_price"] = parse_price(changes["new_value"].astype(object))
+        changes = changes.dropna(subset=["previous_price", "new_price"])
+        changes["change"] = changes["new_price"] - changes["previous_price"]
+        changes["change_percent"] = (changes["change"] / changes["previous_price"] * 100).round(2)
+        return changes.drop(columns=["previous_value", "new_value"]).sort_values("change_percent",
+                                                                                 ignore_index=True)
+
+    def get_listing_changes(self, run_id: Optional[int] = None) -> Tuple[List[str], List[str]]:
+        """
+        Laptops listed and delisted by a run.
+
+        Args:
+            run_id (Optional[int]): Run to inspect, the last run by default.
+
+        Returns:
+            Tuple[List[str], List[str]]: New (or listed again) and delisted laptop ids.
+        """
+        run_id = run_id or self.get_last_run()
+        rows = self.connection.execute("SELECT laptop_id, value FROM changes WHERE run_id = ? AND field = ?",
+                                       (run_id, LISTED)).fetchall()
+        return [laptop_id for laptop_id, value in rows if value == "1"], \
+               [laptop_id for laptop_id, value in rows if value == "0"]
+
+    def get_size(self) -> Dict[str, int]:
+        counts = {table: self.connection.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+                  for table in ("runs", "changes", "latest")}
+        return counts
+
+def record_file(path: str, history_path: str = HISTORY_PATH) -> RunSummary:
+    """
+    Record a catalogue file saved by the scraper as a new run.
+
+    Args:
+        path (str): laptops.csv, laptops.jsonl or laptops.parquet.
+        history_path (str): Path to the SQLite database file.
+
+    Returns:
+        RunSummary: Run id and counts of the written changes.
+    """
+    history = PriceHistory(history_path)
+    try:
+        return history.record_run(read_products(path), os.path.getmtime(path), path)
+    finally:
+        history.close()
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Record scraper runs and query the price history")
+    parser.add_argument("--db", default=HISTORY_PATH, help="Path to the history database")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    record = commands.add_parser("record", help="Record a saved catalogue as a new run")
+    record.add_argument("path", help="laptops.csv, laptops.jsonl or laptops.parquet")
+
+    series = commands.add_parser("series", help="Price time series of a laptop")
+    series.add_argument("laptop_id")
+    series.add_argument("--field", default=PRICE_FIELD)
+
+    drops = commands.add_parser("drops", help="Biggest price drops of a run")
+    drops.add_argument("--run", type=int, default=None)
+    drops.add_argument("--limit", type=int, default=20)
+
+    listing = commands.add_parser("listing", help="New and delisted laptops of a run")
+    listing.add_argument("--run", type=int, default=None)
+    return parser.parse_args()
+
+def main() -> None:
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    args = parse_args()
+    if args.command == "record":
+        record_file(args.path, args.db)
+        return
+
+    history = PriceHistory(args.db)
+    try:
+        if args.command == "series":
+            print(history.get_series(args.laptop_id, args.field).to_string(index=False))
+        elif args.command == "drops":
+            print(history.get_price_changes(args.run).head(args.limit).to_string(index=False))
+        else:
+            new, delisted = history.get_listing_changes(args.run)
+            print(f"New ({len(new)}): {', '.join(new)}")
+            print(f"Delisted ({len(delisted)}): {', '.join(delisted)}")
+    finally:
+        history.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,201 @@
+# Importing Necessary Libraries
+import asyncio
+import logging
+import random
+import time
+from collections import deque
+from email.utils import parsedate_to_datetime
+from typing import Deque, Dict, NamedTuple, Optional, Tuple
+
+class RetryPolicy(NamedTuple):
+    """
+    Backoff of one kind of failure.
+
+    Attributes:
+        base_delay (float): Delay of the first retry, doubled on every further attempt.
+        max_delay (float): Upper bound of a single delay.
+        max_attempts (int): Retries allowed for this kind of failure within one request.
+    """
+    base_delay: float
+    max_delay: float
+    max_attempts: int
+
+# Failure kinds: "throttled" (429, 503), "server" (other 5xx), "network" (connection errors, timeouts),
+# "captcha" (a "Robot Check" page answered with 200)
+RETRY_POLICIES: Dict[str, RetryPolicy] = {
+    "throttled": RetryPolicy(base_delay=5, max_delay=120, max_attempts=5),
+    "server": RetryPolicy(base_delay=1, max_delay=30, max_attempts=4),
+    "network": RetryPolicy(base_delay=0.5, max_delay=15, max_attempts=4),
+    "captcha": RetryPolicy(base_delay=10, max_delay=300, max_attempts=3),
+}
+
+# Seconds one request may spend on attempts and backoff before it is given up
+REQUEST_DEADLINE = 180
+
+def get_backoff_delay(policy: RetryPolicy, attempt: int) -> float:
+    """
+    Jittered exponential backoff ("full jitter"): uniform between 0 and the capped exponential delay.
+
+    Args:
+        policy (RetryPolicy): Backoff of the failure kind.
+        attempt (int): Number of earlier failures of this kind, starting from 0.
+
+    Returns:
+        float: Seconds to wait.
+    """
+    return random.uniform(0, min(policy.max_delay, policy.base_delay * 2 ** attempt))
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a Retry-After header given either in seconds or as an HTTP date.
+
+    Args:
+        value (Optional[str]): Header value.
+
+    Returns:
+        Optional[float]: Seconds to wait, None if the header is missing or malformed.
+    """
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+class CircuitBreaker:
+    """
+    Per-host breaker pausing every worker of the host while it is blocking the scraper.
+
+    The share of CAPTCHA pages among the recent responses is tracked in a sliding window.
+    When it exceeds the threshold the breaker opens for a cooldown that doubles on every
+    trip in a row, a Retry-After answer opens it for the requested time. Once the cooldown
+    is over requests flow again, and a successful response resets the cooldown.
+
+    Args:
+        threshold (float): Share of CAPTCHA pages opening the breaker.
+        window (int): Number of recent responses considered.
+        min_samples (int): Responses needed before the breaker can open.
+        cooldown (float): Seconds of the first pause.
+        max_cooldown (float): Upper bound of the pause.
+    """
+    def __init__(self, threshold: float = 0.5, window: int = 20, min_samples: int = 4,
+                 cooldown: float = 30, max_cooldown: float = 600) -> None:
+        self.threshold = threshold
+        self.min_samples = min_samples
+        self.base_cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.cooldown = cooldown
+        self.outcomes: Deque[bool] = deque(maxlen=window)
+        self.open_until = 0.0
+        self.trips = 0
+
+    def is_open(self) -> bool:
+        return time.monotonic() < self.open_until
+
+    def get_wait(self) -> float:
+        return max(self.open_until - time.monotonic(), 0.0)
+
+    def pause(self, seconds: float) -> None:
+        # Never shortens a pause already in place
+        self.open_until = max(self.open_until, time.monotonic() + seconds)
+
+    def record_success(self) -> None:
+        self.outcomes.append(False)
+        self.cooldown = self.base_cooldown
+
+    def record_captcha(self) -> None:
+        """
+        Count a CAPTCHA page and open the breaker when their share is over the threshold.
+
+        Returns:
+            None
+        """
+        self.outcomes.append(True)
+        if self.is_open() or len(self.outcomes) < self.min_samples:
+            return
+        if sum(self.outcomes) / len(self.outcomes) >= self.threshold:
+            self.trips += 1
+            logging.warning(f"CAPTCHA rate {sum(self.outcomes)}/{len(self.outcomes)}, "
+                            f"pausing the host for {self.cooldown:.0f} seconds")
+            self.pause(self.cooldown)
+            self.cooldown = min(self.cooldown * 2, self.max_cooldown)
+            # The next decision is made on responses received after the pause
+            self.outcomes.clear()
+
+    async def wait(self, deadline: float) -> bool:
+        """
+        Wait until the breaker is closed.
+
+        Args:
+            deadline (float): time.monotonic() after which the caller gives up.
+
+        Returns:
+            bool: False if the breaker stays open past the deadline.
+        """
+        while self.is_open():
+            if self.open_until > deadline:
+                return False
+            await asyncio.sleep(self.get_wait())
+        return True
+
+BREAKERS: Dict[str, CircuitBreaker] = {}
+
+def get_breaker(host: str) -> CircuitBreaker:
+    if host not in BREAKERS:
+        BREAKERS[host] = CircuitBreaker()
+    return BREAKERS[host]
+
+def classify_status(status: int) -> Optional[str]:
+    """
+    Failure kind of an HTTP status, None when retrying cannot help (e.g. 404).
+
+    Args:
+        status (int): Response status code.
+
+    Returns:
+        Optional[str]: Key of RETRY_POLICIES.
+    """
+    if status in (429, 503):
+        return "throttled"
+    if status >= 500 or status == 408:
+        return "server"
+    return None
+
+class RetryState:
+    """
+    Attempts of one request by failure kind and its deadline.
+
+    Args:
+        deadline (float): Seconds the request may take.
+        policies (Dict[str, RetryPolicy]): Backoff by failure kind.
+    """
+    def __init__(self, deadline: float = REQUEST_DEADLINE,
+                 policies: Optional[Dict[str, RetryPolicy]] = None) -> None:
+        self.deadline = time.monotonic() + deadline
+        self.policies = policies or RETRY_POLICIES
+        self.attempts: Dict[str, int] = {}
+
+    def next_delay(self, kind: str, retry_after: Optional[float] = None) -> Tuple[bool, float]:
+        """
+        Decide whether a failed attempt is retried and after how long.
+
+        Args:
+            kind (str): Failure kind.
+            retry_after (Optional[float]): Seconds asked for by the server.
+
+        Returns:
+            Tuple[bool, float]: Whether to retry and the delay before it.
+        """
+        policy = self.policies[kind]
+        attempt = self.attempts.get(kind, 0)
+        self.attempts[kind] = attempt + 1
+        if attempt >= policy.max_attempts:
+            return False, 0.0
+
+        delay = get_backoff_delay(policy, attempt)
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        return time.monotonic() + delay <= self.deadline, delay
@@ -1,14 +1,23 @@
 # Importing Necessary Libraries
+import os
 import random
-from urllib.parse import urljoin
+import re
+from urllib.parse import urljoin, urlparse, parse_qsl, urlencode, urlunparse
 import requests
-from bs4 import BeautifulSoup
 import logging
 import asyncio
-from aiohttp import ClientSession
+import argparse
+from aiohttp import ClientError, ClientSession, ClientTimeout
 import pandas as pd
 import time
 from typing import Dict, List, Optional, Tuple
+from http_cache import ResponseCache
+from sinks import ProductSink, get_sink, SINKS
+from parsers import ListingPage, PARSERS, is_captcha_page, parse_page
+from concurrent.futures import ProcessPoolExecutor
+from price_history import HISTORY_PATH, record_file
+from retry import REQUEST_DEADLINE, RetryPolicy, RetryState, classify_status, get_breaker, parse_retry_after
+from metrics import ENABLED as TRACING_ENABLED, REGISTRY, inc, timed
 
 # Setting up config
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -26,132 +35,264 @@ CUSTOM_HEADERS = {
 # Feature list across all laptops
 DETAIL_LISTING = set()
 
-async def request_with_retries(url: str, headers: Dict[str, str], session: ClientSession, retries: int = 10) -> Optional[str]:
+# Timeouts of a single attempt, a hung connection counts as a network error and is retried
+CLIENT_TIMEOUT = ClientTimeout(total=60, connect=15, sock_read=30)
+
+# Query parameter used by the shop's (Bitrix) paginator
+PAGINATION_PARAM = "PAGEN_1"
+
+# Parser backend of listing pages and the optional process pool running it
+PARSER_BACKEND = "bs4"
+PARSE_EXECUTOR: Optional[ProcessPoolExecutor] = None
+
+def set_parser(backend: str = "bs4", workers: int = 0) -> None:
+    """
+    Choose the parser backend of listing pages and whether parsing runs in a process pool.
+
+    Args:
+        backend (str): One of the backends registered in parsers.PARSERS ("bs4" or "lxml").
+        workers (int): Number of parser processes, 0 parses on the event loop thread.
+
+    Returns:
+        None
     """
-    Request a URL with retries and exponential backoff.
+    global PARSER_BACKEND, PARSE_EXECUTOR
+    if backend not in PARSERS:
+        raise ValueError(f"Unknown parser backend: {backend}")
+    if PARSE_EXECUTOR:
+        PARSE_EXECUTOR.shutdown()
+    PARSER_BACKEND = backend
+    PARSE_EXECUTOR = ProcessPoolExecutor(max_workers=workers) if workers > 0 else None
+
+class TokenBucket:
+    """
+    Token bucket rate limiter shared by all workers crawling one host.
+
+    Args:
+        rate (float): Number of tokens (requests) refilled per second.
+        capacity (int): Maximum burst size.
+    """
+    def __init__(self, rate: float, capacity: int = 1) -> None:
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated_at = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        """
+        Wait until a token is available and consume it.
+
+        Returns:
+            None
+        """
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+                self.updated_at = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+@timed()
+async def request_with_retries(url: str, headers: Dict[str, str], session: ClientSession, retries: int = 10,
+                              cache: Optional[ResponseCache] = None, deadline: float = REQUEST_DEADLINE,
+                              policies: Optional[Dict[str, RetryPolicy]] = None) -> Optional[str]:
+    """
+    Request a URL with retries and jittered exponential backoff.
+
+    Throttling (429/503), server errors, network errors and CAPTCHA pages are retried with
+    their own policy (see retry.RETRY_POLICIES), a Retry-After header is honoured, and
+    statuses retrying cannot fix (e.g. 404) are not retried. No attempt starts after the
+    deadline. Every request of a host first waits for its circuit breaker, which pauses
+    all workers of the host when its CAPTCHA rate spikes or it asks to retry later.
+
+    With a cache, conditional requests (If-None-Match / If-Modified-Since) are sent and
+    a 304 Not Modified answer is served from the cached body.
 
     Args:
         url (str): The URL to request.
         headers (Dict[str, str]): Headers to include in the request.
         session (ClientSession): The aiohttp session.
-        retries (int): Number of retry attempts.
+        retries (int): Maximum number of attempts.
+        cache (Optional[ResponseCache]): The on-disk response cache.
+        deadline (float): Seconds the request may take including backoff.
+        policies (Optional[Dict[str, RetryPolicy]]): Backoff by failure kind, RETRY_POLICIES by default.
 
     Returns:
         Optional[str]: The innerHTML content if successful, None otherwise.
     """
+    if cache:
+        headers = {**headers, **cache.conditional_headers(url)}
+
+    breaker = get_breaker(urlparse(url).netloc)
+    state = RetryState(deadline, policies)
+
     for attempt in range(retries):
-        async with session.get(url, headers=headers) as response:
-            if response.status == 200:
-                text = await response.text()
-                soup = BeautifulSoup(text, "lxml")
-                if soup.select_one("title").get_text() == "Robot Check":
+        if not await breaker.wait(state.deadline):
+            logging.error(f"Host of {url} is paused past the deadline, giving up")
+            return None
+
+        retry_after = None
+        try:
+            async with session.get(url, headers=headers) as response:
+                if response.status == 304 and cache:
+                    inc("http_cache_hits")
+                    breaker.record_success()
+                    return cache.not_modified(url)
+                if response.status == 200:
+                    text = await response.text()
+                    if not is_captcha_page(text):
+                        breaker.record_success()
+                        if cache:
+                            cache.store(url, text, response.headers.get("ETag"), response.headers.get("Last-Modified"))
+                        return text
+                    inc("captcha_hits")
+                    breaker.record_captcha()
+                    kind = "captcha"
                     logging.warning("CAPTCHA page detected... retrying")
-                    await asyncio.sleep(2 ** attempt)  # Exponential backoff
                 else:
-                    return text
-            else:
-                logging.warning(f"Failed to retrieve the page. Status code: {response.status}... retrying")
-                await asyncio.sleep(2 ** attempt)
+                    kind = classify_status(response.status)
+                    if kind is None:
+                        logging.error(f"Failed to retrieve the page. Status code: {response.status}")
+                        return None
+                    retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                    if retry_after is not None:
+                        breaker.pause(retry_after)
+                    logging.warning(f"Failed to retrieve the page. Status code: {response.status}... retrying")
+        except (ClientError, asyncio.TimeoutError) as error:
+            kind = "network"
+            logging.warning(f"Request to {url} failed ({error!r})... retrying")
+
+        retry, delay = state.next_delay(kind, retry_after)
+        if not retry or attempt == retries - 1:
+            break
+        inc("http_retries")
+        await asyncio.sleep(delay)
+
+    logging.error(f"Giving up on {url} after {sum(state.attempts.values())} failed attempts")
     return None
 
-async def parse_item_card(item: BeautifulSoup) -> Dict[str, str]:
+@timed()
+async def parse_listing(url: str, session: ClientSession, cache: Optional[ResponseCache] = None,
+                        backend: Optional[str] = None) -> Tuple[List[Dict[str, str]], Optional[ListingPage]]:
     """
-    Parse an individual item card to extract laptop information.
+    Parse the listing page to extract all item cards and their information.
+
+    Parsing runs with the backend chosen by set_parser, in its process pool if one is configured.
 
     Args:
-        item (BeautifulSoup): The BeautifulSoup object representing the item card.
+        url (str): The URL of the listing page.
+        session (ClientSession): The aiohttp session.
+        cache (Optional[ResponseCache]): The on-disk response cache.
+        backend (Optional[str]): Parser backend of the page's site, the one chosen by set_parser by default.
 
     Returns:
-        Dict[str, str]: A dictionary containing the laptop information.
+        Tuple[List[Dict[str, str]], Optional[ListingPage]]: Parsed products and pagination links of the page,
+            links are None if the page could not be retrieved or was not re-parsed.
     """
-    laptop_info: Dict[str, str] = {}
-
-    # Laptop ID
-    id_element = item.select_one("div.bx_catalog_item_scu_code")
-    if id_element:
-        idd = id_element.attrs.get("text")
-        laptop_info["laptop id"] = idd
-
-    # Brand and model of laptop
-    title_element = item.select_one("div.bx_catalog_item_title")
-    if title_element:
-        title = " ".join(title_element.select_one("a").attrs.get("title").split()[1:-1])
-        laptop_info["title"] = title
-    
-    # Both old and current price for laptop
-    price_element = item.select_one("div.bx_catalog_item_price")
-    if price_element:
-        old_price_element = price_element.select_one(".old_price")
-        curr_price_element = price_element.select_one(".current_price")
-
-        if old_price_element and curr_price_element:
-            old_price = old_price_element.get_text(strip=True)
-            current_price = curr_price_element.get_text(strip=True)
-
-            laptop_info["old price"] = old_price
-            laptop_info["current price"] = current_price
-
-    # All technical information including GPU, CPU, RAM configurations
-    specs_element = item.select_one("div.bx_catalog_item_spec")
-    if specs_element:
-        specs = specs_element.select("div")
-        for spec in specs:
-            key_element = spec.select_one(".bx_catalog_item_prop")
-            value_element = spec.select_one(".bx_catalog_item_value")
-            if key_element and value_element:
-                key = key_element.get_text(strip=True)[:-1]
-                value = value_element.get_text(strip=True)
-                laptop_info[key] = value
-
-    # Link on the laptop image (for further purposes)
-    image_element = item.select_one('.item_image_container img')
-    if image_element and 'data-src' in image_element.attrs:
-        image_link = image_element['data-src']
-        laptop_info["image link"] = image_link
-
-    return laptop_info
-
-async def parse_listing(url: str, session: ClientSession) -> Tuple[List[Dict[str, str]], Optional[BeautifulSoup]]:
 
     products: List[Dict[str, str]] = []
 
-    response = await request_with_retries(url, CUSTOM_HEADERS, session)
+    response = await request_with_retries(url, CUSTOM_HEADERS, session, cache=cache)
     if not response:
         return products, None
-    
-    soup = BeautifulSoup(response, "lxml")
-    item_cards = soup.select("[data-id]")
-
-    tasks = []
-    for item in item_cards:
-        tasks.append(asyncio.ensure_future(parse_item_card(item)))
 
-    results = await asyncio.gather(*tasks)
+    # Page body hash did not change since the last run, skip the re-parse completely
+    if cache and cache.is_unchanged(url):
+        cached_products = cache.get_products(url)
+        if cached_products is not None:
+            inc("parse_cache_hits")
+            for product in cached_products:
+                DETAIL_LISTING.update(product.keys())
+            return cached_products, None
+
+    backend = backend or PARSER_BACKEND
+    if PARSE_EXECUTOR:
+        loop = asyncio.get_running_loop()
+        results, page = await loop.run_in_executor(PARSE_EXECUTOR, parse_page, response, backend)
+    else:
+        results, page = parse_page(response, backend)
 
     for product in results:
         if product:
             for key in product.keys():
                 DETAIL_LISTING.add(key)
             products.append(product)
+
+    if cache:
+        cache.set_products(url, products)
     
-    return products, soup
+    return products, page
 
-def get_next_page_url(soup: BeautifulSoup) -> Optional[str]:
+def get_next_page_url(page: ListingPage, url: str = "https://shop.kz") -> Optional[str]:
     """
     Get the URL of the next page from the listing page.
 
     Args:
-        soup (BeautifulSoup): The BeautifulSoup object of the current page.
+        page (ListingPage): Pagination links of the current page.
+        url (str): The URL of the current page, relative links are resolved against it.
 
     Returns:
         Optional[str]: The URL of the next page, if found. None otherwise.
     """
     # Extract next button on the webpage
-    next_button = soup.select_one("li.bx-pag-next a")
-    if next_button:
-        return urljoin("https://shop.kz", next_button["href"])
+    if page.next_href:
+        return urljoin(url, page.next_href)
     return None
 
+def get_page_number(url: str) -> int:
+    """
+    Get the page number encoded in a listing URL.
+
+    Args:
+        url (str): The listing page URL.
+
+    Returns:
+        int: The page number, 1 if the URL has no pagination parameter.
+    """
+    query = dict(parse_qsl(urlparse(url).query))
+    return int(query.get(PAGINATION_PARAM, 1))
+
+def build_page_url(url: str, page: int) -> str:
+    """
+    Build the URL of the given listing page from the `?PAGEN_1=N` template.
+
+    Args:
+        url (str): Any listing page URL of the category.
+        page (int): The page number.
+
+    Returns:
+        str: The URL of the requested page.
+    """
+    parsed = urlparse(url)
+    query = [(key, val) for key, val in parse_qsl(parsed.query) if key != PAGINATION_PARAM]
+    if page > 1:
+        query.append((PAGINATION_PARAM, str(page)))
+    return urlunparse(parsed._replace(query=urlencode(query)))
+
+def get_page_urls(page: ListingPage, url: str, max_page: int) -> List[str]:
+    """
+    Work out all listing page URLs up front from the paginator of the first page.
+
+    Args:
+        page (ListingPage): Pagination links of the first page.
+        url (str): The URL of the first page.
+        max_page (int): Upper limit of pages to crawl.
+
+    Returns:
+        List[str]: URLs of pages 1..N ordered by page number.
+    """
+    last_page = 1
+    for href in page.page_hrefs:
+        match = re.search(rf"{PAGINATION_PARAM}=(\d+)", href)
+        if match:
+            last_page = max(last_page, int(match.group(1)))
+
+    return [build_page_url(url, page) for page in range(1, min(last_page, max_page) + 1)]
+
 def save_csv(product_list: List[Dict[str, str]], name: str = "laptops.csv") -> None:
     """
     Save the product list to a CSV file.
@@ -168,31 +309,52 @@ def save_csv(product_list: List[Dict[str, str]], name: str = "laptops.csv") -> N
 
     logging.info(f"Dataset was saved with dirname: {name}")
 
-async def execute_full_scraping(url: str) -> None:
+async def execute_full_scraping(url: str, sink: Optional[ProductSink] = None) -> None:
     """
     Execute the full scraping process starting from the given URL.
 
+    Without a sink all products are collected in memory and saved by save_csv at the end.
+    With a sink each page is flushed as soon as it is parsed, and a resumed sink continues
+    from the page following its last checkpoint.
+
     Args:
         url (str): The starting URL for scraping.
+        sink (Optional[ProductSink]): Streaming writer for scraped products.
 
     Returns:
         None
     """
     current_url = url
+    first_page = 1
     laptops: List[Dict[str, str]] = []
 
-    async with ClientSession() as session:
+    if sink and sink.last_page:
+        if not sink.next_url:
+            logging.info("Checkpoint has no next page, finalizing")
+            sink.finalize()
+            return
+        current_url = sink.next_url
+        first_page = sink.last_page + 1
+
+    async with ClientSession(timeout=CLIENT_TIMEOUT) as session:
         max_page_parse = 100 # Number of page needed to parse
 
         start_time = time.time()
         logging.info(f"Started scraping at {time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(start_time))}")
         
-        for page in range(1, max_page_parse + 1):
+        for page in range(first_page, max_page_parse + 1):
             logging.info(f"Parsing page {page}")
 
-            listing, soup = await parse_listing(current_url, session)
-            laptops.extend(listing)
-            next_page_url = get_next_page_url(soup)
+            listing, links = await parse_listing(current_url, session)
+            if links is None:
+                logging.error(f"Page {page} could not be retrieved")
+                break
+
+            next_page_url = get_next_page_url(links, current_url)
+            if sink:
+                sink.write_page(page, listing, next_page_url)
+            else:
+                laptops.extend(listing)
             
             print(f"Next page url: {next_page_url}\n")
 
@@ -203,14 +365,269 @@ async def execute_full_scraping(url: str) -> None:
                 logging.error("Next page was not found") # Case when next page btn was not found
                 break
 
-        save_csv(laptops)
+        if sink:
+            sink.finalize()
+        else:
+            save_csv(laptops)
 
         end_time = time.time()
         logging.info(f"Finished scraping at {time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(end_time))}")
         logging.info(f"Total time taken: {round((end_time - start_time), 2)} seconds")
 
+async def fetch_page(page: int, url: str, session: ClientSession,
+                     semaphore: asyncio.Semaphore, bucket: TokenBucket,
+                     cache: Optional[ResponseCache] = None) -> Tuple[int, Optional[List[Dict[str, str]]]]:
+    """
+    Fetch and parse one listing page inside the bounded worker pool.
+
+    Args:
+        page (int): The page number (used to keep output order deterministic).
+        url (str): The URL of the page.
+        session (ClientSession): The aiohttp session.
+        semaphore (asyncio.Semaphore): Concurrency limit of the pool.
+        bucket (TokenBucket): Politeness rate limiter of the host.
+        cache (Optional[ResponseCache]): The on-disk response cache.
+
+    Returns:
+        Tuple[int, Optional[List[Dict[str, str]]]]: The page number and its products, None if the page
+            could not be retrieved.
+    """
+    async with semaphore:
+        await bucket.acquire()
+        logging.info(f"Parsing page {page}")
+        listing, links = await parse_listing(url, session, cache)
+        # Unchanged cached pages come back without links too, but with their products
+        if links is None and not (cache and cache.is_unchanged(url)):
+            logging.error(f"Page {page} could not be retrieved")
+            return page, None
+        if not listing:
+            logging.warning(f"No products were parsed from page {page}")
+        return page, listing
+
+async def stream_pages(page_urls: List[str], first_listing: List[Dict[str, str]], session: ClientSession,
+                       semaphore: asyncio.Semaphore, bucket: TokenBucket,
+                       cache: Optional[ResponseCache], sink: ProductSink) -> bool:
+    """
+    Fetch listing pages concurrently and flush them to the sink in page order.
+
+    The checkpoint stops at the first page that could not be retrieved, so --resume fetches it again.
+
+    Args:
+        page_urls (List[str]): URLs of pages 1..N ordered by page number.
+        first_listing (List[Dict[str, str]]): Products of the already fetched first page.
+        session (ClientSession): The aiohttp session.
+        semaphore (asyncio.Semaphore): Concurrency limit of the pool.
+        bucket (TokenBucket): Politeness rate limiter of the host.
+        cache (Optional[ResponseCache]): The on-disk response cache.
+        sink (ProductSink): Streaming writer for scraped products.
+
+    Returns:
+        bool: True if every page was written, False if the sink stopped at a failed page.
+    """
+    def next_url(page: int) -> Optional[str]:
+        return page_urls[page] if page < len(page_urls) else None
+
+    if sink.last_page == 0:
+        sink.write_page(1, first_listing, next_url(1))
+
+    tasks = [fetch_page(page, page_urls[page - 1], session, semaphore, bucket, cache)
+             for page in range(sink.last_page + 1, len(page_urls) + 1)]
+
+    # Pages finishing out of order wait here until every previous page is flushed
+    pending: Dict[int, Optional[List[Dict[str, str]]]] = {}
+    for future in asyncio.as_completed(tasks):
+        page, listing = await future
+        pending[page] = listing
+        while pending.get(sink.last_page + 1) is not None:
+            page = sink.last_page + 1
+            sink.write_page(page, pending.pop(page), next_url(page))
+    return not pending
+
+async def execute_concurrent_scraping(url: str, max_page_parse: int = 100,
+                                      concurrency: int = 4, rate: float = 0.5,
+                                      name: str = "laptops.csv",
+                                      cache: Optional[ResponseCache] = None,
+                                      sink: Optional[ProductSink] = None) -> List[Dict[str, str]]:
+    """
+    Execute the scraping process fetching all listing pages through a bounded worker pool.
+
+    Pagination URLs are worked out up front from the paginator of the first page,
+    then fetched concurrently. Requests to the host are spaced out by a token bucket
+    instead of a fixed random sleep, and products are saved ordered by page number.
+
+    With a sink, pages are flushed in page order as soon as all previous pages are done,
+    and a resumed sink skips the pages up to its last checkpoint.
+
+    Args:
+        url (str): The starting URL for scraping.
+        max_page_parse (int): Number of pages needed to parse.
+        concurrency (int): Maximum number of pages fetched at the same time.
+        rate (float): Maximum number of requests per second sent to the host.
+        name (str): The name of the CSV file.
+        cache (Optional[ResponseCache]): The on-disk response cache.
+        sink (Optional[ProductSink]): Streaming writer for scraped products.
+
+    Returns:
+        List[Dict[str, str]]: The scraped products ordered by page number (empty when streamed to a sink).
+    """
+    laptops: List[Dict[str, str]] = []
+    bucket = TokenBucket(rate, capacity=concurrency)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async with ClientSession(timeout=CLIENT_TIMEOUT) as session:
+        start_time = time.time()
+        logging.info(f"Started scraping at {time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(start_time))}")
+
+        await bucket.acquire()
+        first_listing, links = await parse_listing(url, session, cache)
+        if links is None and cache and cache.is_unchanged(url):
+            # Unchanged first page was not re-parsed, its paginator is still needed
+            _, links = parse_page(cache.get_body(url), PARSER_BACKEND)
+        if links is None:
+            logging.error("First page could not be retrieved")
+            return laptops
+
+        page_urls = get_page_urls(links, url, max_page_parse)
+        logging.info(f"Found {len(page_urls)} pages to parse")
+
+        if sink:
+            if await stream_pages(page_urls, first_listing, session, semaphore, bucket, cache, sink):
+                sink.finalize()
+            else:
+                logging.error(f"Stopped after page {sink.last_page}, run again with --resume to continue")
+        else:
+            tasks = [fetch_page(page, page_url, session, semaphore, bucket, cache)
+                     for page, page_url in enumerate(page_urls[1:], start=2)]
+            results = dict(await asyncio.gather(*tasks))
+            results[1] = first_listing
+
+            for page in sorted(results):
+                laptops.extend(results[page] or [])
+
+            save_csv(laptops, name)
+
+        end_time = time.time()
+        logging.info(f"Finished scraping at {time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(end_time))}")
+        logging.info(f"Total time taken: {round((end_time - start_time), 2)} seconds")
+
+    return laptops
+
+def get_catalogue_changes(previous: pd.DataFrame, current: pd.DataFrame) -> pd.DataFrame:
+    """
+    Compare two scraped catalogues by laptop id.
+
+    Args:
+        previous (pd.DataFrame): Catalogue saved by the previous run.
+        current (pd.DataFrame): Catalogue scraped by the current run.
+
+    Returns:
+        pd.DataFrame: Added, removed and repriced laptops with a "change" column.
+    """
+    key, price = "laptop id", "current price"
+    previous = previous.drop_duplicates(key).set_index(key)
+    current = current.drop_duplicates(key).set_index(key)
+
+    added = current.loc[current.index.difference(previous.index)].assign(change="added")
+    removed = previous.loc[previous.index.difference(current.index)].assign(change="removed")
+
+    common = current.index.intersection(previous.index)
+    old_prices = previous.loc[common, price] if price in previous else pd.Series(index=common, dtype=object)
+    new_prices = current.loc[common, price] if price in current else pd.Series(index=common, dtype=object)
+    repriced_ids = common[(old_prices.fillna("") != new_prices.fillna("")).to_numpy()]
+    repriced = current.loc[repriced_ids].assign(change="price changed")
+    if price in previous:
+        repriced["previous price"] = previous.loc[repriced_ids, price]
+
+    return pd.concat([added, removed, repriced]).reset_index()
+
+async def execute_incremental_scraping(url: str, max_page_parse: int = 100,
+                                       concurrency: int = 4, rate: float = 0.5,
+                                       name: str = "laptops.csv",
+                                       changes_name: str = "laptops_changes.csv") -> pd.DataFrame:
+    """
+    Re-crawl the catalogue through the response cache and save only the laptops that changed.
+
+    Args:
+        url (str): The starting URL for scraping.
+        max_page_parse (int): Number of pages needed to parse.
+        concurrency (int): Maximum number of pages fetched at the same time.
+        rate (float): Maximum number of requests per second sent to the host.
+        name (str): The name of the full catalogue CSV file (read as the previous snapshot, then overwritten).
+        changes_name (str): The name of the CSV file with changes.
+
+    Returns:
+        pd.DataFrame: Added, removed and repriced laptops.
+    """
+    try:
+        previous = pd.read_csv(name, dtype=str)
+    except FileNotFoundError:
+        logging.warning(f"No previous catalogue found at {name}, every laptop is reported as added")
+        previous = pd.DataFrame(columns=["laptop id"])
+
+    cache = ResponseCache()
+    try:
+        laptops = await execute_concurrent_scraping(url, max_page_parse, concurrency, rate, name, cache)
+    finally:
+        cache.close()
+
+    current = pd.DataFrame(laptops, dtype=str)
+    if current.empty:
+        logging.error("Nothing was scraped, changes were not computed")
+        return current
+
+    changes = get_catalogue_changes(previous, current)
+    changes.to_csv(changes_name, index=False)
+    logging.info(f"{len(changes)} changed laptops were saved with dirname: {changes_name}")
+
+    return changes
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Scrape laptop listings from shop.kz")
+    parser.add_argument("--url", default="https://shop.kz/offers/noutbuki/", help="Starting listing URL")
+    parser.add_argument("--concurrent", action="store_true", help="Fetch pages through a bounded worker pool")
+    parser.add_argument("--concurrency", type=int, default=4, help="Maximum number of pages fetched at once")
+    parser.add_argument("--rate", type=float, default=0.5, help="Maximum requests per second to the host")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Re-crawl through the on-disk cache and save only changed laptops")
+    parser.add_argument("--sink", choices=sorted(SINKS),
+                        help="Stream each parsed page to a CSV, JSON Lines or Parquet file instead of saving at the end")
+    parser.add_argument("--resume", action="store_true", help="Resume the sink from its last completed page")
+    parser.add_argument("--parser", choices=sorted(PARSERS), default="bs4", help="Parser backend of listing pages")
+    parser.add_argument("--parse-workers", type=int, default=0,
+                        help="Number of processes parsing pages off the event loop, 0 parses inline")
+    parser.add_argument("--max-pages", type=int, default=100, help="Number of pages needed to parse")
+    parser.add_argument("--history", nargs="?", const=HISTORY_PATH, default=None,
+                        help="Record the saved catalogue as a run of the price history database")
+    args = parser.parse_args()
+    if args.incremental and (args.sink or args.resume):
+        parser.error("--incremental saves only changed laptops, it cannot be combined with --sink or --resume")
+    return args
+
 async def main() -> None:
-    await execute_full_scraping("https://shop.kz/offers/noutbuki/")
+    args = parse_args()
+    set_parser(args.parser, args.parse_workers)
+    sink = get_sink(args.sink, resume=args.resume) if args.sink else None
+    if args.incremental:
+        await execute_incremental_scraping(args.url, args.max_pages, args.concurrency, args.rate)
+    elif args.concurrent:
+        await execute_concurrent_scraping(args.url, args.max_pages, args.concurrency, args.rate, sink=sink)
+    else:
+        await execute_full_scraping(args.url, sink)
+    set_parser("bs4")  # Shut the parser process pool down
+
+    if args.history:
+        catalogue = sink.name if sink else "laptops.csv"
+        if os.path.exists(catalogue):
+            record_file(catalogue, args.history)
+        else:
+            logging.error(f"No catalogue was saved at {catalogue}, the run was not recorded")
+
+    if TRACING_ENABLED:
+        REGISTRY.flush()
+        counters, timers = REGISTRY.snapshot()
+        logging.info(f"Counters: {counters}")
+        for name, timer in timers.items():
+            logging.info(f"{name}: {timer['count']} calls, mean {timer['mean']:.3f} s, max {timer['max']:.3f} s")
 
 if __name__ == "__main__":
     asyncio.run(main())
@@ -0,0 +1,179 @@
+# Importing Necessary Libraries
+import csv
+import json
+import logging
+import os
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional
+
+class ProductSink(ABC):
+    """
+    Streaming writer for scraped products.
+
+    Each page's rows are appended to a JSON Lines part file as soon as they are parsed,
+    and a checkpoint with the last completed page is stored next to it. The union of
+    columns is tracked in the checkpoint and reconciled into the final file schema
+    only when the sink is finalized, so no rows are held in memory.
+
+    Args:
+        name (str): The name of the output file.
+        resume (bool): Continue from the checkpoint of an interrupted run if it exists.
+    """
+    def __init__(self, name: str, resume: bool = False) -> None:
+        self.name = name
+        self.part_name = f"{name}.part"
+        self.checkpoint_name = f"{name}.checkpoint"
+        self.columns: List[str] = []
+        self.last_page = 0
+        self.next_url: Optional[str] = None
+        self.rows = 0
+
+        if resume and os.path.exists(self.checkpoint_name) and os.path.exists(self.part_name):
+            with open(self.checkpoint_name, encoding="utf-8") as file:
+                checkpoint = json.load(file)
+            self.columns = checkpoint["columns"]
+            self.last_page = checkpoint["last_page"]
+            self.next_url = checkpoint.get("next_url")
+            self.rows = checkpoint["rows"]
+            self.truncate_part(checkpoint["part_size"])
+            logging.info(f"Resuming {name} after page {self.last_page} ({self.rows} rows)")
+        else:
+            open(self.part_name, "w", encoding="utf-8").close()
+
+    def truncate_part(self, size: int) -> None:
+        # Rows written after the last checkpoint belong to an unfinished page
+        with open(self.part_name, "r+b") as file:
+            file.truncate(size)
+
+    def write_page(self, page: int, products: List[Dict[str, str]], next_url: Optional[str] = None) -> None:
+        """
+        Append the products of one page and checkpoint it as completed.
+
+        Args:
+            page (int): The page number.
+            products (List[Dict[str, str]]): Products parsed from the page.
+            next_url (Optional[str]): URL of the page following this one.
+
+        Returns:
+            None
+        """
+        with open(self.part_name, "a", encoding="utf-8") as file:
+            for product in products:
+                for key in product:
+                    if key not in self.columns:
+                        self.columns.append(key)
+                file.write(json.dumps(product, ensure_ascii=False) + "\n")
+            file.flush()
+            os.fsync(file.fileno())
+
+        self.rows += len(products)
+        self.last_page = page
+        self.next_url = next_url
+        self.save_checkpoint()
+
+    def save_checkpoint(self) -> None:
+        checkpoint = {
+            "last_page": self.last_page,
+            "next_url": self.next_url,
+            "rows": self.rows,
+            "columns": self.columns,
+            "part_size": os.path.getsize(self.part_name),
+        }
+        temp_name = f"{self.checkpoint_name}.tmp"
+        with open(temp_name, "w", encoding="utf-8") as file:
+            json.dump(checkpoint, file, ensure_ascii=False)
+        os.replace(temp_name, self.checkpoint_name)
+
+    def iter_rows(self):
+        with open(self.part_name, encoding="utf-8") as file:
+            for line in file:
+                yield json.loads(line)
+
+    @abstractmethod
+    def write_final(self) -> None:
+        # Write the final file from the rows of the part file
+        ...
+
+    def finalize(self) -> None:
+        """
+        Reconcile the union of columns into the final file and remove the part file and checkpoint.
+
+        Returns:
+            None
+        """
+        self.write_final()
+        for name in (self.part_name, self.checkpoint_name):
+            if os.path.exists(name):
+                os.remove(name)
+
+        logging.info(f"Dataset was saved with dirname: {self.name} ({self.rows} rows, {len(self.columns)} columns)")
+
+class CsvSink(ProductSink):
+    """
+    CSV sink producing the same file as save_csv: columns ordered by first appearance, missing values left empty.
+
+    Pages are streamed to the JSON Lines part file, the CSV is only written by finalize once
+    the union of columns is known. A crashed run leaves no usable CSV, only the part file
+    and checkpoint that --resume continues from.
+    """
+    def write_final(self) -> None:
+        with open(self.name, "w", encoding="utf-8", newline="") as file:
+            writer = csv.DictWriter(file, fieldnames=self.columns, restval="", lineterminator="\n")
+            writer.writeheader()
+            for row in self.iter_rows():
+                writer.writerow(row)
+
+class JsonLinesSink(ProductSink):
+    """
+    JSON Lines sink, one product per line with the keys found on its card.
+    """
+    def write_final(self) -> None:
+        os.replace(self.part_name, self.name)
+
+class ParquetSink(ProductSink):
+    """
+    Columnar Parquet sink written in row groups with a string schema over the union of columns.
+
+    Args:
+        name (str): The name of the output file.
+        resume (bool): Continue from the checkpoint of an interrupted run if it exists.
+        row_group_size (int): Number of rows per Parquet row group.
+    """
+    def __init__(self, name: str, resume: bool = False, row_group_size: int = 1000) -> None:
+        super().__init__(name, resume)
+        self.row_group_size = row_group_size
+
+    def write_final(self) -> None:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        schema = pa.schema([(column, pa.string()) for column in self.columns])
+        with pq.ParquetWriter(self.name, schema) as writer:
+            batch: List[Dict[str, str]] = []
+            for row in self.iter_rows():
+                batch.append(row)
+                if len(batch) == self.row_group_size:
+                    writer.write_table(pa.Table.from_pylist(batch, schema=schema))
+                    batch = []
+            if batch:
+                writer.write_table(pa.Table.from_pylist(batch, schema=schema))
+
+SINKS = {
+    "csv": CsvSink,
+    "jsonl": JsonLinesSink,
+    "parquet": ParquetSink,
+}
+
+def get_sink(kind: str, name: Optional[str] = None, resume: bool = False) -> ProductSink:
+    """
+    Create a streaming sink by its format name.
+
+    Args:
+        kind (str): One of "csv", "jsonl" or "parquet".
+        name (Optional[str]): The name of the output file, "laptops.<kind>" by default.
+        resume (bool): Continue from the checkpoint of an interrupted run if it exists.
+
+    Returns:
+        ProductSink: The sink instance.
+    """
+    return SINKS[kind](name or f"laptops.{kind}", resume)
@@ -0,0 +1,11 @@
+# Importing Necessary Libraries
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# The scraper and the app are flat script directories, their modules are imported by name
+for directory in ("scraper", "app"):
+    path = os.path.join(ROOT, directory)
+    if path not in sys.path:
+        sys.path.insert(0, path)
@@ -0,0 +1,52 @@
+# Importing Necessary Libraries
+import os
+import shutil
+import pandas as pd
+import pytest
+from catalogue import SIDECAR_FORMAT, STRING_COLUMNS, get_sidecar_path, read_catalogue, read_catalogue_csv
+from conftest import ROOT
+
+pytest.importorskip("pyarrow")
+
+@pytest.fixture
+def catalogue_path(tmp_path) -> str:
+    path = str(tmp_path / "laptops_data.csv")
+    shutil.copy(os.path.join(ROOT, "app", "data", "laptops_data.csv"), path)
+    return path
+
+def as_parsed(data: pd.DataFrame) -> pd.DataFrame:
+    # Free text columns come back as Arrow strings instead of Python objects
+    return data.astype({column: object for column in STRING_COLUMNS})
+
+def test_sidecar_reads_like_the_csv(catalogue_path):
+    expected = read_catalogue_csv(catalogue_path)
+    mapped = read_catalogue(catalogue_path, memory_map=True)
+    assert os.path.exists(get_sidecar_path(catalogue_path))
+
+    pd.testing.assert_frame_equal(as_parsed(mapped), expected)
+    pd.testing.assert_frame_equal(as_parsed(read_catalogue(catalogue_path, memory_map=False)), expected)
+    # Numeric columns are views of the mapped file
+    assert not mapped["current_price"].to_numpy().flags.writeable
+
+def test_sidecar_is_rebuilt_when_the_csv_changes(catalogue_path):
+    read_catalogue(catalogue_path)
+    sidecar_mtime = os.path.getmtime(get_sidecar_path(catalogue_path))
+
+    read_catalogue_csv(catalogue_path).head(100).to_csv(catalogue_path, index=False)
+    os.utime(catalogue_path, (sidecar_mtime + 10, sidecar_mtime + 10))
+    data = read_catalogue(catalogue_path)
+    assert len(data) == 100
+    pd.testing.assert_frame_equal(as_parsed(data), read_catalogue_csv(catalogue_path))
+
+def test_sidecar_of_another_layout_is_rebuilt(catalogue_path):
+    import pyarrow as pa
+    from pyarrow import feather
+
+    # A compressed sidecar of the current CSV written without a layout tag, e.g. by an older version
+    table = pa.Table.from_pandas(read_catalogue_csv(catalogue_path).head(10), preserve_index=False)
+    table = table.replace_schema_metadata({**table.schema.metadata,
+                                           b"csv_mtime": str(os.path.getmtime(catalogue_path)).encode()})
+    feather.write_feather(table, get_sidecar_path(catalogue_path), compression="zstd")
+
+    assert len(read_catalogue(catalogue_path)) == len(read_catalogue_csv(catalogue_path))
+    assert feather.read_table(get_sidecar_path(catalogue_path)).schema.metadata[b"format"] == SIDECAR_FORMAT
@@ -0,0 +1,27 @@
+# Importing Necessary Libraries
+import os
+import pandas as pd
+import pytest
+from cleaning import run_pipeline
+from conftest import ROOT
+
+@pytest.fixture(scope="module")
+def datasets():
+    return run_pipeline(pd.read_csv(os.path.join(ROOT, "scraper", "data", "laptops.csv")))
+
+@pytest.mark.parametrize("key, path", [
+    ("cleansed", os.path.join("scraper", "data", "laptops_cleansed.csv")),
+    ("app", os.path.join("app", "data", "laptops_data.csv")),
+    ("images", os.path.join("scraper", "data", "laptop_images.csv")),
+])
+def test_pipeline_output_matches_the_shipped_datasets(datasets, key, path, tmp_path):
+    # Saved the way cleaning.main() saves it, the files must not change byte for byte
+    name = str(tmp_path / os.path.basename(path))
+    datasets[key].to_csv(name, index=False)
+    with open(name, "rb") as output, open(os.path.join(ROOT, path), "rb") as shipped:
+        assert output.read() == shipped.read()
+
+def test_pipeline_keeps_every_laptop_once(datasets):
+    assert len(datasets["cleansed"]) == len(datasets["app"]) == len(datasets["images"])
+    assert datasets["app"]["laptop_id"].is_unique
+    assert "image_link" not in datasets["cleansed"]
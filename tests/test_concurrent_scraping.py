@@ -0,0 +1,129 @@
+# Importing Necessary Libraries
+import asyncio
+import json
+import os
+import random
+import time
+from typing import List, Set
+import pandas as pd
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from scraper import TokenBucket, execute_concurrent_scraping
+from sinks import get_sink
+
+PAGES = 12
+CARDS_PER_PAGE = 3
+
+class StandInShop:
+    """
+    Local stand-in of the shop serving numbered listing pages after a random latency.
+
+    Args:
+        pages (int): Number of listing pages.
+        max_latency (float): Upper bound of the seconds taken by an answer.
+        seed (int): Random seed of the latencies.
+        failing (Set[int]): Pages answered with 404.
+    """
+    def __init__(self, pages: int = PAGES, max_latency: float = 0.05, seed: int = 0,
+                 failing: Set[int] = frozenset()) -> None:
+        self.pages = pages
+        self.failing = set(failing)
+        self.max_latency = max_latency
+        self.random = random.Random(seed)
+        self.arrivals: List[float] = []
+        self.completed: List[int] = []
+
+    def render(self, page: int) -> str:
+        cards = "".join(
+            f'<div data-id="{page}-{card}"><div class="bx_catalog_item_scu_code" text="{page}-{card}"></div>'
+            f'<div class="bx_catalog_item_title"><a title="Ноутбук Laptop {page}-{card} x"></a></div></div>'
+            for card in range(CARDS_PER_PAGE))
+        paginator = "".join(f'<li><a href="/offers/noutbuki/?PAGEN_1={number}">{number}</a></li>'
+                            for number in range(1, self.pages + 1))
+        return f"<html><head><title>Ноутбуки</title></head><body>{cards}" \
+               f"<div class=\"bx-pagination\"><ul>{paginator}</ul></div></body></html>"
+
+    async def handle(self, request: web.Request) -> web.Response:
+        page = int(request.query.get("PAGEN_1", 1))
+        self.arrivals.append(time.monotonic())
+        await asyncio.sleep(self.random.uniform(0, self.max_latency))
+        if page in self.failing:
+            return web.Response(status=404)
+        self.completed.append(page)
+        return web.Response(text=self.render(page), content_type="text/html")
+
+async def scrape(shop: StandInShop, rate: float = 1000, concurrency: int = 4, **kwargs) -> list:
+    app = web.Application()
+    app.router.add_get("/offers/noutbuki/", shop.handle)
+    async with TestServer(app) as server:
+        return await execute_concurrent_scraping(str(server.make_url("/offers/noutbuki/")), PAGES,
+                                                 concurrency, rate, **kwargs)
+
+def get_expected_ids() -> List[str]:
+    return [f"{page}-{card}" for page in range(1, PAGES + 1) for card in range(CARDS_PER_PAGE)]
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_products_stay_in_page_order(tmp_path, seed):
+    shop = StandInShop(seed=seed)
+    name = str(tmp_path / "laptops.csv")
+    laptops = asyncio.run(scrape(shop, name=name))
+
+    assert [laptop["laptop id"] for laptop in laptops] == get_expected_ids()
+    assert pd.read_csv(name, dtype=str)["laptop id"].tolist() == get_expected_ids()
+    # Pages really finished out of order, otherwise the test proves nothing
+    assert shop.completed != sorted(shop.completed)
+
+def test_sink_is_written_in_page_order(tmp_path):
+    shop = StandInShop(seed=3)
+    sink = get_sink("jsonl", str(tmp_path / "laptops.jsonl"))
+    asyncio.run(scrape(shop, sink=sink))
+
+    with open(tmp_path / "laptops.jsonl", encoding="utf-8") as file:
+        assert [json.loads(line)["laptop id"] for line in file] == get_expected_ids()
+    assert shop.completed != sorted(shop.completed)
+
+def test_rate_limit_caps_requests_per_second(tmp_path):
+    rate, concurrency = 10, 4
+    shop = StandInShop(max_latency=0)
+    asyncio.run(scrape(shop, rate=rate, concurrency=concurrency, name=str(tmp_path / "laptops.csv")))
+
+    # A full bucket allows a burst of `concurrency` requests, the others are spaced out by the rate
+    assert len(shop.arrivals) == PAGES
+    assert shop.arrivals[-1] - shop.arrivals[0] >= (PAGES - concurrency) / rate - 0.05
+    for start in range(len(shop.arrivals)):
+        window = [arrival for arrival in shop.arrivals if 0 <= arrival - shop.arrivals[start] < 1]
+        assert len(window) <= rate + concurrency
+
+def test_token_bucket_spaces_out_acquisitions():
+    async def acquire_all(bucket: TokenBucket, count: int) -> List[float]:
+        times = []
+        for _ in range(count):
+            await bucket.acquire()
+            times.append(time.monotonic())
+        return times
+
+    times = asyncio.run(acquire_all(TokenBucket(rate=20, capacity=1), 11))
+    assert times[-1] - times[0] >= 10 / 20 - 0.01
+
+    bucket = TokenBucket(rate=20, capacity=5)
+    times = asyncio.run(acquire_all(bucket, 5))
+    assert times[-1] - times[0] < 0.02
+
+def test_failed_page_is_fetched_again_on_resume(tmp_path):
+    name = str(tmp_path / "laptops.csv")
+    shop = StandInShop(seed=4, failing={5})
+    asyncio.run(scrape(shop, sink=get_sink("csv", name)))
+
+    # Pages after the failed one are not checkpointed and the CSV is not written
+    assert not os.path.exists(name)
+    with open(f"{name}.checkpoint", encoding="utf-8") as file:
+        assert json.load(file)["last_page"] == 4
+
+    shop.failing.clear()
+    shop.completed.clear()
+    asyncio.run(scrape(shop, sink=get_sink("csv", name, resume=True)))
+
+    assert pd.read_csv(name, dtype=str)["laptop id"].tolist() == get_expected_ids()
+    # The first page is fetched again for its paginator, then only the pages after the checkpoint
+    assert sorted(shop.completed) == [1] + list(range(5, PAGES + 1))
@@ -0,0 +1,180 @@
+# Importing Necessary Libraries
+import asyncio
+import csv
+import gc
+import html
+import os
+import time
+from collections import Counter
+from contextlib import AsyncExitStack
+from typing import Dict, List, Optional, Set, Tuple
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from bs4 import BeautifulSoup
+from crawler import Crawler, Site, normalize_url
+from parsers import CardPageParser, register_parser
+from sinks import ProductSink, get_sink
+
+PAGES = 4
+CARDS_PER_PAGE = 2
+
+def parse_competitor_card(item: BeautifulSoup) -> Dict[str, str]:
+    # Card parser of the stand-in competitor, same contract as parsers.parse_item_card
+    return {"laptop id": item["data-sku"], "title": item.select_one(".name").get_text(strip=True)}
+
+register_parser("test-competitor", CardPageParser(parse_competitor_card, "li.product", "a.next", "nav.pages a"))
+
+class StandInShop:
+    """
+    Local stand-in shop serving listing pages of several categories, tracking how it is crawled.
+
+    Args:
+        name (str): Prefix of the laptop ids.
+        latency (float): Seconds taken by every answer.
+        markup (str): "shop" (shop.kz markup) or "competitor".
+        failing (Set[Tuple[str, int]]): Category and page number of the pages answering 404.
+    """
+    def __init__(self, name: str, latency: float = 0.02, markup: str = "shop",
+                 failing: Set[Tuple[str, int]] = frozenset()) -> None:
+        self.name = name
+        self.latency = latency
+        self.markup = markup
+        self.failing = failing
+        self.requests: Counter = Counter()
+        self.arrivals: List[float] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.url = None
+
+    def render(self, category: str, page: int) -> str:
+        path = f"/offers/{category}/"
+        ids = [f"{self.name}-{category}-{page}-{card}" for card in range(CARDS_PER_PAGE)]
+        if self.markup == "competitor":
+            cards = "".join(f'<li class="product" data-sku="{laptop_id}"><h3 class="name">{laptop_id}</h3></li>'
+                            for laptop_id in ids)
+            paginator = "".join(f'<a href="{path}?PAGEN_1={number}">{number}</a>' for number in range(1, PAGES + 1))
+            if page < PAGES:
+                paginator += f'<a class="next" href="{path}?PAGEN_1={page + 1}">Next</a>'
+            # Links to another shop are never followed
+            paginator += '<a href="http://other.invalid/offers/x/?PAGEN_1=2">2</a>'
+            return f"<html><body><ul>{cards}</ul><nav class=\"pages\">{paginator}</nav></body></html>"
+
+        cards = "".join(
+            f'<div data-id="{laptop_id}"><div class="bx_catalog_item_scu_code" text="{laptop_id}"></div>'
+            f'<div class="bx_catalog_item_title"><a title="Ноутбук {html.escape(laptop_id)} x"></a></div></div>'
+            for laptop_id in ids)
+        paginator = "".join(f'<li><a href="{path}?PAGEN_1={number}">{number}</a></li>' for number in range(1, PAGES + 1))
+        if page < PAGES:
+            paginator += f'<li class="bx-pag-next"><a href="{path}?PAGEN_1={page + 1}">Вперед</a></li>'
+        return f"<html><body>{cards}<div class=\"bx-pagination\"><ul>{paginator}</ul></div></body></html>"
+
+    async def handle(self, request: web.Request) -> web.Response:
+        self.requests[request.path_qs] += 1
+        self.arrivals.append(time.monotonic())
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.latency)
+            page = int(request.query.get("PAGEN_1", 1))
+            if (request.match_info["category"], page) in self.failing:
+                return web.Response(status=404)
+            return web.Response(text=self.render(request.match_info["category"], page), content_type="text/html")
+        finally:
+            self.in_flight -= 1
+
+async def crawl(shops: List[StandInShop], seeds: Dict[str, List[str]], sites: Dict[str, Site],
+                default_site: Site = Site(), sink: Optional[ProductSink] = None) -> Tuple[Crawler, List[Dict[str, str]]]:
+    async with AsyncExitStack() as stack:
+        for shop in shops:
+            app = web.Application()
+            app.router.add_get("/offers/{category}/", shop.handle)
+            server = await stack.enter_async_context(TestServer(app))
+            shop.url = str(server.make_url("")).rstrip("/")
+        crawl_seeds = [f"{shop.url}{path}" for shop in shops for path in seeds[shop.name]]
+        sites = {shops[index].url.split("://")[1]: site for index, site in sites.items()}
+        crawler = Crawler(crawl_seeds, PAGES, sink=sink, sites=sites, default_site=default_site)
+        return crawler, await crawler.run()
+
+def test_hosts_keep_their_own_budgets():
+    slow = StandInShop("slow")
+    fast = StandInShop("fast")
+    competitor = StandInShop("competitor", markup="competitor")
+    shops = [slow, fast, competitor]
+    seeds = {shop.name: ["/offers/a/", "/offers/b/"] for shop in shops}
+    # The first page of a category given again (explicit page 1, fragment) is crawled once
+    seeds["fast"].append("/offers/a/?PAGEN_1=1#top")
+    sites = {0: Site("bs4", rate=20, concurrency=1), 1: Site("bs4", rate=1000, concurrency=4),
+             2: Site("test-competitor", rate=1000, concurrency=2)}
+    # A garbage collection of earlier tests' objects during the first requests would skew the measured gaps
+    gc.collect()
+    _, products = asyncio.run(crawl(shops, seeds, sites))
+
+    expected = [f"{shop.name}-{category}-{page}-{card}" for shop in shops for category in ("a", "b")
+                for page in range(1, PAGES + 1) for card in range(CARDS_PER_PAGE)]
+    assert [product["laptop id"] for product in products] == expected
+    assert {product["category"] for product in products} == {"/offers/a/", "/offers/b/"}
+    assert all(product["shop"] == shop.url.split("://")[1] for shop in shops
+               for product in products if product["laptop id"].startswith(shop.name))
+
+    for shop in shops:
+        assert sum(shop.requests.values()) == 2 * PAGES
+        assert max(shop.requests.values()) == 1
+
+    assert slow.max_in_flight == 1
+    gaps = [later - earlier for earlier, later in zip(slow.arrivals, slow.arrivals[1:])]
+    assert min(gaps) >= 1 / 20 - 0.01
+    assert 1 < fast.max_in_flight <= 4
+    assert competitor.max_in_flight <= 2
+
+def test_default_site_applies_to_unlisted_hosts():
+    shops = [StandInShop("first"), StandInShop("second")]
+    seeds = {shop.name: ["/offers/a/", "/offers/b/"] for shop in shops}
+    _, products = asyncio.run(crawl(shops, seeds, {}, default_site=Site("bs4", rate=1000, concurrency=1)))
+
+    assert len(products) == len(shops) * 2 * PAGES * CARDS_PER_PAGE
+    assert all(shop.max_in_flight == 1 for shop in shops)
+
+def test_max_pages_caps_every_seed():
+    shop = StandInShop("shop")
+
+    async def run() -> List[Dict[str, str]]:
+        app = web.Application()
+        app.router.add_get("/offers/{category}/", shop.handle)
+        async with TestServer(app) as server:
+            url = str(server.make_url("/offers/a/"))
+            return await Crawler([url], 2, default_site=Site("bs4", rate=1000, concurrency=4)).run()
+
+    products = asyncio.run(run())
+    assert len(products) == 2 * CARDS_PER_PAGE
+    assert sum(shop.requests.values()) == 2
+
+def test_interrupted_crawl_resumes_from_the_sink_checkpoint(tmp_path):
+    name = str(tmp_path / "laptops.csv")
+    seeds = {"shop": ["/offers/a/", "/offers/b/", "/offers/c/"]}
+    fast = Site("bs4", rate=1000, concurrency=4)
+
+    # Pages of every seed are written in page order, the checkpoint stops before the failed page
+    shop = StandInShop("shop", failing={("b", 3)})
+    sink = get_sink("csv", name)
+    crawler, _ = asyncio.run(crawl([shop], seeds, {}, fast, sink))
+    assert not crawler.is_complete()
+    assert sink.last_page == PAGES + 2
+    assert not os.path.exists(name)
+
+    shop = StandInShop("shop")
+    sink = get_sink("csv", name, resume=True)
+    crawler, _ = asyncio.run(crawl([shop], seeds, {}, fast, sink))
+    assert crawler.is_complete()
+    sink.finalize()
+
+    with open(name, encoding="utf-8") as file:
+        ids = [row["laptop id"] for row in csv.DictReader(file)]
+    assert ids == [f"shop-{category}-{page}-{card}" for category in ("a", "b", "c")
+                   for page in range(1, PAGES + 1) for card in range(CARDS_PER_PAGE)]
+    # The finished seed is skipped, pages of the stopped one are fetched again only for their paginator
+    assert not any(path.startswith("/offers/a/") for path in shop.requests)
+    assert sum(shop.requests.values()) == 2 * PAGES
+
+def test_normalize_url():
+    assert normalize_url("HTTP://Shop.KZ/offers/a/?PAGEN_1=1#top") == normalize_url("http://shop.kz/offers/a/")
+    assert normalize_url("http://shop.kz/offers/a/?b=2&PAGEN_1=3") == "http://shop.kz/offers/a/?PAGEN_1=3&b=2"
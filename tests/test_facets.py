@@ -0,0 +1,28 @@
+# Importing Necessary Libraries
+import os
+import pandas as pd
+import pytest
+from catalogue import read_catalogue_csv
+from conftest import ROOT
+from facets import DEPENDENT_FACETS, FACET_COLUMNS, RANGE_COLUMNS, build_facet_index
+
+@pytest.fixture(scope="module")
+def data() -> pd.DataFrame:
+    return read_catalogue_csv(os.path.join(ROOT, "app", "data", "laptops_data.csv"))
+
+def test_facet_index_matches_a_scan_of_the_catalogue(data):
+    facets = build_facet_index(data)
+
+    for column in FACET_COLUMNS:
+        # Options keep the order of first appearance, as the sidebar lists them
+        assert facets.values[column] == [str(value) for value in pd.unique(data[column].dropna().astype(str))]
+    for column in RANGE_COLUMNS:
+        assert facets.ranges[column] == (float(data[column].min()), float(data[column].max()))
+
+    for parent, child in DEPENDENT_FACETS:
+        for value in pd.unique(data[parent].dropna().astype(str)):
+            rows = data[data[parent].astype(str) == value]
+            assert facets.get_children(parent, child, value) == list(pd.unique(rows[child].dropna().astype(str)))
+
+def test_unknown_parent_has_no_children(data):
+    assert build_facet_index(data).get_children("brand", "cpu_brand", "No Such Brand") == []
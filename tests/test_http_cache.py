@@ -0,0 +1,64 @@
+# Importing Necessary Libraries
+import zlib
+from http_cache import EVICT_SLACK, ResponseCache
+
+def page(seed: int) -> str:
+    # Incompressible enough for the stored size to follow the body size
+    return "".join(chr(0x4e00 + (seed * 7919 + idx * idx) % 20000) for idx in range(2000))
+
+def stored_bytes(cache: ResponseCache) -> int:
+    return cache.connection.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+
+def test_stores_over_the_limit_evict_least_recently_used_pages(tmp_path):
+    size = len(zlib.compress(page(0).encode("utf-8")))
+    cache = ResponseCache(str(tmp_path / "cache.sqlite"), max_bytes=3 * size)
+    for seed in range(3):
+        cache.store(f"https://shop.kz/laptops/?PAGEN_1={seed}", page(seed))
+    assert cache.get_body("https://shop.kz/laptops/?PAGEN_1=0") == page(0)
+
+    # The fourth page crosses the slack, the least recently read page goes
+    cache.store("https://shop.kz/laptops/?PAGEN_1=3", page(3))
+    assert stored_bytes(cache) <= cache.max_bytes * (1 + EVICT_SLACK)
+    assert cache.get_body("https://shop.kz/laptops/?PAGEN_1=1") is None
+    assert cache.get_body("https://shop.kz/laptops/?PAGEN_1=0") == page(0)
+    cache.close()
+
+def test_cache_over_its_limit_is_evicted_on_close(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    cache = ResponseCache(path)
+    for seed in range(5):
+        cache.store(f"https://shop.kz/laptops/?PAGEN_1={seed}", page(seed))
+    total = stored_bytes(cache)
+
+    # Within the slack stores do not evict, closing does
+    cache.max_bytes = total / (1 + EVICT_SLACK / 2)
+    cache.store("https://shop.kz/laptops/?PAGEN_1=4", page(4))
+    assert stored_bytes(cache) == total
+    cache.close()
+
+    cache = ResponseCache(path, max_bytes=float("inf"))
+    assert stored_bytes(cache) <= total / (1 + EVICT_SLACK / 2)
+    assert cache.get_body("https://shop.kz/laptops/?PAGEN_1=0") is None
+    cache.close()
+
+def test_unchanged_body_keeps_its_products_and_validators(tmp_path):
+    cache = ResponseCache(str(tmp_path / "cache.sqlite"))
+    url = "https://shop.kz/laptops/"
+    assert cache.conditional_headers(url) == {}
+
+    assert cache.store(url, page(0), etag='"v1"', last_modified="Mon, 01 Jan 2024 00:00:00 GMT")
+    cache.set_products(url, [{"Name": "Acer Aspire 3"}])
+    assert cache.conditional_headers(url) == {"If-None-Match": '"v1"',
+                                              "If-Modified-Since": "Mon, 01 Jan 2024 00:00:00 GMT"}
+
+    assert not cache.store(url, page(0), etag='"v2"')
+    assert cache.is_unchanged(url)
+    assert cache.get_products(url) == [{"Name": "Acer Aspire 3"}]
+    assert cache.conditional_headers(url) == {"If-None-Match": '"v2"'}
+
+    # A changed body drops the products parsed from the old one
+    assert cache.store(url, page(1))
+    assert not cache.is_unchanged(url)
+    assert cache.get_products(url) is None
+    assert cache.not_modified(url) == page(1) and cache.is_unchanged(url)
+    cache.close()
@@ -0,0 +1,35 @@
+# Importing Necessary Libraries
+import os
+import subprocess
+import sys
+import numpy as np
+import pandas as pd
+from assessment import MODEL_NAME, SCORE_COLUMNS
+from conftest import ROOT
+from local_scoring import LocalScoringModel, calibrate
+
+def test_calibration_leaves_out_missing_scores_and_features(tmp_path):
+    # Laptops without a weight, as scraped cards without the spec
+    data = pd.read_csv(os.path.join(ROOT, "app", "data", "laptops_data.csv"), dtype={"laptop_id": str})
+    data.loc[::5, "weight"] = np.nan
+    catalogue_path = str(tmp_path / "laptops_data.csv")
+    data.to_csv(catalogue_path, index=False)
+
+    rng = np.random.default_rng(0)
+    scores = pd.DataFrame(rng.integers(0, 11, (len(data), len(SCORE_COLUMNS))).astype(float),
+                          columns=list(SCORE_COLUMNS.values()))
+    scores.insert(0, "laptop_id", data["laptop_id"])
+    scores.insert(1, "model_name", MODEL_NAME)
+    scores.iloc[::7, 2] = np.nan
+    scores_path = str(tmp_path / "laptop_scores.parquet")
+    scores.to_parquet(scores_path, index=False)
+
+    output = str(tmp_path / "local_model.json")
+    model = calibrate(catalogue_path, scores_path, output)
+    assert np.isfinite(model.weights).all()
+    assert np.array_equal(LocalScoringModel.load(output).weights, model.weights)
+
+def test_scoring_modules_import_in_any_order():
+    for module in ("local_scoring", "scoring", "prescore"):
+        subprocess.run([sys.executable, "-c", f"import {module}"], cwd=os.path.join(ROOT, "app"),
+                       check=True, capture_output=True)
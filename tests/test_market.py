@@ -0,0 +1,66 @@
+# Importing Necessary Libraries
+import os
+import shutil
+import numpy as np
+import pandas as pd
+import pytest
+from catalogue import read_catalogue_csv
+from conftest import ROOT
+from market import DIMENSIONS, MarketCube, get_fingerprints_path, update_market_cube
+
+CATALOGUE_PATH = os.path.join(ROOT, "app", "data", "laptops_data.csv")
+
+@pytest.fixture(scope="module")
+def data() -> pd.DataFrame:
+    return read_catalogue_csv(CATALOGUE_PATH)
+
+def next_scrape(data: pd.DataFrame) -> pd.DataFrame:
+    # Some laptops repriced, some gone, one new and one changing its RAM
+    scrape = data.drop(index=data.index[5:40:7]).copy()
+    scrape.loc[scrape.index[:30:3], "current_price"] = scrape["current_price"].iloc[:30:3] * 0.9
+    scrape.loc[scrape.index[50], "ram"] = 64
+    added = scrape.iloc[[100]].copy()
+    added["laptop_id"] = "new-laptop"
+    added["brand"] = "Framework"
+    return pd.concat([scrape, added], ignore_index=True)
+
+def get_cells(cube: MarketCube) -> pd.DataFrame:
+    cells = cube.cells.copy()
+    cells[DIMENSIONS] = cells[DIMENSIONS].astype(str)
+    return cells.sort_values(DIMENSIONS, ignore_index=True)
+
+def test_refresh_matches_a_full_rebuild(data):
+    scrape = next_scrape(data)
+    cube = MarketCube.build(data)
+
+    refreshed = cube.refresh(scrape)
+    pd.testing.assert_frame_equal(get_cells(refreshed), get_cells(MarketCube.build(scrape)))
+    assert refreshed.get(brand="Framework").count == 1
+    assert cube.refresh(data) is cube
+
+def test_saved_cube_is_refreshed_when_the_catalogue_changes(data, tmp_path, monkeypatch):
+    catalogue_path = str(tmp_path / "laptops_data.csv")
+    path = str(tmp_path / "market_cube.parquet")
+    shutil.copy(CATALOGUE_PATH, catalogue_path)
+    built = update_market_cube(catalogue_path, path)
+    assert os.path.exists(path) and os.path.exists(get_fingerprints_path(path))
+
+    scrape = next_scrape(data)
+    scrape.to_csv(catalogue_path, index=False)
+    os.utime(catalogue_path, (os.path.getmtime(path) + 10, os.path.getmtime(path) + 10))
+
+    # The saved cube is refreshed, never rebuilt
+    def build(cls, data):
+        raise AssertionError("the saved cube was rebuilt")
+    monkeypatch.setattr(MarketCube, "build", classmethod(build))
+    refreshed = update_market_cube(catalogue_path, path)
+    monkeypatch.undo()
+
+    expected = get_cells(MarketCube.build(read_catalogue_csv(catalogue_path)))
+    # Saved statistics are float32
+    pd.testing.assert_frame_equal(get_cells(refreshed), expected, check_dtype=False, rtol=1e-6)
+    assert len(refreshed.cells) != len(built.cells)
+
+    loaded, saved_mtime = MarketCube.load(path)
+    assert saved_mtime == str(os.path.getmtime(catalogue_path))
+    assert np.array_equal(get_cells(loaded)["count"], expected["count"])
@@ -0,0 +1,54 @@
+# Importing Necessary Libraries
+import difflib
+import os
+import random
+import pandas as pd
+import pytest
+from conftest import ROOT
+from matching import FUZZY_CUTOFF, MatchIndex
+
+@pytest.fixture(scope="module")
+def index() -> MatchIndex:
+    data = pd.read_csv(os.path.join(ROOT, "app", "data", "laptops_data.csv"), dtype={"laptop_id": str})
+    return MatchIndex(data, {})
+
+def add_typos(token: str, rng: random.Random) -> str:
+    letters = list(token)
+    for _ in range(rng.randint(1, 2)):
+        position = rng.randrange(len(letters))
+        operation = rng.choice(["replace", "delete", "insert"])
+        if operation == "replace":
+            letters[position] = rng.choice("abcdefghijklmnopqrstuvwxyz")
+        elif operation == "delete" and len(letters) > 4:
+            del letters[position]
+        else:
+            letters.insert(position, rng.choice("abcdefghijklmnopqrstuvwxyz"))
+    return "".join(letters)
+
+def test_bigram_candidates_resolve_like_the_whole_vocabulary(index):
+    rng = random.Random(0)
+    words = sorted(token for token in index.postings if len(token) >= 4 and token.isalpha())
+    for _ in range(500):
+        token = add_typos(rng.choice(words), rng)
+        if token in index.postings:
+            continue
+        close = difflib.get_close_matches(token, list(index.postings), n=1, cutoff=FUZZY_CUTOFF)
+        expected = (close[0], difflib.SequenceMatcher(None, token, close[0]).ratio()) if close else None
+        assert index.resolve_token(token) == expected
+
+def test_resolved_token_survives_a_cleared_memo(index):
+    # Another session clearing the memo between the write and the return does not lose the result
+    index.fuzzy_tokens.clear()
+    resolved = index.resolve_token("vivobok")
+    index.fuzzy_tokens.clear()
+    assert resolved == index.resolve_token("vivobok") == ("vivobook", pytest.approx(14 / 15))
+
+def test_misspelled_suggestion_matches_the_catalogue(index):
+    config = {"Name": "Apple MacBok Air", "CPU": "Apple M2", "GPU": "", "RAM": "8GB", "Display Size": "13.6"}
+    matches = index.match(config, k=3)
+
+    assert len(matches) == 3
+    assert all(match["name"].startswith("Apple MacBook Air") for match in matches)
+    assert [match["score"] for match in matches] == sorted((match["score"] for match in matches), reverse=True)
+    assert index.match(config, k=1)[0]["score"] == matches[0]["score"]
+    assert index.match({"Name": "zzzz"}) == []
@@ -0,0 +1,68 @@
+# Importing Necessary Libraries
+import os
+import pytest
+from parsers import ListingPage, is_captcha_page, parse_page_lxml, parse_page_soup
+
+FIXTURE_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                            "benchmarks", "fixtures", "listing_page.html")
+
+# Cards the saved page does not cover: missing price, comment inside a spec prop, escaped values
+EDGE_CASE_PAGE = """<!DOCTYPE html>
+<html><head><title>Ноутбуки</title></head><body>
+<div data-id="1">
+  <div class="bx_catalog_item_title"><a title="Ноутбук ASUS &quot;Zenbook&quot; 14 &amp; Pen 1"></a></div>
+  <div class="bx_catalog_item_scu_code" text="1"></div>
+  <div class="bx_catalog_item_price"><span class="current_price">199 990 ₸</span></div>
+  <div class="bx_catalog_item_spec">
+    <div><span class="bx_catalog_item_prop">Процессор<!-- promo -->:</span><span class="bx_catalog_item_value">Intel &lt;Core&gt; i5</span></div>
+    <div><span class="bx_catalog_item_prop">Вес:</span><span class="bx_catalog_item_value"> 1,5 <b>кг</b> </span></div>
+    <div><span class="bx_catalog_item_prop">Без значения:</span></div>
+  </div>
+</div>
+<div data-id="2" class="bx_catalog_item">
+  <div class="item_image_container"><img src="/lazy.svg"></div>
+  <div class="bx_catalog_item_scu_code" text="2&amp;3"></div>
+  <div class="bx_catalog_item_price"><span class="old_price">&#8377; 10</span> <span class="current_price"><s>9</s> 8</span></div>
+</div>
+<div class="bx-pagination"><ul><li><a href="?PAGEN_1=1&amp;sort=price">1</a></li><li><a>…</a></li>
+<li class="bx-pag-next"><a href="/offers/noutbuki/?PAGEN_1=2">Вперед</a></li></ul></div>
+</body></html>
+"""
+
+@pytest.mark.parametrize("name", ["fixture", "edge cases"])
+def test_lxml_backend_matches_bs4(name):
+    if name == "fixture":
+        with open(FIXTURE_PATH, encoding="utf-8") as file:
+            text = file.read()
+    else:
+        text = EDGE_CASE_PAGE
+
+    products, page = parse_page_lxml(text)
+    expected_products, expected_page = parse_page_soup(text)
+
+    assert products == expected_products
+    assert page == expected_page
+    assert isinstance(page, ListingPage)
+    assert products
+
+def test_saved_page_is_fully_parsed():
+    with open(FIXTURE_PATH, encoding="utf-8") as file:
+        products, page = parse_page_lxml(file.read())
+
+    assert all({"laptop id", "title", "current price"} <= product.keys() for product in products)
+    assert page.next_href is not None
+
+def test_edge_case_values():
+    products, page = parse_page_lxml(EDGE_CASE_PAGE)
+
+    assert products[0]["title"] == 'ASUS "Zenbook" 14 & Pen'
+    assert "current price" not in products[0]
+    assert products[0]["Процессор"] == "Intel <Core> i5"
+    assert products[0]["Вес"] == "1,5кг"
+    assert products[1]["laptop id"] == "2&3"
+    assert "image link" not in products[1]
+    assert page == ListingPage("/offers/noutbuki/?PAGEN_1=2", ["?PAGEN_1=1&sort=price", "/offers/noutbuki/?PAGEN_1=2"])
+
+def test_captcha_check():
+    assert is_captcha_page("<html><head><title>Robot Check</title></head></html>")
+    assert not is_captcha_page(EDGE_CASE_PAGE)
@@ -0,0 +1,68 @@
+# Importing Necessary Libraries
+import asyncio
+import json
+from pipeline import Pipeline, Stage, open_archive
+from sinks import get_sink
+
+ARCHIVE_URL = "https://shop.kz/offers/noutbuki/"
+
+def render_page(page: int) -> str:
+    cards = "".join(f'<div data-id="{page}-{card}"><div class="bx_catalog_item_scu_code" text="{page}-{card}"></div></div>'
+                    for card in range(2))
+    return f"<html><head><title>Ноутбуки</title></head><body>{cards}</body></html>"
+
+def get_page_url(page: int) -> str:
+    return ARCHIVE_URL if page == 1 else f"{ARCHIVE_URL}?PAGEN_1={page}"
+
+def test_archive_is_never_evicted(tmp_path):
+    archive = open_archive(str(tmp_path / "archive.sqlite"))
+    archive.store(get_page_url(1), render_page(1) * 10_000)
+    archive.connection.execute("UPDATE responses SET fetched_at = ?, accessed_at = ?", (0, 0))
+    archive.connection.commit()
+    archive.close()
+
+    # Reopening evicts expired and oversized entries of a regular cache
+    archive = open_archive(str(tmp_path / "archive.sqlite"))
+    assert archive.get_body(get_page_url(1)) == render_page(1) * 10_000
+    archive.close()
+
+def test_reparse_keeps_page_order_and_counts_lost_pages(tmp_path):
+    archive = open_archive(str(tmp_path / "archive.sqlite"))
+    for page in range(1, 6):
+        archive.store(get_page_url(page), render_page(page))
+
+    sink = get_sink("jsonl", str(tmp_path / "laptops.jsonl"))
+    original = archive.get_body
+
+    # Page 3 is listed in the archive but its body can no longer be read
+    def get_body(url: str):
+        return None if url == get_page_url(3) else original(url)
+
+    archive.get_body = get_body
+    stats = asyncio.run(Pipeline(sink, {}).reparse(archive, ARCHIVE_URL))
+    archive.close()
+
+    with open(tmp_path / "laptops.jsonl", encoding="utf-8") as file:
+        ids = [json.loads(line)["laptop id"] for line in file]
+    assert ids == [f"{page}-{card}" for page in (1, 2, 4, 5) for card in range(2)]
+    assert stats["archive"]["failed"] == 1
+    assert stats["parse"]["failed"] == 0
+    assert stats["batch"]["processed"] == 5
+
+def test_stage_counts_failed_items():
+    async def handle(item: int) -> None:
+        if item % 2:
+            raise ValueError(item)
+
+    async def run() -> Stage:
+        stage = Stage("test", 2, handle, 4)
+        task = asyncio.ensure_future(stage.run())
+        for item in range(6):
+            await stage.put(item)
+        await stage.close()
+        await task
+        return stage
+
+    stats = asyncio.run(run()).get_stats()
+    assert stats["processed"] == 6
+    assert stats["failed"] == 3
@@ -0,0 +1,98 @@
+# Importing Necessary Libraries
+import asyncio
+import os
+import time
+from types import SimpleNamespace
+import pandas as pd
+import pytest
+import scoring
+from conftest import ROOT
+from prescore import prescore_catalogue, save_scores
+from retries import RETRY_POLICIES, RetryPolicy
+from scoring import MODEL_NAME, SCORE_COLUMNS, FakeCompletionClient, lookup_catalogue_scores
+
+class SilentCompletionClient(FakeCompletionClient):
+    """
+    Fake backend whose assessment replies never contain a score.
+    """
+    def complete(self, prompt: str, model: str = MODEL_NAME) -> str:
+        self.calls += 1
+        return "I am unable to rate laptops."
+
+class StatusError(Exception):
+    """
+    API error carrying the HTTP status of the answer, as raised by the Groq client.
+
+    Args:
+        status_code (int): Status of the answer.
+        retry_after (str): Retry-After header of the answer.
+    """
+    def __init__(self, status_code: int, retry_after: str = None) -> None:
+        super().__init__(f"Error code: {status_code}")
+        self.status_code = status_code
+        self.response = SimpleNamespace(headers={"Retry-After": retry_after} if retry_after else {})
+
+class FailingCompletionClient(FakeCompletionClient):
+    """
+    Fake backend raising the given errors before answering.
+
+    Args:
+        errors (List[Exception]): Errors raised by the first calls.
+    """
+    def __init__(self, errors) -> None:
+        super().__init__()
+        self.errors = list(errors)
+
+    def complete(self, prompt: str, model: str = MODEL_NAME) -> str:
+        if self.errors:
+            self.calls += 1
+            raise self.errors.pop(0)
+        return super().complete(prompt, model)
+
+@pytest.fixture(scope="module")
+def catalogue() -> pd.DataFrame:
+    data = pd.read_csv(os.path.join(ROOT, "app", "data", "laptops_data.csv"), dtype={"laptop_id": str})
+    return data.head(4)
+
+def test_scores_of_other_models_are_kept(tmp_path, catalogue):
+    path = str(tmp_path / "laptop_scores.parquet")
+    other = {"laptop_id": catalogue["laptop_id"].iloc[0], "model_name": "other-model",
+             **{column: 1.0 for column in SCORE_COLUMNS.values()}}
+    save_scores([other], path)
+
+    client = FakeCompletionClient()
+    scores = asyncio.run(prescore_catalogue(catalogue, client, path, rate=100, checkpoint_every=2))
+    assert client.calls == len(catalogue)
+    assert sorted(scores["model_name"].value_counts().items()) == [(MODEL_NAME, 4), ("other-model", 1)]
+
+    # A second run has nothing left to score for the model
+    assert asyncio.run(prescore_catalogue(catalogue, client, path, rate=100)).equals(scores)
+    assert client.calls == len(catalogue)
+
+    scoring.get_shared_catalogue_scores.clear()
+    laptop_id = catalogue["laptop_id"].iloc[0]
+    own = scores[(scores["laptop_id"] == laptop_id) & (scores["model_name"] == MODEL_NAME)]
+    assert lookup_catalogue_scores(laptop_id, path)["Gaming"] == own["gaming"].iloc[0]
+    assert lookup_catalogue_scores(laptop_id, path, model="other-model")["Gaming"] == 1.0
+    assert lookup_catalogue_scores(laptop_id, path, model="unknown") is None
+    scoring.get_shared_catalogue_scores.clear()
+
+def test_final_failed_attempt_does_not_back_off(tmp_path, catalogue):
+    client = SilentCompletionClient()
+    start = time.monotonic()
+    scores = asyncio.run(prescore_catalogue(catalogue.head(1), client, str(tmp_path / "scores.parquet"),
+                                            rate=100, retries=1))
+    # The only attempt failed, a backoff would have slept at least a second
+    assert time.monotonic() - start < 1
+    assert scores.empty
+
+def test_throttled_requests_are_retried_and_rejected_ones_are_not(tmp_path, catalogue, monkeypatch):
+    monkeypatch.setitem(RETRY_POLICIES, "throttled", RetryPolicy(base_delay=0.01, max_delay=0.01, max_attempts=5))
+    laptop = catalogue.head(1)
+    client = FailingCompletionClient([StatusError(429, retry_after="0")])
+    scores = asyncio.run(prescore_catalogue(laptop, client, str(tmp_path / "throttled.parquet"), rate=100))
+    assert len(scores) == 1 and client.calls == 2
+
+    client = FailingCompletionClient([StatusError(401)])
+    scores = asyncio.run(prescore_catalogue(laptop, client, str(tmp_path / "rejected.parquet"), rate=100))
+    assert scores.empty and client.calls == 1
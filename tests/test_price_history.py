@@ -0,0 +1,70 @@
+# Importing Necessary Libraries
+import os
+from typing import Tuple
+import pandas as pd
+import pytest
+from conftest import ROOT
+from price_history import LISTED, PRICE_FIELD, PriceHistory, RunSummary, read_products, record_file
+
+@pytest.fixture(scope="module")
+def products() -> pd.DataFrame:
+    return read_products(os.path.join(ROOT, "scraper", "data", "laptops.csv")).head(50)
+
+def save_run(products: pd.DataFrame, path: str, mtime: float) -> str:
+    products.to_csv(path, index=False)
+    os.utime(path, (mtime, mtime))
+    return path
+
+def to_catalogue(snapshot: pd.DataFrame, products: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    # Snapshot and scraped catalogue laid out alike, fields empty for every laptop are not stored
+    expected = products.set_index("laptop id").dropna(axis=1, how="all").sort_index()
+    return snapshot.set_index("laptop id")[expected.columns].sort_index(), expected
+
+def test_runs_store_deltas_and_rebuild_their_catalogue(products, tmp_path):
+    history_path = str(tmp_path / "price_history.sqlite")
+    first = record_file(save_run(products, str(tmp_path / "run1.csv"), 1_700_000_000), history_path)
+    assert first == RunSummary(1, len(products), 0, int(products.drop(columns="laptop id").notna().sum().sum())
+                               + len(products))
+
+    # Three laptops repriced and five delisted, only those changes are written
+    second_run = products.head(45).copy()
+    second_run.loc[:2, PRICE_FIELD] = "99 990 ₸"
+    second = record_file(save_run(second_run, str(tmp_path / "run2.csv"), 1_700_086_400), history_path)
+    assert second == RunSummary(2, 0, 5, 3 + 5)
+
+    history = PriceHistory(history_path)
+    try:
+        changes = history.get_price_changes()
+        assert sorted(changes["laptop_id"]) == sorted(products["laptop id"].head(3))
+        assert (changes["new_price"] == 99990).all() and (changes["change"] < 0).all()
+        assert history.get_listing_changes() == ([], sorted(products["laptop id"].iloc[45:]))
+
+        series = history.get_series(products["laptop id"].iloc[0])
+        assert series["run_id"].tolist() == [1, 2]
+        assert series["price"].iloc[-1] == 99990
+
+        for run_id, catalogue in ((1, products), (2, second_run)):
+            snapshot, expected = to_catalogue(history.get_snapshot(run_id), catalogue)
+            pd.testing.assert_frame_equal(snapshot, expected, check_names=False)
+        assert history.get_size() == {"runs": 2, "changes": first.changes + second.changes,
+                                      "latest": first.changes}
+    finally:
+        history.close()
+
+def test_delisted_laptops_listed_again_only_record_the_listing(products, tmp_path):
+    history = PriceHistory(str(tmp_path / "price_history.sqlite"))
+    try:
+        history.record_run(products, 1_700_000_000)
+        history.record_run(products.head(45), 1_700_086_400)
+        relisted = history.record_run(products, 1_700_172_800)
+        assert relisted == RunSummary(3, 5, 0, 5)
+
+        latest = history.get_latest()
+        assert (latest.loc[latest["field"] == LISTED, "value"] == "1").all()
+        snapshot, expected = to_catalogue(history.get_snapshot(), products)
+        pd.testing.assert_frame_equal(snapshot, expected, check_names=False)
+
+        # An unchanged catalogue writes nothing but the run itself
+        assert history.record_run(products, 1_700_259_200) == RunSummary(4, 0, 0, 0)
+    finally:
+        history.close()
@@ -0,0 +1,66 @@
+# Importing Necessary Libraries
+import os
+import numpy as np
+import pandas as pd
+import pytest
+from catalogue import read_catalogue_csv
+from conftest import ROOT
+from query import Query, QueryEngine
+
+@pytest.fixture(scope="module")
+def engine() -> QueryEngine:
+    return QueryEngine(read_catalogue_csv(os.path.join(ROOT, "app", "data", "laptops_data.csv")))
+
+def test_queries_do_not_share_their_filters(engine):
+    first, second = Query(), Query()
+    assert first.values is None and first.ranges is None and first.contains is None
+
+    # Filters are given per query, none of them lands in the defaults of the others
+    narrowed = first._replace(values={"brand": ["Apple"]})
+    assert second.values is None
+    assert engine.execute(second).total == engine.size
+    assert 0 < engine.execute(narrowed).total < engine.size
+    assert np.array_equal(engine.execute(Query(values={}, ranges={}, contains={})).positions,
+                          engine.execute(Query()).positions)
+
+def reference_search(data: pd.DataFrame, query: Query) -> np.ndarray:
+    # The same search evaluated row by row with plain pandas, empty filters do not filter
+    mask = pd.Series(True, index=data.index)
+    for column, values in (query.values or {}).items():
+        if values:
+            mask &= data[column].astype(object).isin(values)
+    for column, substring in (query.contains or {}).items():
+        if substring:
+            mask &= data[column].astype(str).str.contains(substring, case=False, regex=False) & data[column].notna()
+    for column, (low, high) in (query.ranges or {}).items():
+        if low is None and high is None:
+            continue
+        values = data[column].astype(np.float64)
+        mask &= values.notna()
+        if low is not None:
+            mask &= values >= low
+        if high is not None:
+            mask &= values <= high
+
+    matching = pd.DataFrame({"position": np.flatnonzero(mask)})
+    if query.sort_by is not None:
+        matching["key"] = data[query.sort_by].astype(np.float64).to_numpy()[matching["position"]]
+        matching = matching.sort_values(["key", "position"], ascending=[query.ascending, True], na_position="last")
+    return matching["position"].to_numpy()
+
+@pytest.mark.parametrize("query", [
+    Query(values={"brand": ["HP", "Lenovo"]}, sort_by="current_price"),
+    Query(contains={"gpu": "rtx"}, ranges={"ram": (16, None)}, sort_by="weight", ascending=False, page=2),
+    Query(ranges={"display_diagonal": (14, 15.6)}, sort_by="ram", ascending=False, page=1, page_size=50),
+    Query(values={"brand": ["Apple", "No Such Brand"]}, ranges={"current_price": (None, 1_000_000)}),
+    Query(sort_by="old_price", page=118),
+    Query(values={"brand": []}, contains={"gpu": ""}, ranges={"ram": (None, None)}, page=3),
+])
+def test_search_matches_a_pandas_scan(engine, query):
+    expected = reference_search(engine.data, query)
+    result = engine.execute(query)
+
+    start = query.page * query.page_size
+    assert result.total == len(expected)
+    assert np.array_equal(result.positions, expected[start:start + query.page_size])
+    assert result.rows.index.equals(engine.data.index[result.positions])
@@ -0,0 +1,66 @@
+# Importing Necessary Libraries
+import asyncio
+from typing import List
+import pytest
+from responses import (CONFIG_FIELDS, ResponseError, arequest_structured, extract_pairs,
+                       parse_config_reply, parse_score_reply, request_structured)
+
+class ScriptedClient:
+    """
+    Completion backend answering with prepared replies in order.
+
+    Args:
+        replies (List[str]): Replies given to successive requests.
+    """
+    def __init__(self, replies: List[str]) -> None:
+        self.replies = list(replies)
+        self.prompts: List[str] = []
+
+    def complete(self, prompt: str, model: str) -> str:
+        self.prompts.append(prompt)
+        return self.replies.pop(0)
+
+    async def acomplete(self, prompt: str, model: str) -> str:
+        return self.complete(prompt, model)
+
+def test_markdown_markers_are_stripped_from_keys_and_values():
+    pairs, structured = extract_pairs("**Name:** Dell XPS 13\n* **CPU**: *Intel Core i7-1360P*\n__RAM__ - 16GB")
+    assert not structured
+    assert pairs == {"Name": "Dell XPS 13", "CPU": "Intel Core i7-1360P", "RAM": "16GB"}
+
+def test_first_json_object_is_kept_when_braces_follow_it():
+    pairs, structured = extract_pairs('Sure! {"Name": "Dell XPS 13", "RAM": "16GB"} hope {this} helps')
+    assert structured
+    assert pairs == {"Name": "Dell XPS 13", "RAM": "16GB"}
+
+    # A brace that does not start an object is skipped
+    pairs, structured = extract_pairs('Scores {see below}: {"Gaming": 7}')
+    assert structured and pairs == {"Gaming": 7}
+
+def test_missing_fields_are_asked_for_again():
+    client = ScriptedClient(['{"Gaming": 7, "Software Development": 8, "Video Editing": 6}',
+                             "* General Use - 9\n* Graphic Design - 5\n* Data Science - 7/10"])
+    scores = request_structured(client, "Rate it", "model", parse_score_reply)
+
+    assert scores == {"Gaming": 7, "Software Development": 8, "Video Editing": 6,
+                      "General Use": 9, "Graphic Design": 5, "Data Science": 7}
+    assert len(client.prompts) == 2
+    assert "General Use, Graphic Design, Data Science" in client.prompts[1]
+
+def test_asynchronous_request_repairs_like_the_synchronous_one():
+    replies = ['**Name:** Dell XPS 13\n**CPU:** Intel Core i7', '{"GPU": "Intel Iris Xe"}',
+               '{"Display Size": "13.4", "Resolution": "1920x1200", "RAM": "16GB", '
+               '"SSD/HDD Capacity": "512GB SSD", "Price": 1299}']
+    config = request_structured(ScriptedClient(replies), "Suggest one", "model", parse_config_reply)
+    assert asyncio.run(arequest_structured(ScriptedClient(replies), "Suggest one", "model",
+                                           parse_config_reply)) == config
+    assert list(config) == ["Name", "CPU", "GPU", "Display Size", "Resolution", "RAM",
+                            "SSD/HDD Capacity", "Price"]
+    assert config["Name"] == "Dell XPS 13" and config["Price"] == "$1299"
+
+def test_reply_still_incomplete_after_the_budget_raises():
+    client = ScriptedClient(['{"Name": "Dell XPS 13"}', "no idea", "still no idea"])
+    with pytest.raises(ResponseError) as error:
+        asyncio.run(arequest_structured(client, "Suggest one", "model", parse_config_reply, budget=2))
+    assert error.value.missing == CONFIG_FIELDS[1:]
+    assert len(client.prompts) == 3
@@ -0,0 +1,182 @@
+# Importing Necessary Libraries
+import asyncio
+import time
+from collections import Counter
+from typing import List, Optional, Tuple
+from urllib.parse import urlparse
+import pytest
+from aiohttp import ClientSession, ClientTimeout, web
+from aiohttp.test_utils import TestServer
+import retry
+from retry import CircuitBreaker, RetryPolicy
+from scraper import request_with_retries
+
+CAPTCHA_PAGE = "<html><head><title>Robot Check</title></head><body></body></html>"
+LISTING_PAGE = "<html><head><title>Ноутбуки</title></head><body>ok</body></html>"
+
+# Millisecond backoff, so a test exercises every policy in well under a second
+FAST_POLICIES = {
+    "throttled": RetryPolicy(base_delay=0.01, max_delay=0.02, max_attempts=3),
+    "server": RetryPolicy(base_delay=0.01, max_delay=0.02, max_attempts=3),
+    "network": RetryPolicy(base_delay=0.01, max_delay=0.02, max_attempts=2),
+    "captcha": RetryPolicy(base_delay=0.01, max_delay=0.02, max_attempts=2),
+}
+
+class FaultyServer:
+    """
+    Stand-in shop answering every request with the next fault of a script.
+
+    Args:
+        script (List[Tuple[int, str, dict]]): Status, body and headers of successive answers, the last one repeats.
+        delay (float): Seconds taken by every answer.
+    """
+    def __init__(self, script: List[Tuple[int, str, dict]], delay: float = 0) -> None:
+        self.script = script
+        self.delay = delay
+        self.hits: Counter = Counter()
+        self.times: List[float] = []
+
+    async def handle(self, request: web.Request) -> web.Response:
+        index = min(self.hits[request.path], len(self.script) - 1)
+        self.hits[request.path] += 1
+        self.times.append(time.monotonic())
+        await asyncio.sleep(self.delay)
+        status, body, headers = self.script[index]
+        return web.Response(status=status, text=body, headers=headers, content_type="text/html")
+
+async def fetch(server: FaultyServer, deadline: float = 5, timeout: float = 5,
+                breaker: Optional[CircuitBreaker] = None) -> Optional[str]:
+    app = web.Application()
+    app.router.add_get("/{page}", server.handle)
+    async with TestServer(app) as test_server:
+        url = str(test_server.make_url("/page"))
+        if breaker:
+            retry.BREAKERS[urlparse(url).netloc] = breaker
+        async with ClientSession(timeout=ClientTimeout(total=timeout)) as session:
+            return await request_with_retries(url, {}, session, deadline=deadline, policies=FAST_POLICIES)
+
+@pytest.fixture(autouse=True)
+def fresh_breakers():
+    retry.BREAKERS.clear()
+    yield
+    retry.BREAKERS.clear()
+
+@pytest.mark.parametrize("status", [403, 404])
+def test_client_errors_are_not_retried(status):
+    server = FaultyServer([(status, "", {})])
+    result = asyncio.run(fetch(server))
+
+    assert result is None
+    assert server.hits["/page"] == 1
+
+def test_server_errors_are_retried_until_success():
+    server = FaultyServer([(500, "", {}), (503, "", {}), (200, LISTING_PAGE, {})])
+    result = asyncio.run(fetch(server))
+
+    assert result == LISTING_PAGE
+    assert server.hits["/page"] == 3
+
+def test_attempts_are_capped_per_failure_kind():
+    server = FaultyServer([(500, "", {})])
+    result = asyncio.run(fetch(server))
+
+    # First attempt plus the retries of the "server" policy
+    assert result is None
+    assert server.hits["/page"] == 1 + FAST_POLICIES["server"].max_attempts
+
+def test_network_errors_and_timeouts_are_retried():
+    server = FaultyServer([(200, LISTING_PAGE, {})], delay=0.3)
+    result = asyncio.run(fetch(server, timeout=0.05))
+
+    assert result is None
+    assert server.hits["/page"] == 1 + FAST_POLICIES["network"].max_attempts
+
+def test_retry_after_pauses_the_host():
+    server = FaultyServer([(429, "", {"Retry-After": "1"}), (200, LISTING_PAGE, {})])
+    start = time.monotonic()
+    result = asyncio.run(fetch(server))
+
+    assert result == LISTING_PAGE
+    assert server.hits["/page"] == 2
+    assert server.times[1] - server.times[0] >= 0.95
+    assert time.monotonic() - start >= 0.95
+
+def test_retry_after_past_the_deadline_gives_up():
+    server = FaultyServer([(503, "", {"Retry-After": "30"})])
+    start = time.monotonic()
+    result = asyncio.run(fetch(server, deadline=0.5))
+
+    assert result is None
+    assert server.hits["/page"] == 1
+    assert time.monotonic() - start < 0.5
+
+def test_deadline_bounds_a_request():
+    policies = {**FAST_POLICIES, "server": RetryPolicy(base_delay=0.2, max_delay=0.2, max_attempts=100)}
+    server = FaultyServer([(500, "", {})])
+
+    async def run() -> float:
+        app = web.Application()
+        app.router.add_get("/{page}", server.handle)
+        async with TestServer(app) as test_server, ClientSession() as session:
+            start = time.monotonic()
+            result = await request_with_retries(str(test_server.make_url("/page")), {}, session,
+                                                deadline=0.5, policies=policies)
+            assert result is None
+            return time.monotonic() - start
+
+    assert asyncio.run(run()) < 0.6
+    assert 1 <= server.hits["/page"] < 100
+
+def test_captcha_pages_are_retried_with_their_own_policy():
+    server = FaultyServer([(200, CAPTCHA_PAGE, {}), (200, LISTING_PAGE, {})])
+    result = asyncio.run(fetch(server))
+
+    assert result == LISTING_PAGE
+    assert server.hits["/page"] == 2
+
+    server = FaultyServer([(200, CAPTCHA_PAGE, {})])
+    result = asyncio.run(fetch(server))
+
+    assert result is None
+    assert server.hits["/page"] == 1 + FAST_POLICIES["captcha"].max_attempts
+
+def test_breaker_opens_on_captcha_spike_and_closes_after_cooldown():
+    breaker = CircuitBreaker(threshold=0.5, window=4, min_samples=2, cooldown=0.3, max_cooldown=1)
+    server = FaultyServer([(200, CAPTCHA_PAGE, {}), (200, CAPTCHA_PAGE, {}), (200, LISTING_PAGE, {})])
+    result = asyncio.run(fetch(server, breaker=breaker))
+
+    # Two CAPTCHA pages open the breaker, the third attempt waits for the cooldown (half-open) and succeeds
+    assert result == LISTING_PAGE
+    assert breaker.trips == 1
+    assert server.times[2] - server.times[1] >= 0.29
+    assert not breaker.is_open()
+    assert breaker.cooldown == breaker.base_cooldown
+
+def test_breaker_cooldown_doubles_on_consecutive_trips():
+    breaker = CircuitBreaker(threshold=0.5, window=4, min_samples=2, cooldown=0.1, max_cooldown=0.3)
+    for expected in (0.2, 0.3, 0.3):
+        breaker.record_captcha()
+        breaker.record_captcha()
+        assert breaker.is_open()
+        assert breaker.cooldown == pytest.approx(expected)
+        # Responses are only counted again once the pause is over
+        breaker.open_until = 0.0
+    assert breaker.trips == 3
+
+    breaker.record_success()
+    assert breaker.cooldown == breaker.base_cooldown
+
+def test_breaker_open_past_the_deadline_gives_up_without_requests():
+    breaker = CircuitBreaker()
+    breaker.pause(30)
+    server = FaultyServer([(200, LISTING_PAGE, {})])
+    result = asyncio.run(fetch(server, deadline=0.5, breaker=breaker))
+
+    assert result is None
+    assert server.hits["/page"] == 0
+
+def test_retry_after_dates_are_parsed():
+    assert retry.parse_retry_after("120") == 120
+    assert retry.parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0
+    assert retry.parse_retry_after("soon") is None
+    assert retry.parse_retry_after(None) is None
@@ -0,0 +1,134 @@
+# Importing Necessary Libraries
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import pandas as pd
+import pytest
+import scoring
+from assessment import build_assessment_prompt, get_catalogue_config
+from conftest import ROOT
+from local_scoring import score_config
+from scoring import FakeCompletionClient, ScoreStore, assess_many, get_config_key
+
+class SilentCompletionClient(FakeCompletionClient):
+    """
+    Fake backend whose assessment replies never contain a score.
+    """
+    def complete(self, prompt: str, model: str = scoring.MODEL_NAME) -> str:
+        self.calls += 1
+        return "I am unable to rate laptops."
+
+class BlockingCompletionClient(FakeCompletionClient):
+    """
+    Fake backend whose replies wait until the test releases them.
+
+    Args:
+        release (threading.Event): Set to let the replies through.
+    """
+    def __init__(self, release: threading.Event) -> None:
+        super().__init__()
+        self.release = release
+
+    def complete(self, prompt: str, model: str = scoring.MODEL_NAME) -> str:
+        self.release.wait(timeout=10)
+        return super().complete(prompt, model)
+
+class RerunException(Exception):
+    """
+    Stand-in for the exception Streamlit raises in a script whose session reruns.
+    """
+
+@pytest.fixture(scope="module")
+def assessments():
+    data = pd.read_csv(os.path.join(ROOT, "app", "data", "laptops_data.csv"), dtype={"laptop_id": str})
+    configs = [get_catalogue_config(row) for row in data.head(3).to_dict("records")]
+    return [(config, build_assessment_prompt(config)) for config in configs]
+
+@pytest.fixture
+def backend(tmp_path, monkeypatch):
+    store = ScoreStore(str(tmp_path / "scores.sqlite"))
+    client = FakeCompletionClient()
+    executor = ThreadPoolExecutor(max_workers=2)
+    monkeypatch.setattr(scoring, "SCORER", "llm")
+    monkeypatch.setattr(scoring, "get_score_store", lambda: store)
+    monkeypatch.setattr(scoring, "get_completion_client", lambda: client)
+    monkeypatch.setattr(scoring, "get_llm_executor", lambda: executor)
+    yield store, client
+    executor.shutdown(wait=True)
+
+def test_stored_assessments_are_not_requested_again(backend, assessments):
+    store, client = backend
+    first = assess_many(assessments, budget=5)
+    assert client.calls == len(assessments)
+    assert store.stats() == {"hits": 0, "misses": 3, "size": 3}
+
+    assert assess_many(assessments, budget=5) == first
+    assert client.calls == len(assessments)
+    assert store.stats()["hits"] == 3
+
+def test_failed_assessment_falls_back_to_local_scores(backend, assessments, monkeypatch):
+    store, _ = backend
+    monkeypatch.setattr(scoring, "get_completion_client", SilentCompletionClient)
+
+    config, prompt = assessments[0]
+    assert assess_many([(config, prompt)], budget=5) == [score_config(config)]
+    # The fallback is not stored, the next assessment asks the backend again
+    assert store.stats()["size"] == 0
+
+def test_expired_assessments_are_misses(tmp_path, monkeypatch):
+    store = ScoreStore(str(tmp_path / "scores.sqlite"), ttl=60)
+    store.put("key", {"Gaming": 7.0})
+    assert store.get("key") == {"Gaming": 7.0}
+
+    now = time.time()
+    monkeypatch.setattr(time, "time", lambda: now + 61)
+    assert store.get("key") is None
+    assert store.stats() == {"hits": 1, "misses": 1, "size": 1}
+
+    # Expired entries are dropped by the next store
+    store.put("other", {"Gaming": 5.0})
+    assert store.stats()["size"] == 1
+
+def test_least_recently_used_assessments_are_evicted_at_the_cap(tmp_path, monkeypatch):
+    store = ScoreStore(str(tmp_path / "scores.sqlite"), max_entries=2)
+    clock = iter(range(1_000_000_000, 1_000_000_100))
+    monkeypatch.setattr(time, "time", lambda: float(next(clock)))
+
+    store.put("a", {"Gaming": 1.0})
+    store.put("b", {"Gaming": 2.0})
+    assert store.get("a") is not None
+    store.put("c", {"Gaming": 3.0})
+
+    assert store.get("b") is None
+    assert store.get("a") == {"Gaming": 1.0} and store.get("c") == {"Gaming": 3.0}
+    assert store.stats()["size"] == 2
+
+def test_config_key_ignores_formatting():
+    assert (get_config_key({"GPU": "  GeForce  RTX 4060 ", "RAM": 16})
+            == get_config_key({"gpu": "geforce rtx 4060", "ram": 16.0}))
+    assert get_config_key({"RAM": 16}) != get_config_key({"RAM": 16}, model="other")
+
+def test_rerun_cancels_the_queued_requests(backend, assessments, monkeypatch):
+    store, _ = backend
+    release = threading.Event()
+    client = BlockingCompletionClient(release)
+    executor = ThreadPoolExecutor(max_workers=1)
+    monkeypatch.setattr(scoring, "get_completion_client", lambda: client)
+    monkeypatch.setattr(scoring, "get_llm_executor", lambda: executor)
+
+    def check_rerun():
+        raise RerunException()
+    monkeypatch.setattr(scoring, "check_rerun", check_rerun)
+
+    # The rerun stops the wait long before the budget, the requests still queued never start
+    start = time.monotonic()
+    with pytest.raises(RerunException):
+        assess_many(assessments, budget=5)
+    assert time.monotonic() - start < 1
+
+    release.set()
+    executor.shutdown(wait=True)
+    assert client.calls == 1
+    # The request already running still stores its reply for the next assessment
+    assert store.stats()["size"] == 1
@@ -0,0 +1,36 @@
+# Importing Necessary Libraries
+import os
+import numpy as np
+import pandas as pd
+import pytest
+import segments
+from catalogue import read_catalogue_csv
+from conftest import ROOT
+from segments import build_segment_index, pick_segment_row
+
+CATALOGUE_PATH = os.path.join(ROOT, "app", "data", "laptops_data.csv")
+
+@pytest.fixture(scope="module")
+def data() -> pd.DataFrame:
+    return read_catalogue_csv(CATALOGUE_PATH)
+
+def test_segments_match_a_row_by_row_scan(data):
+    index = build_segment_index(data)
+    is_gaming = np.array(["RTX" in str(gpu) for gpu in data["gpu"]]) & data["gpu"].notna().to_numpy()
+
+    assert np.array_equal(index["gaming laptop"], np.flatnonzero(is_gaming))
+    assert np.array_equal(index["laptop"], np.flatnonzero(~is_gaming))
+    assert np.array_equal(index["macbook"], np.flatnonzero(data["brand"] == "Apple"))
+
+def test_seeded_picks_are_reproducible(data, monkeypatch):
+    monkeypatch.setattr(segments, "load_catalogue", read_catalogue_csv)
+    index = build_segment_index(data)
+
+    for segment in ("gaming laptop", "macbook", "laptop"):
+        row = pick_segment_row(segment, seed=7, path=CATALOGUE_PATH)
+        assert row == pick_segment_row(segment, seed=7, path=CATALOGUE_PATH)
+        assert row in index[segment]
+
+    # LAPTOPIO_SEED is used when no seed is given
+    monkeypatch.setattr(segments, "SEED", "7")
+    assert pick_segment_row("laptop", path=CATALOGUE_PATH) == pick_segment_row("laptop", seed=7, path=CATALOGUE_PATH)
@@ -0,0 +1,48 @@
+# Importing Necessary Libraries
+import os
+import numpy as np
+import pytest
+from catalogue import read_catalogue_csv
+from conftest import ROOT
+from similarity import SimilarityIndex, get_cpu_vendor, parse_price
+
+APPLE_M2 = {"Name": "Apple MacBook Air M2", "CPU": "Apple M2", "GPU": "Apple M2 8-core GPU",
+            "RAM": "8GB", "SSD/HDD Capacity": "256GB SSD", "Price": "$1099"}
+
+@pytest.fixture(scope="module")
+def data():
+    return read_catalogue_csv(os.path.join(ROOT, "app", "data", "laptops_data.csv"))
+
+@pytest.fixture(scope="module")
+def index(data) -> SimilarityIndex:
+    return SimilarityIndex(data)
+
+def test_suggested_brand_and_cpu_vendor_come_first(data, index):
+    positions = index.query(APPLE_M2, 5, parse_price(APPLE_M2["Price"]))
+    assert (data["brand"].iloc[positions] == "Apple").all()
+
+    config = {"Name": "Lenovo Legion 5", "CPU": "AMD Ryzen 7 5800H", "GPU": "NVIDIA GeForce RTX 3060",
+              "RAM": "16GB", "SSD/HDD Capacity": "1TB SSD"}
+    positions = index.query(config, 5)
+    assert (data["cpu_brand"].iloc[positions] == "AMD").all()
+    assert data["brand"].iloc[positions[0]] == "Lenovo"
+
+def test_laptops_without_a_price_are_not_excluded_by_the_band(data, index):
+    price = parse_price(APPLE_M2["Price"])
+    positions = index.query(APPLE_M2, 20, price)
+    prices = data["current_price"].iloc[positions].to_numpy(dtype=float)
+
+    assert np.isnan(prices).any()
+    known = prices[~np.isnan(prices)]
+    assert (np.abs(known - price) <= 0.3 * price).all()
+
+def test_missing_query_price_applies_no_band(index):
+    assert index.query(APPLE_M2, 5, float("nan")) == index.query(APPLE_M2, 5, None)
+
+def test_cpu_vendor_names():
+    assert get_cpu_vendor("Apple M2") == "apple"
+    assert get_cpu_vendor("M2 Pro 10-core") == "apple"
+    assert get_cpu_vendor("Core m5") == "intel"
+    assert get_cpu_vendor("11th Gen Intel Core i3-1115G4") == "intel"
+    assert get_cpu_vendor("Ryzen 7 5800H") == "amd"
+    assert get_cpu_vendor("Snapdragon X Elite") is None
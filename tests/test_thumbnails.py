@@ -0,0 +1,112 @@
+# Importing Necessary Libraries
+import asyncio
+import io
+import os
+from collections import Counter
+from typing import Dict
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from PIL import Image
+import thumbnails
+from conftest import ROOT
+from thumbnails import THUMBNAIL_SIZE, ThumbnailStore, download_thumbnails
+
+def render_image(color: str, size: tuple = (1280, 960)) -> bytes:
+    output = io.BytesIO()
+    Image.new("RGB", size, color).save(output, format="JPEG")
+    return output.getvalue()
+
+class StandInImageHost:
+    """
+    Local stand-in of the shop's image host.
+
+    Args:
+        images (Dict[str, bytes]): Image bytes by path, paths missing here answer 404.
+        failures (Dict[str, int]): Number of 500 answers given before the image of a path.
+    """
+    def __init__(self, images: Dict[str, bytes], failures: Dict[str, int] = None) -> None:
+        self.images = images
+        self.failures = Counter(failures or {})
+        self.hits: Counter = Counter()
+
+    async def handle(self, request: web.Request) -> web.Response:
+        self.hits[request.path] += 1
+        if self.failures[request.path]:
+            self.failures[request.path] -= 1
+            return web.Response(status=500)
+        if request.path not in self.images:
+            return web.Response(status=404)
+        return web.Response(body=self.images[request.path], content_type="image/jpeg")
+
+async def download(host: StandInImageHost, store: ThumbnailStore, links: Dict[str, str], **kwargs) -> int:
+    app = web.Application()
+    app.router.add_get("/{path:.*}", host.handle)
+    async with TestServer(app) as server:
+        return await download_thumbnails(store, links, base_url=str(server.make_url("/")), **kwargs)
+
+LINKS = {
+    "1": "//static.shop.kz/upload/red.jpg",
+    "2": "//static.shop.kz/upload/red-copy.jpg",
+    "3": "//static.shop.kz/upload/blue.jpg",
+    "4": "//static.shop.kz/upload/gone.jpg",
+    "5": "//static.shop.kz/upload/broken.jpg",
+}
+
+def make_host() -> StandInImageHost:
+    red = render_image("red")
+    return StandInImageHost({"/upload/red.jpg": red, "/upload/red-copy.jpg": red,
+                             "/upload/blue.jpg": render_image("blue"), "/upload/broken.jpg": b"not an image"},
+                            failures={"/upload/blue.jpg": 1})
+
+def test_downloader_stores_shrunk_thumbnails(tmp_path):
+    host = make_host()
+    store = ThumbnailStore(str(tmp_path))
+    stored = asyncio.run(download(host, store, LINKS))
+
+    # Missing and undecodable images are skipped, a server error is retried
+    assert stored == 3
+    assert host.hits["/upload/blue.jpg"] == 2
+    assert store.get("4") is None and store.get("5") is None
+    for laptop_id in ("1", "2", "3"):
+        with Image.open(io.BytesIO(store.get(laptop_id))) as image:
+            assert image.format == "WEBP"
+            assert image.width <= THUMBNAIL_SIZE[0] and image.height <= THUMBNAIL_SIZE[1]
+    assert store.get_url("1") == "https://static.shop.kz/upload/red.jpg"
+
+    # Laptops sharing a photo share its file
+    files = [name for _, _, names in os.walk(tmp_path) for name in names if name.endswith(".webp")]
+    assert len(files) == 2
+
+def test_downloader_skips_known_links_unless_refreshed(tmp_path):
+    host = make_host()
+    store = ThumbnailStore(str(tmp_path))
+    asyncio.run(download(host, store, LINKS))
+    hits = sum(host.hits.values())
+
+    assert asyncio.run(download(host, store, LINKS)) == 0
+    assert sum(host.hits.values()) == hits + 2
+    assert asyncio.run(download(host, store, LINKS, refresh=True)) == 3
+
+def test_least_recently_used_thumbnails_are_evicted(tmp_path):
+    host = make_host()
+    store = ThumbnailStore(str(tmp_path))
+    asyncio.run(download(host, store, {"3": LINKS["3"], "1": LINKS["1"]}))
+
+    # Reading the blue thumbnail makes the red one the least recently used
+    store.max_bytes = len(store.get("3"))
+    assert store.evict() == 1
+    assert store.get("1") is None
+    assert store.get("3") is not None
+
+def test_thumbnail_misses_are_not_cached(tmp_path, monkeypatch):
+    store = ThumbnailStore(str(tmp_path))
+    monkeypatch.setattr(thumbnails, "get_thumbnail_store", lambda: store)
+    thumbnails.read_thumbnail.clear()
+
+    assert thumbnails.get_thumbnail("1") is None
+    asyncio.run(download(make_host(), store, {"1": LINKS["1"]}))
+    assert thumbnails.get_thumbnail("1") == store.get("1")
+    thumbnails.read_thumbnail.clear()
+
+def test_placeholder_is_committed():
+    assert os.path.exists(os.path.join(ROOT, "app", thumbnails.PLACEHOLDER_PATH))
@@ -0,0 +1,32 @@
+# Importing Necessary Libraries
+import os
+import subprocess
+import sys
+import time
+from conftest import ROOT
+from tracing import PrometheusFileSink, Registry, Span
+
+def test_file_sink_writes_on_spans_without_a_flush(tmp_path):
+    path = str(tmp_path / "metrics.prom")
+    registry = Registry()
+    registry.add_sink(PrometheusFileSink(path, interval=3600))
+    registry.inc("requests")
+    registry.observe(Span("parse_listing", time.time(), 0.02, None))
+
+    with open(path) as file:
+        assert "laptopio_requests_total 1" in file.read()
+
+    # Later spans wait for the interval
+    registry.inc("requests")
+    registry.observe(Span("parse_listing", time.time(), 0.02, None))
+    with open(path) as file:
+        assert "laptopio_requests_total 1" in file.read()
+
+def test_scraper_finds_the_tracing_module_on_its_own():
+    # A plain `python scraper.py` run from scraper/ has no app/ on its path
+    environment = {key: value for key, value in os.environ.items() if key != "PYTHONPATH"}
+    environment["LAPTOPIO_METRICS"] = "1"
+    result = subprocess.run([sys.executable, "-c", "import metrics; print(metrics.ENABLED)"],
+                            cwd=os.path.join(ROOT, "scraper"), env=environment,
+                            capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == "True"